@@ -10,6 +10,7 @@ from src.etl.preprocessor import preprocess_dataframe
 from src.models.topic.auto_topic import AutoTopicModel
 from src.models.sentiment.classifier import SentimentClassifier
 from src.models.sentiment.fallback import fallback_predict
+from src.models.prediction_cache import predict_topics, predict_sentiment
 from src.models.trainer import train_sentiment_model, train_topic_supervised_model, train_topic_auto_model
 from src.viz.wordcloud import generate_wordcloud
 from src.viz.bubble_chart import create_bubble_chart, create_sentiment_distribution_chart
@@ -64,16 +65,16 @@ with tab1:
                 topic_auto_path = TOPIC_MODEL_DIR / "topic_auto"
                 if topic_auto_path.exists():
                     topic_model = AutoTopicModel.load(topic_auto_path)
-                    topic_labels, _ = topic_model.predict(texts)
+                    topic_labels, _ = predict_topics(topic_model, texts)
                 else:
                     st.warning("No topic model found, training auto topic model")
-                    topic_model = train_topic_auto_model(texts, n_clusters=8, model_name="topic_auto", log_mlflow=False)
-                    topic_labels, _ = topic_model.predict(texts)
+                    topic_model = train_topic_auto_model(texts, model_name="topic_auto", log_mlflow=False, auto_k=True)
+                    topic_labels, _ = predict_topics(topic_model, texts)
 
                 sentiment_path = SENTIMENT_MODEL_DIR / "sentiment_model"
                 if sentiment_path.exists():
                     sentiment_model = SentimentClassifier.load(sentiment_path)
-                    sentiment_labels, sentiment_scores, _ = sentiment_model.predict_with_scores(texts)
+                    sentiment_labels, sentiment_scores, _ = predict_sentiment(sentiment_model, texts)
                 else:
                     st.warning("No sentiment model found, using fallback")
                     sentiment_labels, sentiment_scores = fallback_predict(texts)
@@ -214,13 +215,19 @@ with tab4:
                     texts = train_df['comment'].fillna("").tolist()
                     labels = train_df['sentiment_label'].tolist()
 
-                    model, metrics = train_sentiment_model(texts, labels, log_mlflow=use_mlflow)
+                    model, metrics = train_sentiment_model(texts, labels, log_mlflow=use_mlflow, skip_if_unchanged=True)
 
-                    st.success(f"✅ Sentiment model trained!")
+                    if metrics.get("reused_artifact"):
+                        st.info("Training data and config unchanged, reusing existing sentiment model")
+                    else:
+                        st.success(f"✅ Sentiment model trained!")
                     col1, col2, col3 = st.columns(3)
                     col1.metric("Accuracy", f"{metrics.get('accuracy', 0):.3f}")
                     col2.metric("F1 (Macro)", f"{metrics.get('f1_macro', 0):.3f}")
                     col3.metric("F1 (Weighted)", f"{metrics.get('f1_weighted', 0):.3f}")
+                    if 'cv' in metrics:
+                        st.caption(f"{metrics['cv']['n_splits']}-fold cross-validated "
+                                   f"(training-set accuracy: {metrics['train_accuracy']:.3f})")
 
                     if use_mlflow:
                         st.info("📊 Check MLflow UI: run `mlflow ui` and visit http://localhost:5000")
@@ -238,12 +245,18 @@ with tab4:
                     texts = train_df['comment'].fillna("").tolist()
                     labels = train_df['topic_label'].tolist()
 
-                    model, metrics = train_topic_supervised_model(texts, labels, log_mlflow=use_mlflow)
+                    model, metrics = train_topic_supervised_model(texts, labels, log_mlflow=use_mlflow, skip_if_unchanged=True)
 
-                    st.success(f"✅ Topic model trained!")
+                    if metrics.get("reused_artifact"):
+                        st.info("Training data and config unchanged, reusing existing topic model")
+                    else:
+                        st.success(f"✅ Topic model trained!")
                     col1, col2 = st.columns(2)
                     col1.metric("Accuracy", f"{metrics.get('accuracy', 0):.3f}")
                     col2.metric("F1 (Macro)", f"{metrics.get('f1_macro', 0):.3f}")
+                    if 'cv' in metrics:
+                        st.caption(f"{metrics['cv']['n_splits']}-fold cross-validated "
+                                   f"(training-set accuracy: {metrics['train_accuracy']:.3f})")
 
                     if use_mlflow:
                         st.info("📊 Check MLflow UI: run `mlflow ui` and visit http://localhost:5000")
@@ -21,6 +21,68 @@ KMEANS_CONFIG = {
     "n_init": 10
 }
 
+AUTO_K_CONFIG = {
+    "k_min": 2,
+    "k_max": 12,
+    "metric": "silhouette",
+    "sample_size": 2000,
+    "random_state": 42,
+    "n_jobs": -1
+}
+
+COHERENCE_CONFIG = {
+    "measure": "npmi",
+    "top_n": 10,
+    "sample_size": 5000,
+    "random_state": 42
+}
+
+CV_CONFIG = {
+    "n_splits": 5,
+    "random_state": 42,
+    "n_jobs": -1,
+    "cache_dir": None,
+    "cache_bytes_limit": "2G"
+}
+
+SERVING_CONFIG = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    "max_batch_size": 64,
+    "max_wait_ms": 10,
+    "latency_window": 10000
+}
+
+PREDICTION_CACHE_CONFIG = {
+    "enabled": True,
+    "max_memory_entries": 100000,
+    "max_disk_rows": 1000000,
+    "prune_every": 10000,
+    "db_path": None
+}
+
+ATTRIBUTION_CONFIG = {
+    "ngram_range": (1, 2),
+    "max_features": 20000,
+    "top_n": 10,
+    "max_segments": 3,
+    "min_count": 3,
+    "prior_strength": 1000
+}
+
+TRENDING_CONFIG = {
+    "ngram_range": (2, 3),
+    "bucket": "hour",
+    "retention_buckets": 24,
+    "baseline_buckets": 6,
+    "cms_width": 8192,
+    "cms_depth": 4,
+    "capacity": 500,
+    "growth_threshold": 3.0,
+    "min_count": 5,
+    "top_n": 10
+}
+
 LOGISTIC_REGRESSION_CONFIG = {
     "max_iter": 500,
     "random_state": 42,
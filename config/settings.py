@@ -35,6 +35,26 @@ JIRA_PROJECT = os.getenv("JIRA_PROJECT", "OPS")
 KPI_SENTIMENT_ACCURACY_MIN = float(os.getenv("KPI_SENTIMENT_ACCURACY_MIN", "0.88"))
 KPI_NEGATIVE_SPIKE_THRESHOLD = float(os.getenv("KPI_NEGATIVE_SPIKE_THRESHOLD", "0.2"))
 KPI_DRIFT_THRESHOLD = float(os.getenv("KPI_DRIFT_THRESHOLD", "0.15"))
+KPI_SEGMENT_MIN_VOLUME = int(os.getenv("KPI_SEGMENT_MIN_VOLUME", "30"))
+
+DRIFT_METRIC = os.getenv("DRIFT_METRIC", "total_variation")
+DRIFT_WINDOW_SIZE = int(os.getenv("DRIFT_WINDOW_SIZE", "5000"))
+DRIFT_MIN_OBSERVATIONS = int(os.getenv("DRIFT_MIN_OBSERVATIONS", "100"))
+
+METRICS_RETENTION_DAYS = int(os.getenv("METRICS_RETENTION_DAYS", "90"))
+
+SPIKE_EWMA_ALPHA = float(os.getenv("SPIKE_EWMA_ALPHA", "0.05"))
+SPIKE_EWMA_LIMIT = float(os.getenv("SPIKE_EWMA_LIMIT", "3.0"))
+SPIKE_MIN_DELTA = float(os.getenv("SPIKE_MIN_DELTA", "0.1"))
+SPIKE_CUSUM_H = float(os.getenv("SPIKE_CUSUM_H", "8.0"))
+SPIKE_MIN_OBSERVATIONS = int(os.getenv("SPIKE_MIN_OBSERVATIONS", "30"))
+SPIKE_MAX_SEGMENTS = int(os.getenv("SPIKE_MAX_SEGMENTS", "10000"))
+
+MESSAGE_BUS_WORKERS = int(os.getenv("MESSAGE_BUS_WORKERS", "4"))
+MESSAGE_HISTORY_SIZE = int(os.getenv("MESSAGE_HISTORY_SIZE", "1000"))
+MESSAGE_HISTORY_MAX_BYTES = int(os.getenv("MESSAGE_HISTORY_MAX_BYTES", str(64 * 1024 * 1024)))
+MESSAGE_PAYLOAD_SPILL_BYTES = int(os.getenv("MESSAGE_PAYLOAD_SPILL_BYTES", str(256 * 1024)))
+MESSAGE_SPILL_DIR = os.getenv("MESSAGE_SPILL_DIR", "")
 
 REQUIRED_COLUMNS = ["comment"]
 OPTIONAL_COLUMNS = ["id", "timestamp", "source"]
@@ -0,0 +1,77 @@
+import sys
+import time
+import random
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.model_config import SERVING_CONFIG
+from src.utils.logger import setup_logger
+
+logger = setup_logger("load_test", "logs/load_test.log")
+
+SAMPLE_COMMENTS = [
+    "Ứng dụng chạy rất nhanh, tôi rất hài lòng",
+    "Chuyển tiền bị lỗi, mất phí mà không nhận được tiền",
+    "Nhân viên hỗ trợ nhiệt tình",
+    "Phí thường niên quá cao",
+    "Không đăng nhập được vào app từ sáng"
+]
+
+def load_comments(data_path):
+    if data_path is None:
+        return SAMPLE_COMMENTS
+
+    df = pd.read_csv(data_path, encoding='utf-8')
+    comments = df['comment'].dropna().astype(str).tolist()
+    return comments or SAMPLE_COMMENTS
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load-test the scoring server")
+    parser.add_argument("--url", default=f"http://{SERVING_CONFIG['host']}:{SERVING_CONFIG['port']}",
+                        help="Base URL of the scoring server")
+    parser.add_argument("--data", default=None, help="Optional CSV with a 'comment' column to sample from")
+    parser.add_argument("--requests", type=int, default=2000, help="Total single-comment requests")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+
+    args = parser.parse_args()
+
+    comments = load_comments(args.data)
+    # requests.Session is not thread-safe, each client thread keeps its own connection pool
+    local = threading.local()
+
+    def send(i):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        start = time.perf_counter()
+        response = session.post(f"{args.url}/score", json={"text": random.choice(comments)}, timeout=60)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return response.status_code, elapsed_ms
+
+    logger.info(f"Sending {args.requests} requests to {args.url} with concurrency {args.concurrency}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(send, range(args.requests)))
+    wall_seconds = time.perf_counter() - start
+
+    latencies = np.array([r[1] for r in results])
+    errors = sum(1 for r in results if r[0] != 200)
+    p50, p90, p95, p99 = np.percentile(latencies, [50, 90, 95, 99])
+
+    logger.info(f"Throughput: {args.requests / wall_seconds:.0f} req/s over {wall_seconds:.1f}s, errors: {errors}")
+    logger.info(f"Client latency ms: p50={p50:.1f} p90={p90:.1f} p95={p95:.1f} p99={p99:.1f} max={latencies.max():.1f}")
+
+    server_stats = requests.get(f"{args.url}/metrics", timeout=10).json()
+    logger.info(f"Server metrics: {server_stats}")
+
+if __name__ == "__main__":
+    main()
@@ -1,84 +1,191 @@
 import sys
+import io
+import json
+import signal
+import threading
+import time
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.etl.loader import load_and_validate
+from src.etl.loader import load_and_validate, validate_schema, add_missing_columns
 from src.etl.preprocessor import preprocess_dataframe
 from src.models.topic.auto_topic import AutoTopicModel
 from src.models.sentiment.classifier import SentimentClassifier
+from src.models.sentiment.fallback import fallback_predict
+from src.models.prediction_cache import predict_topics, predict_sentiment, artifact_version
 from src.agents.goal_manager import GoalManager
 from src.agents.monitor import Monitor
 from src.agents.planner import Planner
 from src.agents.executor import Executor
 from src.agents.memory import Memory
-from config.settings import TOPIC_MODEL_DIR, SENTIMENT_MODEL_DIR
+from config.settings import TOPIC_MODEL_DIR, SENTIMENT_MODEL_DIR, RAW_DIR, PROCESSED_DIR
 from src.utils.logger import setup_logger
 
 logger = setup_logger("monitoring", "logs/monitoring.log")
 
-def main():
-    import argparse
+TOPIC_MODEL_PATH = TOPIC_MODEL_DIR / "topic_auto"
+SENTIMENT_MODEL_PATH = SENTIMENT_MODEL_DIR / "sentiment_model"
 
-    parser = argparse.ArgumentParser(description="Run monitoring and agentic actions")
-    parser.add_argument("--data", required=True, help="Path to CSV data")
-    parser.add_argument("--execute", action="store_true", help="Execute plan (not dry run)")
-    parser.add_argument("--save-baseline", action="store_true", help="Save as new baseline")
+class ModelSet:
+    def __init__(self):
+        self.topic_model = None
+        self.sentiment_model = None
+        self.versions = (None, None)
 
-    args = parser.parse_args()
+    def current_versions(self):
+        return (artifact_version(TOPIC_MODEL_PATH) if TOPIC_MODEL_PATH.exists() else None,
+                artifact_version(SENTIMENT_MODEL_PATH) if SENTIMENT_MODEL_PATH.exists() else None)
 
-    logger.info(f"Starting monitoring job at {datetime.now()}")
-    logger.info(f"Loading data from {args.data}")
+    def load(self):
+        if TOPIC_MODEL_PATH.exists():
+            self.topic_model = AutoTopicModel.load(TOPIC_MODEL_PATH)
+        else:
+            logger.warning("No topic model found")
+            self.topic_model = None
 
-    df = load_and_validate(args.data)
-    df = preprocess_dataframe(df)
+        if SENTIMENT_MODEL_PATH.exists():
+            self.sentiment_model = SentimentClassifier.load(SENTIMENT_MODEL_PATH)
+        else:
+            logger.warning("No sentiment model found")
+            self.sentiment_model = None
 
-    texts = df['comment_lower'].tolist()
+        self.versions = self.current_versions()
+        return self
 
-    topic_model_path = TOPIC_MODEL_DIR / "topic_auto"
-    if topic_model_path.exists():
-        topic_model = AutoTopicModel.load(topic_model_path)
-        topic_labels, _ = topic_model.predict(texts)
-    else:
-        logger.warning("No topic model found")
-        topic_labels = ["Unknown"] * len(texts)
+    def reload_if_changed(self):
+        if self.current_versions() != self.versions:
+            logger.info("Model artifacts changed on disk, reloading models")
+            self.load()
+            return True
+        return False
 
-    sentiment_model_path = SENTIMENT_MODEL_DIR / "sentiment_model"
-    if sentiment_model_path.exists():
-        sentiment_model = SentimentClassifier.load(sentiment_model_path)
-        sentiment_labels, sentiment_scores, _ = sentiment_model.predict_with_scores(texts)
-    else:
-        logger.warning("No sentiment model found")
-        from src.models.sentiment.fallback import fallback_predict
-        sentiment_labels, sentiment_scores = fallback_predict(texts)
+    def score(self, df):
+        texts = df['comment_lower'].tolist()
 
-    df['topic_label'] = topic_labels
-    df['sentiment_label'] = sentiment_labels
-    df['sentiment_score'] = sentiment_scores
+        if self.topic_model is not None:
+            topic_labels, _ = predict_topics(self.topic_model, texts)
+        else:
+            topic_labels = ["Unknown"] * len(texts)
 
-    monitor = Monitor()
-    current_metrics = monitor.calculate_current_metrics(df)
+        if self.sentiment_model is not None:
+            sentiment_labels, sentiment_scores, _ = predict_sentiment(self.sentiment_model, texts)
+        else:
+            sentiment_labels, sentiment_scores = fallback_predict(texts)
+
+        df['topic_label'] = topic_labels
+        df['sentiment_label'] = sentiment_labels
+        df['sentiment_score'] = sentiment_scores
+        return df
+
+class RawFileTracker:
+    def __init__(self, watch_dir, state_path, pattern="*.csv"):
+        self.watch_dir = Path(watch_dir)
+        self.state_path = Path(state_path)
+        self.pattern = pattern
+        self.state = self._load_state()
+        self._last_seen = {}
+
+    def _load_state(self):
+        if self.state_path.exists():
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        tmp_path.replace(self.state_path)
+
+    def _read_new_rows(self, path, entry, size):
+        with open(path, 'rb') as f:
+            f.seek(entry["offset"])
+            data = f.read(size - entry["offset"])
+
+        if entry["offset"] == 0:
+            header, _, _ = data.partition(b"\n")
+            entry["header"] = header.decode('utf-8')
+            frame = pd.read_csv(io.BytesIO(data), encoding='utf-8')
+        else:
+            frame = pd.read_csv(io.BytesIO(entry["header"].encode('utf-8') + b"\n" + data), encoding='utf-8')
+
+        entry["offset"] = size
+        return frame
+
+    def poll(self):
+        new_frames = []
+
+        for path in sorted(self.watch_dir.glob(self.pattern)):
+            stat = path.stat()
+            signature = (stat.st_size, stat.st_mtime_ns)
+            previous = self._last_seen.get(path.name)
+            self._last_seen[path.name] = signature
+
+            entry = self.state.get(path.name)
+            if entry is not None and stat.st_size == entry["offset"]:
+                continue
+
+            # Only read a file once its size and mtime are unchanged since the previous poll
+            if previous != signature:
+                continue
+
+            if entry is None or stat.st_size < entry["offset"]:
+                entry = {"offset": 0, "header": None}
+
+            try:
+                frame = self._read_new_rows(path, entry, stat.st_size)
+            except Exception as e:
+                logger.error(f"Error reading new rows from {path}: {e}")
+                continue
+
+            self.state[path.name] = entry
+            if not frame.empty:
+                logger.info(f"Read {len(frame)} new rows from {path.name}")
+                new_frames.append(frame)
+
+        return new_frames
+
+def prepare(df):
+    validate_schema(df)
+    df = add_missing_columns(df)
+    df = df[df['comment'].notna()]
+    return preprocess_dataframe(df)
+
+def evaluate(df, monitor, goal_manager, baseline_mode="saved", execute=False, save_baseline=False, spikes=None):
+    current_metrics = monitor.record_run(df)
 
     logger.info(f"Current metrics: {current_metrics}")
 
-    anomalies = monitor.detect_anomalies(current_metrics)
+    if baseline_mode == "last-week":
+        anomalies = monitor.detect_anomalies_vs_history(current_metrics, current_frame=df)
+    else:
+        anomalies = monitor.detect_anomalies(current_metrics, current_frame=df)
+
+    anomalies += spikes if spikes is not None else monitor.observe_dataframe(df, publish=False)
+    anomalies += monitor.detect_trending_phrases()
 
     if anomalies:
         logger.warning(f"Detected {len(anomalies)} anomalies")
         for anomaly in anomalies:
             logger.warning(f"  - {anomaly['type']}: {anomaly['message']}")
+            for attribution in anomaly.get("attribution", []):
+                terms = ", ".join(t["term"] for t in attribution["terms"][:5])
+                logger.warning(f"      {attribution['segment']}: {terms}")
     else:
         logger.info("No anomalies detected")
 
-    goal_manager = GoalManager()
     violations = goal_manager.check_goal_violations(current_metrics)
+    violations += goal_manager.check_segment_violations(df, baseline=monitor.baseline.get("metrics"))
 
     if violations:
         logger.warning(f"Detected {len(violations)} goal violations")
         for v in violations:
-            logger.warning(f"  - {v['goal']}: {v['reason']}")
+            segment = f" [{v['segment']}]" if "segment" in v else ""
+            logger.warning(f"  - {v['goal']}{segment}: {v['metric']} = {v['value']:.3f} (threshold: {v['threshold']})")
     else:
         logger.info("All KPIs within thresholds")
 
@@ -94,18 +201,123 @@ def main():
         memory = Memory()
         executor = Executor(memory=memory)
 
-        dry_run = not args.execute
+        dry_run = not execute
         results = executor.execute_plan(plan, dry_run=dry_run)
 
         logger.info(f"Plan execution {'(DRY RUN)' if dry_run else '(LIVE)'} completed")
         for result in results:
             logger.info(f"  - {result['action']}: {result['message']}")
 
-    if args.save_baseline:
-        monitor.save_baseline(current_metrics)
+    if save_baseline:
+        monitor.save_baseline(current_metrics, df)
         logger.info("Baseline saved")
 
+    return anomalies, violations
+
+def run_once(args):
+    logger.info(f"Starting monitoring job at {datetime.now()}")
+    logger.info(f"Loading data from {args.data}")
+
+    df = load_and_validate(args.data)
+    df = preprocess_dataframe(df)
+
+    models = ModelSet().load()
+    df = models.score(df)
+
+    evaluate(df, Monitor(), GoalManager(), baseline_mode=args.baseline,
+             execute=args.execute, save_baseline=args.save_baseline)
+
     logger.info("Monitoring job completed")
 
+def run_daemon(args):
+    stop_event = threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info(f"Received signal {signum}, shutting down after the current step")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    logger.info(f"Starting monitoring daemon at {datetime.now()}: watching {args.watch_dir}, "
+                f"poll every {args.poll_interval}s, evaluate every {args.interval}s")
+
+    models = ModelSet().load()
+    monitor = Monitor()
+    goal_manager = GoalManager()
+    tracker = RawFileTracker(args.watch_dir, args.state_file, pattern=args.pattern)
+    # Subscribers run on the bus worker pool so a slow handler does not stall ingestion
+    monitor.message_bus.start()
+
+    pending = []
+    spikes = []
+    next_evaluation = time.monotonic() + args.interval
+
+    def run_evaluation():
+        nonlocal pending, spikes
+        if not pending:
+            logger.info("No new data since last evaluation")
+            tracker.save_state()
+            return
+
+        df = pd.concat(pending, ignore_index=True)
+        logger.info(f"Evaluating {len(df)} new rows")
+        pending, spikes_to_report, spikes = [], spikes, []
+        try:
+            evaluate(df, monitor, goal_manager, baseline_mode=args.baseline,
+                     execute=args.execute, save_baseline=args.save_baseline, spikes=spikes_to_report)
+        except Exception as e:
+            logger.error(f"Monitoring evaluation failed, offsets not committed: {e}")
+            return
+        # Offsets are committed only once the rows they cover have been recorded and evaluated
+        tracker.save_state()
+
+    while not stop_event.is_set():
+        for frame in tracker.poll():
+            try:
+                df = models.score(prepare(frame))
+            except Exception as e:
+                logger.error(f"Error scoring new rows: {e}")
+                continue
+            spikes += monitor.observe_dataframe(df)
+            pending.append(df)
+
+        if time.monotonic() >= next_evaluation:
+            run_evaluation()
+            models.reload_if_changed()
+            next_evaluation = time.monotonic() + args.interval
+
+        stop_event.wait(args.poll_interval)
+
+    run_evaluation()
+    monitor.message_bus.stop()
+    logger.info("Monitoring daemon stopped")
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run monitoring and agentic actions")
+    parser.add_argument("--data", help="Path to CSV data (one-shot mode)")
+    parser.add_argument("--execute", action="store_true", help="Execute plan (not dry run)")
+    parser.add_argument("--save-baseline", action="store_true", help="Save as new baseline")
+    parser.add_argument("--baseline", choices=["saved", "last-week"], default="saved",
+                        help="Compare against the saved baseline or the same hour last week")
+    parser.add_argument("--daemon", action="store_true", help="Run continuously, processing new files as they arrive")
+    parser.add_argument("--watch-dir", default=str(RAW_DIR), help="Directory watched for new CSV data in daemon mode")
+    parser.add_argument("--pattern", default="*.csv", help="File pattern watched in daemon mode")
+    parser.add_argument("--poll-interval", type=float, default=10, help="Seconds between checks for new data")
+    parser.add_argument("--interval", type=float, default=300, help="Seconds between anomaly detection and planning runs")
+    parser.add_argument("--state-file", default=str(PROCESSED_DIR / "monitoring_daemon_state.json"),
+                        help="File recording how much of each watched file has been processed")
+
+    args = parser.parse_args()
+
+    if args.daemon:
+        run_daemon(args)
+    elif args.data:
+        run_once(args)
+    else:
+        parser.error("--data is required unless --daemon is given")
+
 if __name__ == "__main__":
     main()
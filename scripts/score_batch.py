@@ -0,0 +1,267 @@
+import sys
+import os
+import json
+import time
+import multiprocessing as mp
+from collections import deque
+from pathlib import Path
+import pandas as pd
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.etl.loader import validate_schema, add_missing_columns
+from src.etl.preprocessor import preprocess_dataframe
+from src.models.topic.auto_topic import AutoTopicModel
+from src.models.sentiment.classifier import SentimentClassifier
+from src.models.sentiment.fallback import fallback_predict
+from src.models.prediction_cache import predict_topics, predict_sentiment
+from src.utils.metrics_summary import MetricsSummary
+from config.settings import TOPIC_MODEL_DIR, SENTIMENT_MODEL_DIR
+from src.utils.logger import setup_logger
+
+logger = setup_logger("score_batch", "logs/score_batch.log")
+
+CHECKPOINT_FILE = "_checkpoint.json"
+METRICS_FILE = "_metrics.json"
+
+# Populated in the parent before the pool forks so workers share the loaded models copy-on-write
+_topic_model = None
+_sentiment_model = None
+
+def load_models(topic_model_path, sentiment_model_path):
+    global _topic_model, _sentiment_model
+
+    if topic_model_path.exists():
+        _topic_model = AutoTopicModel.load(topic_model_path)
+    else:
+        logger.warning("No topic model found, topics will be 'Unknown'")
+
+    if sentiment_model_path.exists():
+        _sentiment_model = SentimentClassifier.load(sentiment_model_path)
+    else:
+        logger.warning("No sentiment model found, using rule-based fallback")
+
+def score_frame(df):
+    texts = df['comment_lower'].tolist()
+
+    if _topic_model is not None:
+        topic_labels, cluster_ids = predict_topics(_topic_model, texts)
+        df['topic_label'] = topic_labels
+        df['topic_id'] = cluster_ids
+    else:
+        df['topic_label'] = "Unknown"
+        df['topic_id'] = -1
+
+    if _sentiment_model is not None:
+        sentiment_labels, sentiment_scores, confidences = predict_sentiment(_sentiment_model, texts)
+    else:
+        sentiment_labels, sentiment_scores = fallback_predict(texts)
+        confidences = [None] * len(texts)
+
+    df['sentiment_label'] = sentiment_labels
+    df['sentiment_score'] = sentiment_scores
+    df['sentiment_confidence'] = confidences
+    return df
+
+def process_chunk(task):
+    key, chunk, output_path, output_format = task
+    start = time.perf_counter()
+
+    validate_schema(chunk)
+    chunk = add_missing_columns(chunk)
+    chunk = chunk[chunk['comment'].notna()].copy()
+    chunk['comment'] = chunk['comment'].astype(str)
+
+    n_rows = 0
+    if len(chunk) > 0:
+        chunk = preprocess_dataframe(chunk)
+        n_rows = len(chunk)
+
+    if n_rows > 0:
+        chunk = score_frame(chunk)
+        write_partition(chunk, Path(output_path), output_format)
+        write_json(summary_path(output_path), MetricsSummary.from_dataframe(chunk).to_dict())
+
+    return {
+        "key": key,
+        "output": output_path if n_rows > 0 else None,
+        "rows": n_rows,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+def write_partition(df, output_path, output_format):
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+
+    if output_format == "parquet":
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False, encoding='utf-8-sig')
+
+    os.replace(tmp_path, output_path)
+
+def summary_path(output_path):
+    return Path(output_path).with_suffix(".metrics.json")
+
+def write_json(path, data):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def combine_summaries(output_dir, checkpoint):
+    partials = []
+    for entry in checkpoint["completed"].values():
+        if entry["output"] and summary_path(entry["output"]).exists():
+            with open(summary_path(entry["output"]), 'r', encoding='utf-8') as f:
+                partials.append(json.load(f))
+
+    metrics = MetricsSummary.combine(partials).to_metrics()
+    write_json(output_dir / METRICS_FILE, metrics)
+    return metrics
+
+def list_input_files(input_path):
+    input_path = Path(input_path)
+    if input_path.is_dir():
+        return sorted(input_path.glob("*.csv"))
+    return [input_path]
+
+def input_signature(input_file):
+    stat = Path(input_file).stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def new_checkpoint(input_files, chunk_size, output_format):
+    return {
+        "chunk_size": chunk_size,
+        "format": output_format,
+        "inputs": {f.name: input_signature(f) for f in input_files},
+        "completed": {},
+        "rows": 0
+    }
+
+def load_checkpoint(output_dir):
+    checkpoint_path = output_dir / CHECKPOINT_FILE
+    if checkpoint_path.exists():
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return None
+
+def resume_checkpoint(output_dir, input_files, chunk_size, output_format, restart=False):
+    checkpoint = None if restart else load_checkpoint(output_dir)
+    if checkpoint is None:
+        return new_checkpoint(input_files, chunk_size, output_format)
+
+    # Partition keys are chunk indices, they only name the same rows under identical chunking of identical inputs
+    mismatches = []
+    if checkpoint.get("chunk_size") != chunk_size:
+        mismatches.append(f"chunk size {checkpoint.get('chunk_size')} != {chunk_size}")
+    if checkpoint.get("format") != output_format:
+        mismatches.append(f"format {checkpoint.get('format')} != {output_format}")
+
+    inputs = checkpoint.get("inputs", {})
+    for input_file in input_files:
+        recorded = inputs.get(input_file.name)
+        if recorded is not None and recorded != input_signature(input_file):
+            mismatches.append(f"{input_file.name} changed since it was checkpointed")
+        inputs[input_file.name] = input_signature(input_file)
+    checkpoint["inputs"] = inputs
+
+    if mismatches:
+        raise ValueError(f"Checkpoint in {output_dir} does not match this run ({'; '.join(mismatches)}), "
+                         f"use --restart to rescore everything")
+    return checkpoint
+
+def save_checkpoint(output_dir, checkpoint):
+    write_json(output_dir / CHECKPOINT_FILE, checkpoint)
+
+def iter_tasks(input_files, output_dir, chunk_size, output_format, completed):
+    for input_file in input_files:
+        reader = pd.read_csv(input_file, encoding='utf-8', chunksize=chunk_size)
+        for chunk_idx, chunk in enumerate(reader):
+            key = f"{input_file.name}:{chunk_idx}"
+            if key in completed:
+                continue
+
+            part_name = f"part-{input_file.stem}-{chunk_idx:05d}.{output_format}"
+            yield key, chunk, str(output_dir / part_name), output_format
+
+def get_pool_context():
+    if "fork" in mp.get_all_start_methods():
+        return mp.get_context("fork"), None, ()
+
+    logger.warning("fork start method unavailable, each worker will load its own models")
+    return mp.get_context("spawn"), load_models, (
+        TOPIC_MODEL_DIR / "topic_auto", SENTIMENT_MODEL_DIR / "sentiment_model"
+    )
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a CSV file or directory of CSVs with topic and sentiment models")
+    parser.add_argument("--input", required=True, help="CSV file or directory of CSV files")
+    parser.add_argument("--output", required=True, help="Output directory for scored partitions")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="Partition format")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Rows per partition")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--restart", action="store_true", help="Ignore existing checkpoint and rescore everything")
+
+    args = parser.parse_args()
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    input_files = list_input_files(args.input)
+    if not input_files:
+        logger.error(f"No CSV files found at {args.input}")
+        sys.exit(1)
+
+    try:
+        checkpoint = resume_checkpoint(output_dir, input_files, args.chunk_size, args.format, restart=args.restart)
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    if checkpoint["completed"]:
+        logger.info(f"Resuming: {len(checkpoint['completed'])} partitions already scored")
+
+    logger.info(f"Starting batch scoring at {datetime.now()} on {len(input_files)} file(s), {args.workers} workers")
+
+    load_models(TOPIC_MODEL_DIR / "topic_auto", SENTIMENT_MODEL_DIR / "sentiment_model")
+
+    ctx, initializer, initargs = get_pool_context()
+    max_in_flight = args.workers * 2
+    start = time.perf_counter()
+    rows_this_run = 0
+
+    with ctx.Pool(processes=args.workers, initializer=initializer, initargs=initargs) as pool:
+        in_flight = deque()
+
+        def collect(pending):
+            nonlocal rows_this_run
+            result = pending.get()
+            checkpoint["completed"][result["key"]] = {"output": result["output"], "rows": result["rows"]}
+            checkpoint["rows"] += result["rows"]
+            rows_this_run += result["rows"]
+            save_checkpoint(output_dir, checkpoint)
+            logger.info(f"Scored {result['key']}: {result['rows']} rows in {result['seconds']:.1f}s")
+
+        tasks = iter_tasks(input_files, output_dir, args.chunk_size, args.format, checkpoint["completed"])
+        for task in tasks:
+            if len(in_flight) >= max_in_flight:
+                collect(in_flight.popleft())
+            in_flight.append(pool.apply_async(process_chunk, (task,)))
+
+        while in_flight:
+            collect(in_flight.popleft())
+
+    elapsed = time.perf_counter() - start
+    rate = rows_this_run / elapsed if elapsed > 0 else 0
+    logger.info(f"Batch scoring completed: {rows_this_run} rows in {elapsed:.1f}s ({rate:.0f} rows/s), "
+                f"{checkpoint['rows']} rows total in {output_dir}")
+
+    metrics = combine_summaries(output_dir, checkpoint)
+    logger.info(f"Combined metrics from {len(checkpoint['completed'])} partitions written to {output_dir / METRICS_FILE}: "
+                f"negative_ratio={metrics.get('negative_ratio', 0):.3f}")
+
+if __name__ == "__main__":
+    main()
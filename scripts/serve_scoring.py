@@ -0,0 +1,117 @@
+import sys
+import json
+import signal
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.serving import ScoringService, MicroBatcher
+from config.model_config import SERVING_CONFIG
+from src.utils.logger import setup_logger
+
+logger = setup_logger("scoring_server", "logs/scoring_server.log")
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    batcher = None
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send_json(200, self.batcher.get_statistics())
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/score":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+
+        if "text" in body and isinstance(body["text"], str):
+            texts = [body["text"]]
+        elif "texts" in body and isinstance(body["texts"], list):
+            texts = [str(t) for t in body["texts"]]
+        else:
+            self._send_json(400, {"error": "Body must contain 'text' (string) or 'texts' (list)"})
+            return
+
+        try:
+            futures = [self.batcher.submit(text) for text in texts]
+            results = [f.result(timeout=REQUEST_TIMEOUT_SECONDS) for f in futures]
+        except Exception as e:
+            logger.error(f"Scoring failed: {e}")
+            self._send_json(500, {"error": str(e)})
+            return
+
+        if "text" in body:
+            self._send_json(200, results[0])
+        else:
+            self._send_json(200, {"results": results})
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve topic and sentiment scoring over HTTP")
+    parser.add_argument("--host", default=SERVING_CONFIG["host"], help="Bind address")
+    parser.add_argument("--port", type=int, default=SERVING_CONFIG["port"], help="Bind port")
+    parser.add_argument("--max-batch-size", type=int, default=SERVING_CONFIG["max_batch_size"],
+                        help="Maximum comments scored in one model call")
+    parser.add_argument("--max-wait-ms", type=float, default=SERVING_CONFIG["max_wait_ms"],
+                        help="Maximum time a request waits for its batch to fill")
+
+    args = parser.parse_args()
+
+    logger.info(f"Starting scoring server at {datetime.now()}")
+
+    service = ScoringService.load()
+    batcher = MicroBatcher(service, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    batcher.start()
+
+    ScoringHandler.batcher = batcher
+    server = ScoringHTTPServer((args.host, args.port), ScoringHandler)
+
+    def shutdown(signum, frame):
+        logger.info(f"Received signal {signum}, shutting down")
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, shutdown)
+
+    logger.info(f"Listening on http://{args.host}:{args.port} (POST /score, GET /metrics, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.stop()
+        logger.info(f"Final metrics: {batcher.get_statistics()}")
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.models.trainer import train_sentiment_model
 from src.utils.logger import setup_logger
+from config.model_config import CV_CONFIG
 
 logger = setup_logger("train_sentiment", "logs/train_sentiment.log")
 
@@ -16,6 +17,8 @@ def main():
     parser.add_argument("--data", required=True, help="Path to labeled CSV (comment, sentiment_label)")
     parser.add_argument("--model-name", default="sentiment_model", help="Model name")
     parser.add_argument("--mlflow", action="store_true", help="Log to MLflow")
+    parser.add_argument("--cv-folds", type=int, default=CV_CONFIG["n_splits"],
+                        help="Folds for cross-validated metrics, 0 to report training-set metrics only")
 
     args = parser.parse_args()
 
@@ -31,7 +34,8 @@ def main():
 
     logger.info(f"Training with {len(texts)} samples")
 
-    model, metrics = train_sentiment_model(texts, labels, model_name=args.model_name, log_mlflow=args.mlflow)
+    model, metrics = train_sentiment_model(texts, labels, model_name=args.model_name, log_mlflow=args.mlflow,
+                                           cv_folds=args.cv_folds)
 
     logger.info(f"Training complete!")
     logger.info(f"Accuracy: {metrics.get('accuracy', 0):.3f}")
@@ -4,6 +4,7 @@ Train Sentiment Model - Standalone Script
 Usage:
     python scripts/train_sentiment_model.py
     python scripts/train_sentiment_model.py --data data/labeled/sentiment_training_dataset.csv
+    python scripts/train_sentiment_model.py --search halving --use-smote --cache-dir .cache/sentiment_search
 """
 
 import pandas as pd
@@ -14,6 +15,8 @@ from pathlib import Path
 import re
 import joblib
 import json
+import time
+import tempfile
 from datetime import datetime
 
 # Add project root to path
@@ -21,7 +24,9 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 # Sklearn
-from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.model_selection import train_test_split, GridSearchCV, StratifiedKFold
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
@@ -34,6 +39,7 @@ from sklearn.metrics import (
 
 # Imbalanced learning
 from imblearn.over_sampling import SMOTE
+from imblearn.pipeline import Pipeline as ImbPipeline
 
 # Vietnamese NLP
 try:
@@ -208,6 +214,157 @@ def hyperparameter_tuning(best_model_name, X_train, y_train):
         print(f"Using default model configuration")
         return None
 
+MODEL_NAMES = {
+    LogisticRegression: 'Logistic Regression',
+    LinearSVC: 'Linear SVM',
+    MultinomialNB: 'Naive Bayes'
+}
+
+def build_search_pipeline(y_train, max_features, use_smote, cache_dir):
+    """Build TF-IDF (+ SMOTE) + classifier pipeline with cached transformer steps"""
+    steps = [('tfidf', TfidfVectorizer(max_features=max_features, ngram_range=(1, 2), sublinear_tf=True))]
+
+    if use_smote:
+        k_neighbors = min(5, int(y_train.value_counts().min()) - 1)
+        if k_neighbors > 0:
+            steps.append(('smote', SMOTE(random_state=42, k_neighbors=k_neighbors)))
+        else:
+            print("  SMOTE skipped: not enough samples in minority class")
+
+    steps.append(('clf', LogisticRegression(max_iter=1000, random_state=42, class_weight='balanced')))
+
+    return ImbPipeline(steps, memory=joblib.Memory(cache_dir, verbose=0))
+
+def halving_search_param_grid(n_samples):
+    """Search space over vectorizer and classifier settings"""
+    min_df = [1, 2] if n_samples > 50 else [1]
+    max_df = [0.8, 1.0] if n_samples > 50 else [1.0]
+
+    return [
+        {
+            'tfidf__min_df': min_df,
+            'tfidf__max_df': max_df,
+            'clf': [LogisticRegression(max_iter=1000, random_state=42, class_weight='balanced')],
+            'clf__C': [0.1, 1, 10, 100],
+            'clf__penalty': ['l1', 'l2'],
+            'clf__solver': ['liblinear', 'saga']
+        },
+        {
+            'tfidf__min_df': min_df,
+            'tfidf__max_df': max_df,
+            'clf': [LinearSVC(max_iter=1000, random_state=42, class_weight='balanced')],
+            'clf__C': [0.1, 1, 10]
+        },
+        {
+            'tfidf__min_df': min_df,
+            'tfidf__max_df': max_df,
+            'clf': [MultinomialNB()],
+            'clf__alpha': [0.1, 0.5, 1.0]
+        }
+    ]
+
+def halving_search(X_train_text, y_train, args):
+    """Successive-halving search over a cached text pipeline, using all cores"""
+    print("\nSuccessive-halving search over cached pipeline (vectorizer + SMOTE + model)...")
+
+    if args.cache_dir:
+        return run_halving_search(X_train_text, y_train, args, args.cache_dir)
+
+    # Without --cache-dir the transformer cache only lives for this search
+    with tempfile.TemporaryDirectory(prefix='sentiment_search_') as cache_dir:
+        best_pipeline, best_model_name, report = run_halving_search(X_train_text, y_train, args, cache_dir)
+    best_pipeline.set_params(memory=None)
+    report['cache_dir'] = None
+    return best_pipeline, best_model_name, report
+
+def run_halving_search(X_train_text, y_train, args, cache_dir):
+    """Fit the halving search with transformer fits cached in cache_dir"""
+    pipeline = build_search_pipeline(y_train, args.max_features, args.use_smote, cache_dir)
+    param_grid = halving_search_param_grid(len(X_train_text))
+    n_splits = 5
+
+    # SMOTE needs more than k_neighbors samples of every class in each subsampled training fold
+    min_resources = 'exhaust'
+    if 'smote' in pipeline.named_steps:
+        k_neighbors = pipeline.named_steps['smote'].k_neighbors
+        min_class_ratio = y_train.value_counts(normalize=True).min()
+        min_resources = int(np.ceil(2 * (k_neighbors + 1) / min_class_ratio * n_splits / (n_splits - 1)))
+        min_resources = min(min_resources, len(X_train_text))
+        print(f"  Minimum resources per candidate (SMOTE): {min_resources} samples")
+
+    search = HalvingGridSearchCV(
+        pipeline,
+        param_grid,
+        factor=3,
+        resource='n_samples',
+        min_resources=min_resources,
+        aggressive_elimination=min_resources != 'exhaust',
+        cv=StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42),
+        scoring='f1_weighted',
+        n_jobs=args.n_jobs,
+        error_score=np.nan,
+        random_state=42,
+        verbose=0
+    )
+
+    start = time.perf_counter()
+    search.fit(X_train_text, y_train)
+    elapsed = time.perf_counter() - start
+
+    best_pipeline = search.best_estimator_
+    best_model_name = MODEL_NAMES.get(type(best_pipeline.named_steps['clf']), 'Tuned Model')
+
+    print(f"  Search time: {elapsed:.1f}s over {len(search.n_candidates_)} iterations")
+    print(f"  Best model: {best_model_name}")
+    print(f"  Best parameters: {search.best_params_}")
+    print(f"  Best F1 (weighted): {search.best_score_:.4f}")
+
+    report = build_search_report(search, elapsed, cache_dir)
+    return best_pipeline, best_model_name, report
+
+def build_search_report(search, elapsed, cache_dir):
+    """Timing and score report for a finished halving search"""
+    cv_results = pd.DataFrame(search.cv_results_)
+    cv_results['param_clf'] = cv_results['param_clf'].map(lambda clf: type(clf).__name__)
+
+    iterations = []
+    for i, (n_candidates, n_resources) in enumerate(zip(search.n_candidates_, search.n_resources_)):
+        rows = cv_results[cv_results['iter'] == i]
+        iterations.append({
+            'iteration': i,
+            'n_candidates': int(n_candidates),
+            'n_resources': int(n_resources),
+            'fit_seconds': float((rows['mean_fit_time'] * search.n_splits_).sum()),
+            'best_score': float(rows['mean_test_score'].max())
+        })
+
+    return {
+        'search': 'halving',
+        'total_seconds': round(elapsed, 2),
+        'cache_dir': str(cache_dir),
+        'best_params': {k: (type(v).__name__ if k == 'clf' else v) for k, v in search.best_params_.items()},
+        'best_score': float(search.best_score_),
+        'iterations': iterations,
+        'candidates': cv_results[[
+            'iter', 'n_resources', 'params', 'param_clf', 'mean_fit_time', 'mean_score_time',
+            'mean_test_score', 'std_test_score', 'rank_test_score'
+        ]].assign(params=lambda df: df['params'].map(
+            lambda p: {k: (type(v).__name__ if k == 'clf' else v) for k, v in p.items()}
+        )).to_dict(orient='records')
+    }
+
+def save_search_report(report, output_dir):
+    """Save halving search timing/score report"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    report_path = output_dir / 'search_report.json'
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+
+    pd.DataFrame(report['candidates']).to_csv(output_dir / 'search_report.csv', index=False)
+    print(f"  Search report: {report_path}")
+
 def save_model(model, vectorizer, metadata, output_dir):
     """Save model and artifacts"""
     output_dir = Path(output_dir)
@@ -247,6 +404,13 @@ def main():
                        help='Max TF-IDF features (default: 5000)')
     parser.add_argument('--use-smote', action='store_true',
                        help='Use SMOTE for class balancing')
+    parser.add_argument('--search', choices=['grid', 'halving'], default='grid',
+                       help='grid: compare models then GridSearchCV on the best (default); '
+                            'halving: successive-halving search over a cached pipeline')
+    parser.add_argument('--n-jobs', type=int, default=-1,
+                       help='Parallel jobs for halving search (default: all cores)')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                       help='Pipeline cache directory for halving search (default: temp dir)')
 
     args = parser.parse_args()
 
@@ -272,61 +436,75 @@ def main():
     print(f"  Training set: {len(X_train)} samples")
     print(f"  Test set: {len(X_test)} samples")
 
-    # TF-IDF Vectorization
-    print(f"\nExtracting TF-IDF features (max_features={args.max_features})...")
+    search_report = None
 
-    # Determine min_df based on dataset size
-    min_df = 2 if len(X_train) > 50 else 1
-    max_df = 0.8 if len(X_train) > 50 else 1.0
+    if args.search == 'halving':
+        best_pipeline, best_model_name, search_report = halving_search(X_train, y_train, args)
 
-    tfidf_vectorizer = TfidfVectorizer(
-        max_features=args.max_features,
-        ngram_range=(1, 2),
-        min_df=min_df,
-        max_df=max_df,
-        sublinear_tf=True
-    )
+        tfidf_vectorizer = best_pipeline.named_steps['tfidf']
+        final_model = best_pipeline.named_steps['clf']
+        min_df, max_df = tfidf_vectorizer.min_df, tfidf_vectorizer.max_df
 
-    X_train_tfidf = tfidf_vectorizer.fit_transform(X_train)
-    X_test_tfidf = tfidf_vectorizer.transform(X_test)
+        X_train_tfidf = tfidf_vectorizer.transform(X_train)
+        X_test_tfidf = tfidf_vectorizer.transform(X_test)
+        X_train_balanced = X_train_tfidf
 
-    print(f"  Feature matrix shape: {X_train_tfidf.shape}")
-    print(f"  Vocabulary size: {len(tfidf_vectorizer.vocabulary_)}")
+    else:
+        # TF-IDF Vectorization
+        print(f"\nExtracting TF-IDF features (max_features={args.max_features})...")
+
+        # Determine min_df based on dataset size
+        min_df = 2 if len(X_train) > 50 else 1
+        max_df = 0.8 if len(X_train) > 50 else 1.0
+
+        tfidf_vectorizer = TfidfVectorizer(
+            max_features=args.max_features,
+            ngram_range=(1, 2),
+            min_df=min_df,
+            max_df=max_df,
+            sublinear_tf=True
+        )
 
-    # Handle class imbalance
-    X_train_balanced = X_train_tfidf
-    y_train_balanced = y_train
+        X_train_tfidf = tfidf_vectorizer.fit_transform(X_train)
+        X_test_tfidf = tfidf_vectorizer.transform(X_test)
 
-    if args.use_smote:
-        class_counts = y_train.value_counts()
-        imbalance_ratio = class_counts.max() / class_counts.min()
+        print(f"  Feature matrix shape: {X_train_tfidf.shape}")
+        print(f"  Vocabulary size: {len(tfidf_vectorizer.vocabulary_)}")
 
-        if imbalance_ratio > 2.0:
-            print(f"\nApplying SMOTE (imbalance ratio: {imbalance_ratio:.2f})...")
+        # Handle class imbalance
+        X_train_balanced = X_train_tfidf
+        y_train_balanced = y_train
 
-            min_class_count = class_counts.min()
-            k_neighbors = min(5, min_class_count - 1)
+        if args.use_smote:
+            class_counts = y_train.value_counts()
+            imbalance_ratio = class_counts.max() / class_counts.min()
 
-            if k_neighbors > 0:
-                smote = SMOTE(random_state=42, k_neighbors=k_neighbors)
-                X_train_balanced, y_train_balanced = smote.fit_resample(X_train_tfidf, y_train)
-                print(f"  Balanced training set: {X_train_balanced.shape[0]} samples")
-            else:
-                print(f"  SMOTE skipped: not enough samples in minority class")
+            if imbalance_ratio > 2.0:
+                print(f"\nApplying SMOTE (imbalance ratio: {imbalance_ratio:.2f})...")
 
-    # Train models
-    results, best_model_name = train_models(
-        X_train_balanced, X_test_tfidf,
-        y_train_balanced, y_test
-    )
+                min_class_count = class_counts.min()
+                k_neighbors = min(5, min_class_count - 1)
 
-    # Hyperparameter tuning
-    tuned_model = hyperparameter_tuning(best_model_name, X_train_balanced, y_train_balanced)
+                if k_neighbors > 0:
+                    smote = SMOTE(random_state=42, k_neighbors=k_neighbors)
+                    X_train_balanced, y_train_balanced = smote.fit_resample(X_train_tfidf, y_train)
+                    print(f"  Balanced training set: {X_train_balanced.shape[0]} samples")
+                else:
+                    print(f"  SMOTE skipped: not enough samples in minority class")
 
-    if tuned_model:
-        final_model = tuned_model
-    else:
-        final_model = results[best_model_name]['model']
+        # Train models
+        results, best_model_name = train_models(
+            X_train_balanced, X_test_tfidf,
+            y_train_balanced, y_test
+        )
+
+        # Hyperparameter tuning
+        tuned_model = hyperparameter_tuning(best_model_name, X_train_balanced, y_train_balanced)
+
+        if tuned_model:
+            final_model = tuned_model
+        else:
+            final_model = results[best_model_name]['model']
 
     # Final evaluation
     y_pred_final = final_model.predict(X_test_tfidf)
@@ -366,9 +544,20 @@ def main():
         }
     }
 
+    if search_report:
+        metadata['search'] = {
+            'type': search_report['search'],
+            'total_seconds': search_report['total_seconds'],
+            'best_params': search_report['best_params'],
+            'best_cv_f1_weighted': search_report['best_score']
+        }
+
     # Save model
     save_model(final_model, tfidf_vectorizer, metadata, args.output)
 
+    if search_report:
+        save_search_report(search_report, args.output)
+
     # Test predictions
     print("\n" + "="*60)
     print("   TEST PREDICTIONS")
@@ -6,6 +6,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.models.trainer import train_topic_supervised_model, train_topic_auto_model
 from src.utils.logger import setup_logger
+from config.model_config import CV_CONFIG
 
 logger = setup_logger("train_topic", "logs/train_topic.log")
 
@@ -17,7 +18,10 @@ def main():
     parser.add_argument("--mode", choices=["auto", "supervised"], default="auto", help="Training mode")
     parser.add_argument("--model-name", help="Model name")
     parser.add_argument("--n-clusters", type=int, default=8, help="Number of clusters for auto mode")
+    parser.add_argument("--auto-k", action="store_true", help="Search n_clusters by sampled silhouette (auto mode)")
     parser.add_argument("--mlflow", action="store_true", help="Log to MLflow")
+    parser.add_argument("--cv-folds", type=int, default=CV_CONFIG["n_splits"],
+                        help="Folds for cross-validated metrics (supervised mode), 0 to report training-set metrics only")
 
     args = parser.parse_args()
 
@@ -32,8 +36,15 @@ def main():
 
     if args.mode == "auto":
         model_name = args.model_name or "topic_auto"
-        logger.info(f"Training auto topic model with {args.n_clusters} clusters")
-        model = train_topic_auto_model(texts, n_clusters=args.n_clusters, model_name=model_name, log_mlflow=args.mlflow)
+        if args.auto_k:
+            logger.info("Training auto topic model, searching n_clusters")
+        else:
+            logger.info(f"Training auto topic model with {args.n_clusters} clusters")
+        model = train_topic_auto_model(texts, n_clusters=args.n_clusters, model_name=model_name,
+                                       log_mlflow=args.mlflow, auto_k=args.auto_k)
+        if model.k_selection:
+            for point in model.k_selection["curve"]:
+                logger.info(f"  k={point['k']}: {model.k_selection['metric']}={point['score']:.3f}")
         logger.info("Auto topic model training complete")
 
     else:
@@ -44,7 +55,8 @@ def main():
         labels = df['topic_label'].tolist()
         model_name = args.model_name or "topic_supervised"
         logger.info(f"Training supervised topic model with {len(texts)} samples")
-        model, metrics = train_topic_supervised_model(texts, labels, model_name=model_name, log_mlflow=args.mlflow)
+        model, metrics = train_topic_supervised_model(texts, labels, model_name=model_name, log_mlflow=args.mlflow,
+                                                      cv_folds=args.cv_folds)
 
         logger.info(f"Supervised topic model training complete")
         logger.info(f"Accuracy: {metrics.get('accuracy', 0):.3f}")
@@ -1,7 +1,9 @@
 import json
 from pathlib import Path
 from datetime import datetime
-from config.settings import KPI_SENTIMENT_ACCURACY_MIN, KPI_NEGATIVE_SPIKE_THRESHOLD, KPI_DRIFT_THRESHOLD
+from config.settings import (KPI_SENTIMENT_ACCURACY_MIN, KPI_NEGATIVE_SPIKE_THRESHOLD, KPI_DRIFT_THRESHOLD,
+                             KPI_SEGMENT_MIN_VOLUME)
+from src.utils.segments import compute_segment_metrics, segment_violations
 from src.agents.message_bus import MessageBus, Message, MessageType, MessagePriority
 from src.utils.logger import default_logger as logger
 
@@ -92,6 +94,18 @@ class GoalManager:
 
         return violations
 
+    def check_segment_violations(self, df_pandas, dimensions=None, baseline=None,
+                                 min_volume=KPI_SEGMENT_MIN_VOLUME):
+        segments = compute_segment_metrics(df_pandas, dimensions, baseline)
+        violations = segment_violations(segments, self.goals, min_volume=min_volume)
+
+        timestamp = datetime.now().isoformat()
+        for violation in violations:
+            violation["timestamp"] = timestamp
+
+        logger.info(f"Evaluated {len(self.goals)} goals over {len(segments)} segments: {len(violations)} violations")
+        return violations
+
     def get_actions_for_violations(self, violations):
         actions = []
         for violation in violations:
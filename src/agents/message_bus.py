@@ -1,12 +1,23 @@
-from typing import Dict, List, Callable, Any, Optional
+from typing import Dict, List, Callable, Any, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+import heapq
+import itertools
 import threading
+import time
 import queue
 import uuid
+from config.settings import (MESSAGE_BUS_WORKERS, MESSAGE_HISTORY_SIZE, MESSAGE_HISTORY_MAX_BYTES,
+                             MESSAGE_PAYLOAD_SPILL_BYTES, MESSAGE_SPILL_DIR)
+from src.agents.message_history import MessageHistory
+from src.agents.topic_trie import TopicTrie, is_pattern
 from src.utils.logger import default_logger as logger
 
+TOPIC_CACHE_SIZE = 4096
+
 class MessageType(Enum):
     REQUEST = "request"
     RESPONSE = "response"
@@ -46,26 +57,89 @@ class MessageBus:
     def __init__(self):
         if not hasattr(self, 'initialized'):
             self.subscribers: Dict[str, List[Callable]] = {}
+            self.wildcard_subscribers = TopicTrie()
+            self._wildcard_cache: Dict[str, Tuple[Callable, ...]] = {}
             self.message_queue = queue.PriorityQueue()
-            self.message_history: List[Message] = []
+            self.message_history = MessageHistory(
+                capacity=MESSAGE_HISTORY_SIZE,
+                max_bytes=MESSAGE_HISTORY_MAX_BYTES,
+                payload_threshold=MESSAGE_PAYLOAD_SPILL_BYTES,
+                spill_dir=MESSAGE_SPILL_DIR or None
+            )
             self.running = False
             self.worker_thread = None
+            self.executor = None
+            self._sequence = itertools.count()
+            self._subscribers_lock = threading.Lock()
+            self._topic_lock = threading.Lock()
+            self._topic_queues: Dict[str, deque] = {}
+            self._idle = threading.Condition()
+            self._pending = 0
+            self._pending_requests: Dict[str, Future] = {}
+            self._timeouts: List[Tuple[float, str]] = []
+            self._timer = threading.Condition()
+            self._timer_thread = None
             self.initialized = True
             logger.info("MessageBus initialized")
 
     def subscribe(self, topic: str, callback: Callable[[Message], Any]):
-        if topic not in self.subscribers:
-            self.subscribers[topic] = []
-        self.subscribers[topic].append(callback)
+        # Subscriber lists are replaced, never mutated, so delivery can iterate them without holding the lock
+        with self._subscribers_lock:
+            if is_pattern(topic):
+                self.wildcard_subscribers.add(topic, callback)
+                self._wildcard_cache = {}
+            else:
+                self.subscribers[topic] = self.subscribers.get(topic, []) + [callback]
         logger.info(f"Subscribed to topic: {topic}")
 
     def unsubscribe(self, topic: str, callback: Callable):
-        if topic in self.subscribers:
-            self.subscribers[topic].remove(callback)
+        with self._subscribers_lock:
+            if is_pattern(topic):
+                if self.wildcard_subscribers.remove(topic, callback):
+                    self._wildcard_cache = {}
+            elif topic in self.subscribers:
+                callbacks = list(self.subscribers[topic])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                self.subscribers[topic] = callbacks
+
+    def start(self, workers: int = MESSAGE_BUS_WORKERS):
+        if self.running:
+            return
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="message-bus")
+        self.running = True
+        self.worker_thread = threading.Thread(target=self._dispatch_loop, name="message-bus-dispatcher", daemon=True)
+        self.worker_thread.start()
+        logger.info(f"MessageBus dispatcher started with {workers} workers")
+
+    def stop(self, timeout: Optional[float] = None):
+        if not self.running:
+            return
+        self.message_queue.put((float('inf'), next(self._sequence), None))
+        self.worker_thread.join(timeout)
+        self.executor.shutdown(wait=True)
+        self.running = False
+        self.worker_thread = None
+        self.executor = None
+
+        # Anything published while the dispatcher was shutting down is delivered synchronously
+        with self._idle:
+            self._pending = 0
+            self._idle.notify_all()
+        self._process_queue()
+        logger.info("MessageBus dispatcher stopped")
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
 
     def publish(self, message: Message):
         priority_value = message.priority.value
-        self.message_queue.put((priority_value * -1, message))
+        if self.running:
+            with self._idle:
+                self._pending += 1
+        # The sequence number breaks priority ties so Message objects are never compared
+        self.message_queue.put((priority_value * -1, next(self._sequence), message))
         self.message_history.append(message)
         logger.debug(f"Published message: {message.topic} from {message.sender}")
 
@@ -75,28 +149,107 @@ class MessageBus:
     def _process_queue(self):
         while not self.message_queue.empty():
             try:
-                _, message = self.message_queue.get_nowait()
-                self._deliver_message(message)
+                _, _, message = self.message_queue.get_nowait()
+                if message is not None:
+                    self._deliver_message(message)
             except queue.Empty:
                 break
 
+    def _dispatch_loop(self):
+        while True:
+            _, _, message = self.message_queue.get()
+            if message is None:
+                break
+
+            # One drain task per topic at a time keeps each topic FIFO while topics run in parallel
+            with self._topic_lock:
+                topic_queue = self._topic_queues.get(message.topic)
+                if topic_queue is not None:
+                    topic_queue.append(message)
+                    continue
+                self._topic_queues[message.topic] = deque([message])
+            self.executor.submit(self._drain_topic, message.topic)
+
+    def _drain_topic(self, topic: str):
+        while True:
+            with self._topic_lock:
+                topic_queue = self._topic_queues[topic]
+                if not topic_queue:
+                    del self._topic_queues[topic]
+                    return
+                message = topic_queue.popleft()
+
+            try:
+                self._deliver_message(message)
+            finally:
+                with self._idle:
+                    self._pending -= 1
+                    if self._pending == 0:
+                        self._idle.notify_all()
+
     def _deliver_message(self, message: Message):
+        if message.type == MessageType.RESPONSE and message.correlation_id:
+            with self._timer:
+                future = self._pending_requests.pop(message.correlation_id, None)
+            if future is not None:
+                future.set_result(message)
+
         if message.recipient:
-            if message.recipient in self.subscribers:
-                for callback in self.subscribers[message.recipient]:
-                    try:
-                        callback(message)
-                    except Exception as e:
-                        logger.error(f"Error delivering message to {message.recipient}: {e}")
-
-        if message.topic in self.subscribers:
-            for callback in self.subscribers[message.topic]:
+            for callback in self.subscribers.get(message.recipient, ()):
                 try:
                     callback(message)
                 except Exception as e:
-                    logger.error(f"Error in subscriber callback for {message.topic}: {e}")
+                    logger.error(f"Error delivering message to {message.recipient}: {e}")
 
-    def request(self, sender: str, recipient: str, topic: str, payload: Dict[str, Any], timeout: int = 30) -> Optional[Message]:
+        callbacks = (*self.subscribers.get(message.topic, ()), *self._wildcard_callbacks(message.topic))
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f"Error in subscriber callback for {message.topic}: {e}")
+
+    def _wildcard_callbacks(self, topic: str) -> Tuple[Callable, ...]:
+        # The trie is walked once per distinct topic, later deliveries are a dict lookup
+        cache = self._wildcard_cache
+        callbacks = cache.get(topic)
+        if callbacks is None:
+            with self._subscribers_lock:
+                callbacks = tuple(self.wildcard_subscribers.match(topic)) if len(self.wildcard_subscribers) else ()
+                if self._wildcard_cache is cache:
+                    if len(cache) >= TOPIC_CACHE_SIZE:
+                        cache.clear()
+                    cache[topic] = callbacks
+        return callbacks
+
+    def _timer_loop(self):
+        with self._timer:
+            while True:
+                if not self._timeouts:
+                    self._timer.wait()
+                    continue
+                deadline, request_id = self._timeouts[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._timer.wait(remaining)
+                    continue
+                heapq.heappop(self._timeouts)
+                # Answered requests leave their deadline behind, those entries are simply skipped
+                future = self._pending_requests.pop(request_id, None)
+                if future is not None:
+                    future.set_result(None)
+
+    def _register_request(self, request_msg: Message, timeout: float) -> Future:
+        future = Future()
+        with self._timer:
+            if self._timer_thread is None:
+                self._timer_thread = threading.Thread(target=self._timer_loop, name="message-bus-timer", daemon=True)
+                self._timer_thread.start()
+            self._pending_requests[request_msg.id] = future
+            heapq.heappush(self._timeouts, (time.monotonic() + timeout, request_msg.id))
+            self._timer.notify()
+        return future
+
+    def _send_request(self, sender: str, recipient: str, topic: str, payload: Dict[str, Any], timeout: float) -> Tuple[Message, Future]:
         request_msg = Message(
             type=MessageType.REQUEST,
             sender=sender,
@@ -105,25 +258,31 @@ class MessageBus:
             payload=payload,
             priority=MessagePriority.HIGH
         )
-
-        response_received = threading.Event()
-        response_data = {}
-
-        def response_handler(msg: Message):
-            if msg.correlation_id == request_msg.id:
-                response_data['message'] = msg
-                response_received.set()
-
-        self.subscribe(f"{topic}_response", response_handler)
+        # Registered before publishing, a synchronous bus answers inside publish()
+        future = self._register_request(request_msg, timeout)
         self.publish(request_msg)
+        return request_msg, future
 
-        if response_received.wait(timeout):
-            self.unsubscribe(f"{topic}_response", response_handler)
-            return response_data.get('message')
-        else:
-            self.unsubscribe(f"{topic}_response", response_handler)
+    def request(self, sender: str, recipient: str, topic: str, payload: Dict[str, Any], timeout: int = 30) -> Optional[Message]:
+        _, future = self._send_request(sender, recipient, topic, payload, timeout)
+        response = future.result()
+        if response is None:
             logger.warning(f"Request timeout: {topic} from {sender} to {recipient}")
-            return None
+        return response
+
+    def request_many(self, sender: str, requests: List[Dict[str, Any]], timeout: int = 30) -> List[Optional[Message]]:
+        sent = [
+            self._send_request(sender, req["recipient"], req["topic"], req.get("payload", {}), timeout)
+            for req in requests
+        ]
+
+        responses = []
+        for request_msg, future in sent:
+            response = future.result()
+            if response is None:
+                logger.warning(f"Request timeout: {request_msg.topic} from {sender} to {request_msg.recipient}")
+            responses.append(response)
+        return responses
 
     def respond(self, original_message: Message, payload: Dict[str, Any]):
         response_msg = Message(
@@ -138,10 +297,10 @@ class MessageBus:
         self.publish(response_msg)
 
     def get_history(self, topic: Optional[str] = None, limit: int = 100) -> List[Message]:
-        if topic:
-            filtered = [msg for msg in self.message_history if msg.topic == topic]
-            return filtered[-limit:]
-        return self.message_history[-limit:]
+        return self.message_history.get(topic or None, limit)
+
+    def load_payload(self, message: Message) -> Dict[str, Any]:
+        return self.message_history.load_payload(message)
 
     def clear_history(self):
         self.message_history.clear()
@@ -0,0 +1,165 @@
+import sys
+import threading
+import dataclasses
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+import joblib
+import numpy as np
+import pandas as pd
+from src.utils.logger import default_logger as logger
+
+SAMPLE_SIZE = 100
+
+def _object_column_size(column: pd.Series) -> int:
+    # Shallow memory_usage only counts pointers, the referenced strings are sized from an even sample
+    step = max(len(column) // SAMPLE_SIZE, 1)
+    sample = column.iloc[::step].iloc[:SAMPLE_SIZE]
+    if sample.empty:
+        return 0
+    return sum(sys.getsizeof(v) for v in sample) * len(column) // len(sample)
+
+def estimate_size(value: Any, depth: int = 0) -> int:
+    if isinstance(value, pd.DataFrame):
+        size = int(value.memory_usage(index=True, deep=False).sum())
+        for name in value.columns[value.dtypes == object]:
+            size += _object_column_size(value[name])
+        return size
+    if isinstance(value, pd.Series):
+        size = int(value.memory_usage(index=True, deep=False))
+        if value.dtype == object:
+            size += _object_column_size(value)
+        return size
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if depth >= 3:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        items = list(islice(value.items(), SAMPLE_SIZE))
+        sampled = sum(estimate_size(k, depth + 1) + estimate_size(v, depth + 1) for k, v in items)
+        return sampled * len(value) // max(len(items), 1)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        # Long sequences are extrapolated from a sample so sizing stays cheap
+        items = list(islice(value, SAMPLE_SIZE))
+        sampled = sum(estimate_size(v, depth + 1) for v in items)
+        return sampled * len(value) // max(len(items), 1)
+    return sys.getsizeof(value)
+
+def summarize_value(value: Any) -> Any:
+    if isinstance(value, pd.DataFrame):
+        return {"type": "DataFrame", "shape": list(value.shape), "columns": [str(c) for c in value.columns[:50]]}
+    if isinstance(value, pd.Series):
+        return {"type": "Series", "length": len(value), "dtype": str(value.dtype)}
+    if isinstance(value, np.ndarray):
+        return {"type": "ndarray", "shape": list(value.shape), "dtype": str(value.dtype)}
+    if isinstance(value, (list, tuple, set, frozenset, dict)):
+        return {"type": type(value).__name__, "length": len(value)}
+    if isinstance(value, (str, bytes, bytearray)):
+        return {"type": type(value).__name__, "length": len(value), "preview": value[:200]}
+    return {"type": type(value).__name__}
+
+class HistoryEntry:
+    __slots__ = ("message", "size", "spill_path")
+
+    def __init__(self, message, size: int, spill_path: Optional[Path] = None):
+        self.message = message
+        self.size = size
+        self.spill_path = spill_path
+
+class MessageHistory:
+    def __init__(self, capacity: int = 1000, max_bytes: int = 64 * 1024 * 1024,
+                 payload_threshold: int = 256 * 1024, spill_dir: Optional[str] = None):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.payload_threshold = payload_threshold
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.total_bytes = 0
+        self.compacted = 0
+        self.evicted = 0
+        self._entries: deque = deque()
+        self._by_topic: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    def _compact(self, message):
+        # The delivered message keeps its full payload, only the stored copy is reduced
+        payload_size = estimate_size(message.payload)
+        if payload_size <= self.payload_threshold:
+            return message, payload_size, None
+
+        summary = {key: value if estimate_size(value) <= 1024 else summarize_value(value)
+                   for key, value in message.payload.items()}
+        summary["_payload_bytes"] = payload_size
+
+        spill_path = None
+        if self.spill_dir is not None:
+            spill_path = self.spill_dir / f"{message.id}.pkl"
+            try:
+                joblib.dump(message.payload, spill_path)
+                summary["_spilled_to"] = str(spill_path)
+            except Exception as e:
+                logger.error(f"Error spilling payload of message {message.id}: {e}")
+                spill_path = None
+
+        self.compacted += 1
+        return dataclasses.replace(message, payload=summary), estimate_size(summary), spill_path
+
+    def _evict_oldest(self):
+        entry = self._entries.popleft()
+        topic_entries = self._by_topic[entry.message.topic]
+        topic_entries.popleft()
+        if not topic_entries:
+            del self._by_topic[entry.message.topic]
+
+        self.total_bytes -= entry.size
+        self.evicted += 1
+        if entry.spill_path is not None:
+            entry.spill_path.unlink(missing_ok=True)
+
+    def append(self, message):
+        stored, size, spill_path = self._compact(message)
+        entry = HistoryEntry(stored, size, spill_path)
+
+        with self._lock:
+            self._entries.append(entry)
+            self._by_topic.setdefault(stored.topic, deque()).append(entry)
+            self.total_bytes += size
+
+            while self._entries and (len(self._entries) > self.capacity or self.total_bytes > self.max_bytes):
+                self._evict_oldest()
+
+    def get(self, topic: Optional[str] = None, limit: int = 100) -> List[Any]:
+        with self._lock:
+            entries = self._entries if topic is None else self._by_topic.get(topic, ())
+            recent = list(islice(reversed(entries), limit))
+        return [entry.message for entry in reversed(recent)]
+
+    def load_payload(self, message) -> Dict[str, Any]:
+        spilled_to = message.payload.get("_spilled_to")
+        if spilled_to and Path(spilled_to).exists():
+            return joblib.load(spilled_to)
+        return message.payload
+
+    def clear(self):
+        with self._lock:
+            while self._entries:
+                self._evict_oldest()
+            self.total_bytes = 0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "messages": len(self._entries),
+                "topics": len(self._by_topic),
+                "total_bytes": self.total_bytes,
+                "compacted": self.compacted,
+                "evicted": self.evicted
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,261 @@
+import json
+import sqlite3
+from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta
+from pathlib import Path
+from config.settings import DATA_DIR
+from src.utils.logger import default_logger as logger
+
+DISTRIBUTION_KEYS = {
+    "sentiment_distribution": "sentiment",
+    "topic_distribution": "topic",
+    "source_distribution": "source"
+}
+
+DOWNSAMPLE_INTERVALS = {
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400
+}
+
+RUN_KIND = "run"
+BASELINE_KIND = "baseline"
+
+class MetricsStore:
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else DATA_DIR / "metrics_store.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+        logger.info(f"MetricsStore initialized: {self.db_path}")
+
+    def _connect(self):
+        return sqlite3.connect(str(self.db_path), timeout=30)
+
+    def _init_db(self):
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_ts REAL NOT NULL,
+            run_at TEXT NOT NULL,
+            segment TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            total_count INTEGER NOT NULL,
+            negative_ratio REAL,
+            metrics TEXT NOT NULL
+        )
+        ''')
+
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_runs_segment_ts ON runs(segment, kind, run_ts)
+        ''')
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS distributions (
+            run_id INTEGER NOT NULL,
+            dimension TEXT NOT NULL,
+            category TEXT NOT NULL,
+            count INTEGER NOT NULL
+        )
+        ''')
+
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_distributions_run ON distributions(run_id)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def record_run(self, metrics: Dict[str, Any], segment: str = "all", kind: str = RUN_KIND,
+                   timestamp: Optional[datetime] = None) -> int:
+        timestamp = timestamp or datetime.now()
+
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+            INSERT INTO runs (run_ts, run_at, segment, kind, total_count, negative_ratio, metrics)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                timestamp.timestamp(),
+                timestamp.isoformat(),
+                segment,
+                kind,
+                int(metrics.get("total_count", 0)),
+                metrics.get("negative_ratio"),
+                json.dumps(metrics, ensure_ascii=False, default=str)
+            ))
+            run_id = cursor.lastrowid
+
+            rows = [
+                (run_id, dimension, str(category), int(count))
+                for key, dimension in DISTRIBUTION_KEYS.items()
+                for category, count in metrics.get(key, {}).items()
+            ]
+            cursor.executemany('''
+            INSERT INTO distributions (run_id, dimension, category, count) VALUES (?, ?, ?, ?)
+            ''', rows)
+
+            conn.commit()
+            logger.debug(f"Recorded {kind} metrics for segment {segment} at {timestamp.isoformat()}")
+            return run_id
+
+        except Exception as e:
+            logger.error(f"Error recording metrics run: {e}")
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def query_range(self, start: datetime, end: datetime, segment: str = "all",
+                    kind: str = RUN_KIND) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+            SELECT run_at, metrics FROM runs
+            WHERE segment = ? AND kind = ? AND run_ts >= ? AND run_ts < ?
+            ORDER BY run_ts
+            ''', (segment, kind, start.timestamp(), end.timestamp()))
+            return [{"run_at": run_at, "metrics": json.loads(metrics)} for run_at, metrics in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def aggregate_window(self, start: datetime, end: datetime, segment: str = "all",
+                         kind: str = RUN_KIND) -> Dict[str, Any]:
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+            SELECT COUNT(*), COALESCE(SUM(total_count), 0),
+                   SUM(negative_ratio * total_count), SUM(CASE WHEN negative_ratio IS NULL THEN 0 ELSE total_count END)
+            FROM runs
+            WHERE segment = ? AND kind = ? AND run_ts >= ? AND run_ts < ?
+            ''', (segment, kind, start.timestamp(), end.timestamp()))
+            n_runs, total_count, negative_weighted, negative_total = cursor.fetchone()
+
+            cursor.execute('''
+            SELECT d.dimension, d.category, SUM(d.count) FROM distributions d
+            JOIN runs r ON r.id = d.run_id
+            WHERE r.segment = ? AND r.kind = ? AND r.run_ts >= ? AND r.run_ts < ?
+            GROUP BY d.dimension, d.category
+            ''', (segment, kind, start.timestamp(), end.timestamp()))
+            distribution_rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        metrics = {key: {} for key in DISTRIBUTION_KEYS}
+        dimension_keys = {dimension: key for key, dimension in DISTRIBUTION_KEYS.items()}
+        for dimension, category, count in distribution_rows:
+            metrics[dimension_keys[dimension]][category] = count
+
+        metrics.update({
+            "negative_ratio": negative_weighted / negative_total if negative_total else 0,
+            "total_count": total_count,
+            "n_runs": n_runs,
+            "window_start": start.isoformat(),
+            "window_end": end.isoformat()
+        })
+        return metrics
+
+    def rolling_baseline(self, offset: timedelta = timedelta(days=7), window: timedelta = timedelta(hours=1),
+                         segment: str = "all", now: Optional[datetime] = None) -> Dict[str, Any]:
+        now = now or datetime.now()
+        return self.aggregate_window(now - offset - window, now - offset, segment)
+
+    def downsample(self, start: datetime, end: datetime, interval: str = "hour",
+                   segment: str = "all", kind: str = RUN_KIND) -> List[Dict[str, Any]]:
+        if interval not in DOWNSAMPLE_INTERVALS:
+            raise ValueError(f"Unknown interval: {interval}. Use one of {list(DOWNSAMPLE_INTERVALS)}")
+        seconds = DOWNSAMPLE_INTERVALS[interval]
+
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+            SELECT CAST(run_ts / ? AS INTEGER) AS bucket, COUNT(*), SUM(total_count),
+                   SUM(negative_ratio * total_count) / NULLIF(SUM(total_count), 0)
+            FROM runs
+            WHERE segment = ? AND kind = ? AND run_ts >= ? AND run_ts < ?
+            GROUP BY bucket ORDER BY bucket
+            ''', (seconds, segment, kind, start.timestamp(), end.timestamp()))
+
+            return [
+                {
+                    "bucket": datetime.fromtimestamp(bucket * seconds).isoformat(),
+                    "n_runs": n_runs,
+                    "total_count": total_count,
+                    "negative_ratio": negative_ratio or 0
+                }
+                for bucket, n_runs, total_count, negative_ratio in cursor.fetchall()
+            ]
+        finally:
+            conn.close()
+
+    def latest(self, segment: str = "all", kind: str = BASELINE_KIND) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+            SELECT run_at, metrics FROM runs
+            WHERE segment = ? AND kind = ?
+            ORDER BY run_ts DESC, id DESC LIMIT 1
+            ''', (segment, kind))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+        return {"timestamp": row[0], "metrics": json.loads(row[1])}
+
+    def get_segments(self) -> List[str]:
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('SELECT DISTINCT segment FROM runs ORDER BY segment')
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def apply_retention(self, max_age: timedelta = timedelta(days=90), now: Optional[datetime] = None) -> int:
+        cutoff = ((now or datetime.now()) - max_age).timestamp()
+
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            # The newest baseline per segment is kept regardless of age
+            cursor.execute('''
+            SELECT id FROM runs r
+            WHERE run_ts < ? AND NOT (
+                kind = ? AND id = (
+                    SELECT id FROM runs b WHERE b.segment = r.segment AND b.kind = ?
+                    ORDER BY run_ts DESC, id DESC LIMIT 1
+                )
+            )
+            ''', (cutoff, BASELINE_KIND, BASELINE_KIND))
+            expired = [row[0] for row in cursor.fetchall()]
+
+            cursor.executemany('DELETE FROM distributions WHERE run_id = ?', [(i,) for i in expired])
+            cursor.executemany('DELETE FROM runs WHERE id = ?', [(i,) for i in expired])
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Error applying metrics retention: {e}")
+            conn.rollback()
+            return 0
+        finally:
+            conn.close()
+
+        if expired:
+            logger.info(f"Metrics retention removed {len(expired)} runs older than {max_age}")
+        return len(expired)
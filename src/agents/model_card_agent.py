@@ -32,10 +32,13 @@ class ModelCard:
     drift_score: float = 0.0
     retraining_count: int = 0
     last_retrain_trigger: str = ""
+    model_selection: Dict[str, Any] = None
 
     def __post_init__(self):
         if self.hyperparameters is None:
             self.hyperparameters = {}
+        if self.model_selection is None:
+            self.model_selection = {}
         if self.performance_history is None:
             self.performance_history = []
 
@@ -74,7 +77,8 @@ class ModelCardAgent:
                 logger.error(f"Error loading card {card_file}: {e}")
 
     def create_model_card(self, model_name: str, model_type: str, metrics: Dict[str, float],
-                          training_data_size: int, hyperparameters: Dict[str, Any]) -> ModelCard:
+                          training_data_size: int, hyperparameters: Dict[str, Any],
+                          model_selection: Optional[Dict[str, Any]] = None) -> ModelCard:
         model_id = f"{model_type}_{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         now = datetime.now().isoformat()
 
@@ -97,7 +101,8 @@ class ModelCardAgent:
             metrics=metrics_obj,
             training_data_size=training_data_size,
             hyperparameters=hyperparameters,
-            performance_history=[metrics_obj]
+            performance_history=[metrics_obj],
+            model_selection=model_selection
         )
 
         self.model_cards[model_id] = card
@@ -165,7 +170,8 @@ class ModelCardAgent:
             model_type=payload.get('model_type', 'unknown'),
             metrics=payload.get('metrics', {}),
             training_data_size=payload.get('training_data_size', 0),
-            hyperparameters=payload.get('hyperparameters', {})
+            hyperparameters=payload.get('hyperparameters', {}),
+            model_selection=payload.get('model_selection')
         )
 
     def handle_model_evaluated(self, message: Message):
@@ -1,71 +1,272 @@
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
 import json
+import pandas as pd
 from pathlib import Path
-from src.utils.metrics import detect_drift, detect_negative_spike
+from src.utils.metrics import detect_negative_spike
+from src.utils.drift import DriftEngine, compute_drift
+from src.utils.rolling_metrics import TimeBucketedMetrics, NEGATIVE_LABELS
+from src.utils.change_point import ChangePointDetector
+from src.utils.term_attribution import TermProfile, attribute_drift, text_column
+from src.utils.trending import TrendingPhrases
+from src.utils.metrics_summary import MetricsSummary
+from src.agents.metrics_store import MetricsStore, BASELINE_KIND
 from src.agents.message_bus import MessageBus, Message, MessageType, MessagePriority
+from config.settings import METRICS_RETENTION_DAYS
 from src.utils.logger import default_logger as logger
 
+RETENTION_CHECK_INTERVAL = timedelta(hours=1)
+
 class Monitor:
-    def __init__(self, baseline_path=None, agent_id="Monitor"):
+    def __init__(self, baseline_path=None, agent_id="Monitor", check_interval=500, metrics_store=None):
         self.agent_id = agent_id
         self.message_bus = MessageBus()
         self.baseline_path = baseline_path or Path("data/baseline_metrics.json")
+        self.metrics_store = metrics_store or MetricsStore()
         self.baseline = self._load_baseline()
+        self.baseline_terms_path = self.baseline_path.with_name("baseline_terms.joblib")
+        self.baseline_terms = TermProfile.load(self.baseline_terms_path)
+        self.drift_engine = DriftEngine()
+        self.recent_texts = deque(maxlen=self.drift_engine.histograms["sentiment_label"].window_size)
+        self.rolling_metrics = TimeBucketedMetrics(bucket="minute")
+        self.spike_detector = ChangePointDetector()
+        self.trending_phrases = TrendingPhrases()
+        self.check_interval = check_interval
+        self._observed_since_check = 0
+        self._last_retention = None
+        self._sync_drift_baseline()
         self._subscribe_to_events()
         logger.info(f"{self.agent_id} initialized with message bus")
 
     def _subscribe_to_events(self):
         self.message_bus.subscribe("monitor.check_anomalies", self.handle_check_anomalies)
         self.message_bus.subscribe("monitor.save_baseline", self.handle_save_baseline)
+        self.message_bus.subscribe("monitor.observe", self.handle_observe)
+        self.message_bus.subscribe("monitor.merge_partials", self.handle_merge_partials)
 
     def _load_baseline(self):
+        baseline = self.metrics_store.latest(kind=BASELINE_KIND)
+        if baseline is not None:
+            return baseline
+
         if self.baseline_path.exists():
             with open(self.baseline_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                legacy = json.load(f)
+            if "metrics" in legacy:
+                timestamp = datetime.fromisoformat(legacy["timestamp"]) if legacy.get("timestamp") else None
+                self.metrics_store.record_run(legacy["metrics"], kind=BASELINE_KIND, timestamp=timestamp)
+                logger.info(f"Imported legacy baseline from {self.baseline_path} into metrics store")
+            return legacy
         return {}
 
-    def save_baseline(self, metrics):
-        self.baseline_path.parent.mkdir(parents=True, exist_ok=True)
+    def _sync_drift_baseline(self):
+        baseline_metrics = self.baseline.get("metrics", {})
+        if "sentiment_distribution" in baseline_metrics:
+            self.drift_engine.set_baseline("sentiment_label", baseline_metrics["sentiment_distribution"])
+        if "topic_distribution" in baseline_metrics:
+            self.drift_engine.set_baseline("topic_label", baseline_metrics["topic_distribution"])
+
+    def save_baseline(self, metrics, df_pandas=None):
+        now = datetime.now()
+        self.metrics_store.record_run(metrics, kind=BASELINE_KIND, timestamp=now)
         self.baseline = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "metrics": metrics
         }
-        with open(self.baseline_path, 'w', encoding='utf-8') as f:
-            json.dump(self.baseline, f, indent=2, ensure_ascii=False)
-        logger.info(f"Baseline saved to {self.baseline_path}")
+        self._sync_drift_baseline()
+
+        # The JSON copy keeps readers of the legacy path in step with the metrics store
+        self.baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.baseline_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.baseline, f, indent=2, ensure_ascii=False, default=str)
+        tmp_path.replace(self.baseline_path)
+        logger.info(f"Baseline saved to {self.metrics_store.db_path} and {self.baseline_path}")
+
+        profile = TermProfile.from_frame(df_pandas) if df_pandas is not None else None
+        if profile is not None:
+            profile.save(self.baseline_terms_path)
+            self.baseline_terms = profile
+            logger.info(f"Baseline term profile saved to {self.baseline_terms_path}")
+        else:
+            # A profile from an older baseline would attribute drift against the wrong texts
+            self.baseline_terms_path.unlink(missing_ok=True)
+            self.baseline_terms = None
+            logger.warning("Baseline saved without comment texts, drift attribution is unavailable until "
+                           "a baseline is saved with data")
+
+    def record_run(self, df_pandas, segment_column='source'):
+        now = datetime.now()
+        metrics = self.calculate_current_metrics(df_pandas)
+        self.metrics_store.record_run(metrics, timestamp=now)
+
+        if segment_column in df_pandas.columns:
+            for value, segment_df in df_pandas.groupby(segment_column):
+                self.metrics_store.record_run(self.calculate_current_metrics(segment_df),
+                                              segment=f"{segment_column}:{value}", timestamp=now)
+
+        if self._last_retention is None or now - self._last_retention >= RETENTION_CHECK_INTERVAL:
+            self.metrics_store.apply_retention(max_age=timedelta(days=METRICS_RETENTION_DAYS), now=now)
+            self._last_retention = now
+        return metrics
+
+    def load_rolling_baseline(self, offset=timedelta(days=7), window=timedelta(hours=1), segment="all"):
+        return self.metrics_store.rolling_baseline(offset=offset, window=window, segment=segment)
+
+    def detect_anomalies_vs_history(self, current_metrics, offset=timedelta(days=7),
+                                    window=timedelta(hours=1), segment="all", current_frame=None):
+        baseline_metrics = self.load_rolling_baseline(offset, window, segment)
+        if baseline_metrics["n_runs"] == 0:
+            logger.info(f"No history for segment {segment} {offset} ago, skipping rolling baseline check")
+            return []
+        return self.detect_anomalies(current_metrics, baseline_metrics=baseline_metrics, current_frame=current_frame)
+
+    def _remember_texts(self, df_pandas):
+        column = text_column(df_pandas)
+        if column is None:
+            return
+        columns = [column] + [c for c in ('sentiment_label', 'topic_label') if c in df_pandas.columns]
+        self.recent_texts.extend(df_pandas[columns].rename(columns={column: 'text'}).to_dict('records'))
+
+    def observe(self, records, publish=True):
+        frame = pd.DataFrame.from_records(records)
+        self._remember_texts(frame)
+        self.trending_phrases.update_dataframe(frame)
+        self.drift_engine.update_many(records)
+        self.rolling_metrics.update(records)
+        self._observed_since_check += len(records)
+        return self._handle_spikes(self.spike_detector.update_many(records), publish)
+
+    def observe_dataframe(self, df_pandas, publish=True):
+        columns = [c for c in ('sentiment_label', 'topic_label') if c in df_pandas.columns]
+        self.drift_engine.update_many(df_pandas[columns].to_dict('records'))
+        self._remember_texts(df_pandas)
+        self.trending_phrases.update_dataframe(df_pandas)
+        self.rolling_metrics.update_dataframe(df_pandas)
+        self._observed_since_check += len(df_pandas)
+        return self._handle_spikes(self.spike_detector.update_dataframe(df_pandas), publish)
+
+    def _handle_spikes(self, spikes, publish):
+        if spikes:
+            logger.warning(f"Detected {len(spikes)} segment negative spikes")
+            if publish:
+                self._publish_anomalies(spikes)
+        return spikes
+
+    def window_metrics(self, window=timedelta(hours=1), baseline_offset=timedelta(days=7), now=None):
+        return self.rolling_metrics.compare(window, baseline_offset, now=now)
+
+    def detect_window_anomalies(self, window=timedelta(hours=1), baseline_offset=timedelta(days=7), now=None):
+        windows = self.window_metrics(window, baseline_offset, now=now)
+        if windows["baseline"]["total_count"] == 0 or windows["current"]["total_count"] == 0:
+            logger.info("Not enough data in current or baseline window, skipping window anomaly detection")
+            return []
+        return self.detect_anomalies(windows["current"], baseline_metrics=windows["baseline"])
+
+    def streaming_metrics(self):
+        metrics = {}
+
+        sentiment_dist = self.drift_engine.current_distribution("sentiment_label")
+        if sentiment_dist:
+            total = sum(sentiment_dist.values())
+            metrics["sentiment_distribution"] = sentiment_dist
+            metrics["negative_ratio"] = sum(sentiment_dist.get(l, 0) for l in NEGATIVE_LABELS) / total
+
+        topic_dist = self.drift_engine.current_distribution("topic_label")
+        if topic_dist:
+            metrics["topic_distribution"] = topic_dist
+
+        metrics["total_count"] = self.drift_engine.window_count("sentiment_label")
+        metrics["timestamp"] = datetime.now().isoformat()
+
+        return metrics
+
+    def detect_trending_phrases(self, growth_threshold=None):
+        phrases = self.trending_phrases.trending(growth_threshold=growth_threshold)
+        if not phrases:
+            return []
+
+        return [{
+            "type": "trending_phrases",
+            "phrases": phrases,
+            "message": "Emerging phrases: " + ", ".join(f"'{p['phrase']}' x{p['growth']:.1f}" for p in phrases[:5])
+        }]
+
+    def _drift_anomaly(self, anomaly_type, name, baseline_dist, current_dist):
+        result = compute_drift(baseline_dist, current_dist, metric=self.drift_engine.metric,
+                               threshold=self.drift_engine.threshold)
+        if not result["is_drift"]:
+            return None
+
+        return {
+            "type": anomaly_type,
+            "score": result["score"],
+            "metric": result["metric"],
+            "new_categories": result["new_categories"],
+            "missing_categories": result["missing_categories"],
+            "message": f"{name} distribution drift detected: {result['score']:.3f} ({result['metric']})"
+        }
 
-    def detect_anomalies(self, current_metrics):
+    def _attribute_anomalies(self, anomalies, baseline_metrics, current_metrics, current_frame, saved_baseline=True):
+        drift_anomalies = [a for a in anomalies if a["type"] in ("sentiment_drift", "topic_drift")]
+        if not drift_anomalies:
+            return
+
+        # The stored term profile describes the saved baseline only, other baselines have no texts to compare
+        if not saved_baseline:
+            reason = "term attribution is only available against the saved baseline"
+        elif self.baseline_terms is None:
+            reason = f"no baseline term profile at {self.baseline_terms_path}, save the baseline with data to enable it"
+            logger.warning(f"Drift attribution unavailable: {reason}")
+        else:
+            reason = None
+
+        if reason is not None:
+            for anomaly in drift_anomalies:
+                anomaly["attribution"] = []
+                anomaly["attribution_unavailable"] = reason
+            return
+
+        if current_frame is None:
+            current_frame = pd.DataFrame.from_records(list(self.recent_texts))
+        current_terms = TermProfile.from_frame(current_frame)
+        if current_terms is None:
+            return
+
+        for anomaly in drift_anomalies:
+            dimension, key = (("sentiment_label", "sentiment_distribution") if anomaly["type"] == "sentiment_drift"
+                              else ("topic_label", "topic_distribution"))
+            anomaly["attribution"] = attribute_drift(current_terms, self.baseline_terms, dimension,
+                                                     baseline_metrics[key], current_metrics[key])
+
+    def detect_anomalies(self, current_metrics=None, baseline_metrics=None, current_frame=None):
         anomalies = []
+        streaming = current_metrics is None
+        saved_baseline = baseline_metrics is None
+
+        if baseline_metrics is None:
+            if not self.baseline or "metrics" not in self.baseline:
+                logger.warning("No baseline found, skipping anomaly detection")
+                return self.detect_trending_phrases() if current_metrics is None else anomalies
+            baseline_metrics = self.baseline["metrics"]
+
+        if current_metrics is None:
+            current_metrics = self.streaming_metrics()
+            if current_metrics["total_count"] < self.drift_engine.min_observations:
+                return anomalies
 
-        if not self.baseline or "metrics" not in self.baseline:
-            logger.warning("No baseline found, skipping anomaly detection")
-            return anomalies
-
-        baseline_metrics = self.baseline["metrics"]
-
-        if "sentiment_distribution" in baseline_metrics and "sentiment_distribution" in current_metrics:
-            is_drift, drift_score = detect_drift(
-                baseline_metrics["sentiment_distribution"],
-                current_metrics["sentiment_distribution"]
-            )
-            if is_drift:
-                anomalies.append({
-                    "type": "sentiment_drift",
-                    "score": drift_score,
-                    "message": f"Sentiment distribution drift detected: {drift_score:.3f}"
-                })
-
-        if "topic_distribution" in baseline_metrics and "topic_distribution" in current_metrics:
-            is_drift, drift_score = detect_drift(
-                baseline_metrics["topic_distribution"],
-                current_metrics["topic_distribution"]
-            )
-            if is_drift:
-                anomalies.append({
-                    "type": "topic_drift",
-                    "score": drift_score,
-                    "message": f"Topic distribution drift detected: {drift_score:.3f}"
-                })
+        for key, anomaly_type, name in [("sentiment_distribution", "sentiment_drift", "Sentiment"),
+                                        ("topic_distribution", "topic_drift", "Topic")]:
+            if key in baseline_metrics and key in current_metrics:
+                anomaly = self._drift_anomaly(anomaly_type, name, baseline_metrics[key], current_metrics[key])
+                if anomaly:
+                    anomalies.append(anomaly)
+
+        if current_frame is not None or streaming:
+            self._attribute_anomalies(anomalies, baseline_metrics, current_metrics, current_frame, saved_baseline)
+
+        if streaming:
+            anomalies.extend(self.detect_trending_phrases())
 
         baseline_neg_ratio = baseline_metrics.get("negative_ratio", 0)
         current_neg_ratio = current_metrics.get("negative_ratio", 0)
@@ -88,31 +289,56 @@ class Monitor:
             metrics["sentiment_distribution"] = sentiment_dist
 
             total = len(df_pandas)
-            negative_count = df_pandas[df_pandas['sentiment_label'].isin(['Negative', 'Very Negative'])].shape[0]
+            negative_count = df_pandas[df_pandas['sentiment_label'].isin(list(NEGATIVE_LABELS))].shape[0]
             metrics["negative_ratio"] = negative_count / total if total > 0 else 0
 
         if 'topic_label' in df_pandas.columns:
             topic_dist = df_pandas['topic_label'].value_counts().to_dict()
             metrics["topic_distribution"] = topic_dist
 
+        if 'source' in df_pandas.columns:
+            metrics["source_distribution"] = df_pandas['source'].value_counts().to_dict()
+
         metrics["total_count"] = len(df_pandas)
         metrics["timestamp"] = datetime.now().isoformat()
 
         return metrics
 
+    def summarize(self, df_pandas):
+        return MetricsSummary.from_dataframe(df_pandas).to_dict()
+
+    def metrics_from_partials(self, partials):
+        return MetricsSummary.combine(partials).to_metrics()
+
+    def _publish_anomalies(self, anomalies):
+        self.message_bus.publish(Message(
+            type=MessageType.EVENT,
+            sender=self.agent_id,
+            topic="monitor.anomalies_detected",
+            payload={"anomalies": anomalies, "count": len(anomalies)},
+            priority=MessagePriority.HIGH
+        ))
+
     def handle_check_anomalies(self, message: Message):
-        current_metrics = message.payload.get('current_metrics', {})
+        current_metrics = message.payload.get('current_metrics')
         anomalies = self.detect_anomalies(current_metrics)
         self.message_bus.respond(message, {"anomalies": anomalies})
 
         if anomalies:
-            self.message_bus.publish(Message(
-                type=MessageType.EVENT,
-                sender=self.agent_id,
-                topic="monitor.anomalies_detected",
-                payload={"anomalies": anomalies, "count": len(anomalies)},
-                priority=MessagePriority.HIGH
-            ))
+            self._publish_anomalies(anomalies)
+
+    def handle_observe(self, message: Message):
+        self.observe(message.payload.get('records', []))
+
+        if self._observed_since_check >= self.check_interval:
+            self._observed_since_check = 0
+            anomalies = self.detect_anomalies()
+            if anomalies:
+                self._publish_anomalies(anomalies)
+
+    def handle_merge_partials(self, message: Message):
+        metrics = self.metrics_from_partials(message.payload.get('partials', []))
+        self.message_bus.respond(message, {"metrics": metrics})
 
     def handle_save_baseline(self, message: Message):
         metrics = message.payload.get('metrics', {})
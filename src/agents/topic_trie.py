@@ -0,0 +1,76 @@
+from typing import Dict, List, Callable, Any
+
+SINGLE_WILDCARD = "*"
+MULTI_WILDCARD = "#"
+
+def is_pattern(topic: str) -> bool:
+    return any(part in (SINGLE_WILDCARD, MULTI_WILDCARD) for part in topic.split("."))
+
+class TrieNode:
+    __slots__ = ("children", "callbacks")
+
+    def __init__(self):
+        self.children: Dict[str, "TrieNode"] = {}
+        self.callbacks: List[Callable] = []
+
+class TopicTrie:
+    def __init__(self):
+        self.root = TrieNode()
+        self.size = 0
+
+    def add(self, pattern: str, callback: Callable[[Any], Any]):
+        node = self.root
+        for part in pattern.split("."):
+            node = node.children.setdefault(part, TrieNode())
+        node.callbacks.append(callback)
+        self.size += 1
+
+    def remove(self, pattern: str, callback: Callable) -> bool:
+        path = [self.root]
+        for part in pattern.split("."):
+            node = path[-1].children.get(part)
+            if node is None:
+                return False
+            path.append(node)
+
+        if callback not in path[-1].callbacks:
+            return False
+        path[-1].callbacks.remove(callback)
+        self.size -= 1
+
+        # Prune branches that no longer lead to any subscription
+        for parent, part, node in zip(reversed(path[:-1]), reversed(pattern.split(".")), reversed(path)):
+            if node.callbacks or node.children:
+                break
+            del parent.children[part]
+        return True
+
+    def match(self, topic: str) -> List[Callable]:
+        parts = topic.split(".")
+        matched: Dict[Callable, None] = {}
+        self._match(self.root, parts, 0, matched, set())
+        return list(matched)
+
+    def _match(self, node: TrieNode, parts: List[str], index: int, matched: Dict, visited: set):
+        # `#` can reach the same (node, index) along several paths, visiting once keeps matching linear
+        key = (id(node), index)
+        if key in visited:
+            return
+        visited.add(key)
+
+        multi = node.children.get(MULTI_WILDCARD)
+        if multi is not None:
+            for rest in range(index, len(parts) + 1):
+                self._match(multi, parts, rest, matched, visited)
+
+        if index == len(parts):
+            matched.update(dict.fromkeys(node.callbacks))
+            return
+
+        for part in (parts[index], SINGLE_WILDCARD):
+            child = node.children.get(part)
+            if child is not None:
+                self._match(child, parts, index + 1, matched, visited)
+
+    def __len__(self):
+        return self.size
@@ -191,6 +191,8 @@ class ChatbotTools:
         monitor = Monitor()
         current_metrics = monitor.calculate_current_metrics(self.df_pandas)
         anomalies = monitor.detect_anomalies(current_metrics)
+        monitor.trending_phrases.update_dataframe(self.df_pandas)
+        anomalies += monitor.detect_trending_phrases()
 
         if not anomalies:
             return "✅ No anomalies detected. System is healthy."
@@ -198,6 +200,8 @@ class ChatbotTools:
         result = f"⚠️ Detected {len(anomalies)} anomalies:\n\n"
         for anomaly in anomalies:
             result += f"- {anomaly['type']}: {anomaly['message']}\n"
+            for phrase in anomaly.get('phrases', []):
+                result += f"   • \"{phrase['phrase']}\": {phrase['count']} mentions, {phrase['growth']:.1f}x vs previous buckets\n"
 
         return result
 
@@ -320,6 +324,7 @@ class ChatbotTools:
             from src.models.sentiment.classifier import SentimentClassifier
             from src.models.sentiment.fallback import fallback_predict
             from src.models.trainer import train_topic_auto_model
+            from src.models.prediction_cache import predict_topics, predict_sentiment
 
             result = f"🔄 Starting analysis on {file_path}...\n\n"
 
@@ -336,15 +341,15 @@ class ChatbotTools:
                 topic_model = AutoTopicModel.load(topic_path)
             else:
                 result += "⚙️ Training new topic model...\n"
-                topic_model = train_topic_auto_model(texts, n_clusters=5, log_mlflow=False)
+                topic_model = train_topic_auto_model(texts, log_mlflow=False, auto_k=True)
 
-            topic_labels, _ = topic_model.predict(texts)
+            topic_labels, _ = predict_topics(topic_model, texts)
             result += f"✅ Step 3: Topic analysis complete\n"
 
             sentiment_path = SENTIMENT_MODEL_DIR / "sentiment_model"
             if sentiment_path.exists():
                 sentiment_model = SentimentClassifier.load(sentiment_path)
-                sentiment_labels, sentiment_scores, _ = sentiment_model.predict_with_scores(texts)
+                sentiment_labels, sentiment_scores, _ = predict_sentiment(sentiment_model, texts)
             else:
                 result += "⚙️ Using fallback sentiment analysis...\n"
                 sentiment_labels, sentiment_scores = fallback_predict(texts)
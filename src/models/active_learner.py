@@ -1,5 +1,6 @@
+import heapq
 import numpy as np
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterable
 from dataclasses import dataclass
 from src.utils.logger import default_logger as logger
 
@@ -11,98 +12,138 @@ class UncertaintySample:
     predicted_label: str
     confidence_scores: Dict[str, float]
 
+def least_confidence_scores(probabilities: np.ndarray) -> np.ndarray:
+    return 1.0 - np.max(probabilities, axis=1)
+
+def margin_scores(probabilities: np.ndarray) -> np.ndarray:
+    if probabilities.shape[1] < 2:
+        return 1.0 - probabilities[:, 0]
+    top_two = np.partition(probabilities, -2, axis=1)[:, -2:]
+    return 1.0 - (top_two[:, 1] - top_two[:, 0])
+
+def entropy_scores(probabilities: np.ndarray) -> np.ndarray:
+    probs = probabilities + 1e-10
+    return -np.sum(probs * np.log(probs), axis=1)
+
+UNCERTAINTY_STRATEGIES = {
+    "least_confidence": least_confidence_scores,
+    "margin": margin_scores,
+    "entropy": entropy_scores
+}
+
+def top_k_indices(scores: np.ndarray, top_k: int, candidates: np.ndarray = None) -> np.ndarray:
+    if candidates is None:
+        candidates = np.arange(len(scores))
+    if top_k <= 0:
+        return candidates[:0]
+    if len(candidates) > top_k:
+        candidate_scores = scores[candidates]
+        kth_score = -np.partition(-candidate_scores, top_k - 1)[top_k - 1]
+        # Keep every row tied with the k-th score so ties resolve to the earliest rows
+        candidates = candidates[candidate_scores >= kth_score]
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][:top_k]
+
+def _build_sample(index, text, score, prediction, probs) -> UncertaintySample:
+    return UncertaintySample(
+        index=int(index),
+        text=text,
+        uncertainty_score=float(score),
+        predicted_label=prediction,
+        confidence_scores={f"class_{i}": float(p) for i, p in enumerate(probs)}
+    )
+
+class StreamingUncertaintySampler:
+    def __init__(self, strategy: str = "least_confidence", top_k: int = 20, threshold: float = None):
+        if strategy not in UNCERTAINTY_STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}. Use one of {list(UNCERTAINTY_STRATEGIES)}")
+
+        self.strategy = strategy
+        self.top_k = top_k
+        self.threshold = threshold
+        self.rows_seen = 0
+        self._heap = []
+
+    def update(self, texts: List[str], predictions: List[str], probabilities: np.ndarray):
+        probabilities = np.asarray(probabilities)
+        scores = UNCERTAINTY_STRATEGIES[self.strategy](probabilities)
+
+        candidates = None
+        if self.threshold is not None:
+            candidates = np.flatnonzero(scores >= self.threshold)
+
+        for local_idx in top_k_indices(scores, self.top_k, candidates):
+            global_idx = self.rows_seen + int(local_idx)
+            # Min-heap on (score, -index): the weakest entry sits on top, ties keep the earliest rows
+            entry = (float(scores[local_idx]), -global_idx, texts[local_idx],
+                     predictions[local_idx], probabilities[local_idx].copy())
+
+            if len(self._heap) < self.top_k:
+                heapq.heappush(self._heap, entry)
+            elif entry[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, entry)
+
+        self.rows_seen += len(probabilities)
+
+    def result(self) -> List[UncertaintySample]:
+        entries = sorted(self._heap, key=lambda e: (-e[0], -e[1]))
+        return [_build_sample(-neg_idx, text, score, pred, probs)
+                for score, neg_idx, text, pred, probs in entries]
+
 class ActiveLearner:
     def __init__(self, uncertainty_threshold: float = 0.3):
         self.uncertainty_threshold = uncertainty_threshold
         self.uncertain_samples: List[UncertaintySample] = []
         logger.info("ActiveLearner initialized")
 
-    def identify_uncertain_samples(self, texts: List[str], predictions: List[str],
-                                   probabilities: np.ndarray, top_k: int = 20) -> List[UncertaintySample]:
-        uncertain_samples = []
-
-        for idx, (text, pred, probs) in enumerate(zip(texts, predictions, probabilities)):
-            max_prob = np.max(probs)
-            uncertainty_score = 1.0 - max_prob
-
-            if uncertainty_score >= self.uncertainty_threshold:
-                confidence_scores = {f"class_{i}": float(p) for i, p in enumerate(probs)}
+    def _select(self, probabilities, texts, predictions, strategy, top_k, threshold=None):
+        probabilities = np.asarray(probabilities)
+        scores = UNCERTAINTY_STRATEGIES[strategy](probabilities)
 
-                sample = UncertaintySample(
-                    index=idx,
-                    text=text,
-                    uncertainty_score=uncertainty_score,
-                    predicted_label=pred,
-                    confidence_scores=confidence_scores
-                )
-                uncertain_samples.append(sample)
+        candidates = None
+        if threshold is not None:
+            candidates = np.flatnonzero(scores >= threshold)
 
-        uncertain_samples.sort(key=lambda x: x.uncertainty_score, reverse=True)
+        return [
+            _build_sample(idx, texts[idx], scores[idx], predictions[idx], probabilities[idx])
+            for idx in top_k_indices(scores, top_k, candidates)
+        ]
 
-        self.uncertain_samples = uncertain_samples[:top_k]
+    def identify_uncertain_samples(self, texts: List[str], predictions: List[str],
+                                   probabilities: np.ndarray, top_k: int = 20) -> List[UncertaintySample]:
+        self.uncertain_samples = self._select(probabilities, texts, predictions, "least_confidence",
+                                              top_k, threshold=self.uncertainty_threshold)
         logger.info(f"Identified {len(self.uncertain_samples)} uncertain samples")
 
         return self.uncertain_samples
 
     def margin_sampling(self, probabilities: np.ndarray, texts: List[str], predictions: List[str],
                        top_k: int = 20) -> List[UncertaintySample]:
-        margins = []
+        self.uncertain_samples = self._select(probabilities, texts, predictions, "margin", top_k)
+        logger.info(f"Margin sampling identified {len(self.uncertain_samples)} samples")
 
-        for probs in probabilities:
-            sorted_probs = np.sort(probs)[::-1]
-            margin = sorted_probs[0] - sorted_probs[1] if len(sorted_probs) > 1 else sorted_probs[0]
-            margins.append(margin)
-
-        margins = np.array(margins)
-        uncertain_indices = np.argsort(margins)[:top_k]
-
-        uncertain_samples = []
-        for idx in uncertain_indices:
-            confidence_scores = {f"class_{i}": float(p) for i, p in enumerate(probabilities[idx])}
-
-            sample = UncertaintySample(
-                index=int(idx),
-                text=texts[idx],
-                uncertainty_score=1.0 - margins[idx],
-                predicted_label=predictions[idx],
-                confidence_scores=confidence_scores
-            )
-            uncertain_samples.append(sample)
-
-        self.uncertain_samples = uncertain_samples
-        logger.info(f"Margin sampling identified {len(uncertain_samples)} samples")
-
-        return uncertain_samples
+        return self.uncertain_samples
 
     def entropy_sampling(self, probabilities: np.ndarray, texts: List[str], predictions: List[str],
                         top_k: int = 20) -> List[UncertaintySample]:
-        entropies = []
-
-        for probs in probabilities:
-            probs = probs + 1e-10
-            entropy = -np.sum(probs * np.log(probs))
-            entropies.append(entropy)
+        self.uncertain_samples = self._select(probabilities, texts, predictions, "entropy", top_k)
+        logger.info(f"Entropy sampling identified {len(self.uncertain_samples)} samples")
 
-        entropies = np.array(entropies)
-        uncertain_indices = np.argsort(entropies)[::-1][:top_k]
+        return self.uncertain_samples
 
-        uncertain_samples = []
-        for idx in uncertain_indices:
-            confidence_scores = {f"class_{i}": float(p) for i, p in enumerate(probabilities[idx])}
+    def stream_uncertain_samples(self, chunks: Iterable[Tuple[List[str], List[str], np.ndarray]],
+                                 strategy: str = "least_confidence", top_k: int = 20) -> List[UncertaintySample]:
+        threshold = self.uncertainty_threshold if strategy == "least_confidence" else None
+        sampler = StreamingUncertaintySampler(strategy=strategy, top_k=top_k, threshold=threshold)
 
-            sample = UncertaintySample(
-                index=int(idx),
-                text=texts[idx],
-                uncertainty_score=entropies[idx],
-                predicted_label=predictions[idx],
-                confidence_scores=confidence_scores
-            )
-            uncertain_samples.append(sample)
+        for texts, predictions, probabilities in chunks:
+            sampler.update(texts, predictions, probabilities)
 
-        self.uncertain_samples = uncertain_samples
-        logger.info(f"Entropy sampling identified {len(uncertain_samples)} samples")
+        self.uncertain_samples = sampler.result()
+        logger.info(f"Streaming {strategy} sampling identified {len(self.uncertain_samples)} samples "
+                    f"from {sampler.rows_seen} rows")
 
-        return uncertain_samples
+        return self.uncertain_samples
 
     def get_samples_for_labeling(self) -> List[Dict[str, Any]]:
         return [
@@ -1,9 +1,11 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
 from src.models.sentiment.classifier import SentimentClassifier
 from src.models.topic.auto_topic import AutoTopicModel
+from src.models.topic.k_selection import evaluate_topic_model
+from src.models.topic.coherence import topic_coherence
 from src.models.trainer import train_sentiment_model, train_topic_auto_model
 from src.agents.message_bus import MessageBus, Message, MessageType, MessagePriority
 from src.utils.logger import default_logger as logger
@@ -15,8 +17,10 @@ class AutoTrainer:
         self.message_bus = MessageBus()
         self.training_queue: List[Dict[str, Any]] = []
         self.training_history: List[Dict[str, Any]] = []
+        self.skipped_trainings = 0
         self.min_samples_for_training = 10
         self.retrain_threshold_accuracy = 0.7
+        self.warm_start_max_oov_ratio = 0.05
 
         self._subscribe_to_events()
         logger.info(f"{self.agent_id} initialized")
@@ -80,7 +84,30 @@ class AutoTrainer:
             "priority": MessagePriority.HIGH
         })
 
-    def train_sentiment_auto(self, df: pd.DataFrame, model_name: str = "sentiment_auto") -> Dict[str, Any]:
+    def _load_warm_start_model(self, model_name: str, texts: List[str],
+                               labels: List[str]) -> Tuple[Optional[SentimentClassifier], str]:
+        model_path = SENTIMENT_MODEL_DIR / model_name
+        if not model_path.exists():
+            return None, "no_previous_model"
+
+        try:
+            previous = SentimentClassifier.load(model_path)
+        except Exception as e:
+            logger.warning(f"Could not load previous sentiment model for warm start: {e}")
+            return None, "previous_model_unreadable"
+
+        if set(labels) != set(previous.classes_):
+            return None, "label_set_changed"
+
+        oov_ratio = previous.oov_ratio(texts)
+        if oov_ratio > self.warm_start_max_oov_ratio:
+            logger.info(f"Vocabulary drift {oov_ratio:.3f} above {self.warm_start_max_oov_ratio}, full refit")
+            return None, "vocabulary_drift"
+
+        return previous, "low_drift"
+
+    def train_sentiment_auto(self, df: pd.DataFrame, model_name: str = "sentiment_auto",
+                             warm_start: bool = False) -> Dict[str, Any]:
         if 'comment_lower' not in df.columns or 'sentiment_label' not in df.columns:
             raise ValueError("DataFrame must have 'comment_lower' and 'sentiment_label' columns")
 
@@ -90,10 +117,22 @@ class AutoTrainer:
         if len(texts) < self.min_samples_for_training:
             raise ValueError(f"Need at least {self.min_samples_for_training} samples, got {len(texts)}")
 
-        logger.info(f"Auto-training sentiment model with {len(texts)} samples")
+        previous, fit_reason = None, "requested"
+        if warm_start:
+            previous, fit_reason = self._load_warm_start_model(model_name, texts, labels)
+        fit_mode = "warm_start" if previous is not None else "full_refit"
+
+        logger.info(f"Auto-training sentiment model with {len(texts)} samples ({fit_mode}: {fit_reason})")
 
         try:
-            model, metrics = train_sentiment_model(texts, labels, model_name, log_mlflow=False)
+            model, metrics = train_sentiment_model(texts, labels, model_name, log_mlflow=False,
+                                                   warm_start_from=previous, skip_if_unchanged=True)
+            if metrics.get("reused_artifact"):
+                self._publish_training_skipped("sentiment", model_name)
+                return metrics
+
+            metrics["fit_mode"] = fit_mode
+            metrics["fit_reason"] = fit_reason
 
             self.training_history.append({
                 "model_type": "sentiment",
@@ -112,7 +151,7 @@ class AutoTrainer:
                     "model_type": "sentiment",
                     "metrics": metrics,
                     "training_data_size": len(texts),
-                    "hyperparameters": {"min_samples": self.min_samples_for_training}
+                    "hyperparameters": {"min_samples": self.min_samples_for_training, "fit_mode": fit_mode}
                 }
             ))
 
@@ -130,19 +169,40 @@ class AutoTrainer:
             ))
             raise
 
-    def train_topic_auto(self, texts: List[str], n_clusters: int = 5, model_name: str = "topic_auto") -> Dict[str, Any]:
+    def train_topic_auto(self, texts: List[str], n_clusters: int = 5, model_name: str = "topic_auto",
+                         auto_k: bool = False) -> Dict[str, Any]:
         if len(texts) < self.min_samples_for_training:
             raise ValueError(f"Need at least {self.min_samples_for_training} samples, got {len(texts)}")
 
-        logger.info(f"Auto-training topic model with {len(texts)} samples, {n_clusters} clusters")
+        if auto_k:
+            logger.info(f"Auto-training topic model with {len(texts)} samples, searching n_clusters")
+        else:
+            logger.info(f"Auto-training topic model with {len(texts)} samples, {n_clusters} clusters")
 
         try:
-            model = train_topic_auto_model(texts, n_clusters, log_mlflow=False)
+            model = train_topic_auto_model(texts, n_clusters, log_mlflow=False, auto_k=auto_k,
+                                           skip_if_unchanged=True)
+            n_clusters = model.n_clusters
+            k_selection = model.k_selection
+
+            if model.reused_artifact:
+                self._publish_training_skipped("topic", model_name)
+                return {"n_clusters": n_clusters, "n_samples": len(texts), "reused_artifact": True}
+
+            if k_selection and k_selection["metric"] == "silhouette" and k_selection["best_k"] == n_clusters:
+                silhouette = k_selection["best_score"]
+            else:
+                silhouette = evaluate_topic_model(model, texts, metric="silhouette")
+
+            coherence = topic_coherence(model, texts)
 
             metrics = {
                 "n_clusters": n_clusters,
                 "n_samples": len(texts),
-                "silhouette_score": 0.0
+                "silhouette_score": silhouette,
+                "coherence": coherence["mean"],
+                "coherence_measure": coherence["measure"],
+                "coherence_per_topic": coherence["per_topic"]
             }
 
             self.training_history.append({
@@ -162,7 +222,8 @@ class AutoTrainer:
                     "model_type": "topic",
                     "metrics": metrics,
                     "training_data_size": len(texts),
-                    "hyperparameters": {"n_clusters": n_clusters}
+                    "hyperparameters": {"n_clusters": n_clusters, "auto_k": auto_k},
+                    "model_selection": k_selection
                 }
             ))
 
@@ -180,6 +241,17 @@ class AutoTrainer:
             ))
             raise
 
+    def _publish_training_skipped(self, model_type: str, model_name: str):
+        self.skipped_trainings += 1
+        logger.info(f"Skipped {model_type} retrain for {model_name}: data, config and code unchanged")
+
+        self.message_bus.publish(Message(
+            type=MessageType.EVENT,
+            sender=self.agent_id,
+            topic="training.skipped",
+            payload={"model_type": model_type, "model_name": model_name, "reason": "unchanged_fingerprint"}
+        ))
+
     def process_training_queue(self, df: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
         if not self.training_queue:
             logger.info("Training queue is empty")
@@ -194,19 +266,20 @@ class AutoTrainer:
                 model_type = task.get('model_type')
 
                 if model_type == 'sentiment' and df is not None:
-                    metrics = self.train_sentiment_auto(df)
+                    warm_start = task.get('reason') == 'new_data_available'
+                    metrics = self.train_sentiment_auto(df, warm_start=warm_start)
                     results.append({
                         "task": task,
-                        "status": "success",
+                        "status": "skipped" if metrics.get("reused_artifact") else "success",
                         "metrics": metrics
                     })
 
                 elif model_type == 'topic' and df is not None:
                     texts = df['comment_lower'].tolist()
-                    metrics = self.train_topic_auto(texts)
+                    metrics = self.train_topic_auto(texts, auto_k=True)
                     results.append({
                         "task": task,
-                        "status": "success",
+                        "status": "skipped" if metrics.get("reused_artifact") else "success",
                         "metrics": metrics
                     })
 
@@ -233,6 +306,7 @@ class AutoTrainer:
         return {
             "queue_size": len(self.training_queue),
             "total_trainings": len(self.training_history),
+            "skipped_trainings": self.skipped_trainings,
             "recent_trainings": self.training_history[-5:],
             "pending_tasks": self.training_queue
         }
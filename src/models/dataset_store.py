@@ -0,0 +1,313 @@
+import json
+import sqlite3
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from config.settings import BASE_DIR, LABELED_DIR
+from src.utils.logger import default_logger as logger
+
+TRAINING_CODE_FILES = [
+    "config/model_config.py",
+    "src/models/trainer.py",
+    "src/models/sentiment/classifier.py",
+    "src/models/topic/auto_topic.py",
+    "src/models/topic/supervised_topic.py",
+    "src/models/topic/k_selection.py"
+]
+
+FINGERPRINT_FILE = "fingerprint.txt"
+
+_code_version_cache: Optional[str] = None
+
+def row_hash(text: str, label: Optional[str] = None) -> str:
+    content = f"{text}\x1f{'' if label is None else label}"
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def dataset_hash(texts: List[str], labels: Optional[List[str]] = None) -> str:
+    if labels is None:
+        labels = [None] * len(texts)
+
+    digest = hashlib.sha256()
+    for h in sorted(row_hash(text, label) for text, label in zip(texts, labels)):
+        digest.update(h.encode())
+    return digest.hexdigest()
+
+def config_hash(config: Dict[str, Any]) -> str:
+    content = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def code_version() -> str:
+    global _code_version_cache
+    if _code_version_cache is None:
+        digest = hashlib.sha256()
+        for rel_path in TRAINING_CODE_FILES:
+            path = BASE_DIR / rel_path
+            if path.exists():
+                digest.update(rel_path.encode())
+                digest.update(path.read_bytes())
+        _code_version_cache = digest.hexdigest()[:16]
+    return _code_version_cache
+
+def training_fingerprint(data_hash: str, cfg_hash: str, code_ver: Optional[str] = None) -> str:
+    code_ver = code_ver or code_version()
+    return hashlib.sha256(f"{data_hash}:{cfg_hash}:{code_ver}".encode()).hexdigest()
+
+def clear_fingerprint(model_dir: Path):
+    # Any save invalidates the marker, record_training rewrites it only for fingerprinted trainings
+    (Path(model_dir) / FINGERPRINT_FILE).unlink(missing_ok=True)
+
+@dataclass
+class DatasetSnapshot:
+    dataset: str
+    dataset_hash: str
+    n_rows: int
+    n_new_rows: int
+    created_at: str
+
+@dataclass
+class TrainingRecord:
+    fingerprint: str
+    model_type: str
+    model_name: str
+    artifact_path: str
+    dataset_hash: str
+    config_hash: str
+    code_version: str
+    metrics: Dict[str, Any]
+    created_at: str
+
+class DatasetStore:
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else LABELED_DIR / "dataset_store.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _init_db(self):
+        conn = sqlite3.connect(str(self.db_path))
+        cursor = conn.cursor()
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS labeled_rows (
+            dataset TEXT NOT NULL,
+            row_hash TEXT NOT NULL,
+            text TEXT NOT NULL,
+            label TEXT,
+            added_at TEXT NOT NULL,
+            PRIMARY KEY (dataset, row_hash)
+        )
+        ''')
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            dataset TEXT NOT NULL,
+            dataset_hash TEXT NOT NULL,
+            n_rows INTEGER NOT NULL,
+            n_new_rows INTEGER NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        ''')
+
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_snapshot_dataset ON snapshots(dataset, id DESC)
+        ''')
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS trainings (
+            fingerprint TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            model_type TEXT NOT NULL,
+            artifact_path TEXT NOT NULL,
+            dataset_hash TEXT NOT NULL,
+            config_hash TEXT NOT NULL,
+            code_version TEXT NOT NULL,
+            metrics TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (fingerprint, model_name)
+        )
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def append(self, dataset: str, texts: List[str], labels: Optional[List[str]] = None) -> DatasetSnapshot:
+        if labels is None:
+            labels = [None] * len(texts)
+
+        now = datetime.now().isoformat()
+        rows = [(dataset, row_hash(text, label), text, label, now) for text, label in zip(texts, labels)]
+
+        conn = sqlite3.connect(str(self.db_path))
+        cursor = conn.cursor()
+
+        try:
+            before = conn.total_changes
+            cursor.executemany('''
+            INSERT OR IGNORE INTO labeled_rows (dataset, row_hash, text, label, added_at)
+            VALUES (?, ?, ?, ?, ?)
+            ''', rows)
+            n_new_rows = conn.total_changes - before
+
+            if n_new_rows == 0:
+                cursor.execute('''
+                SELECT dataset, dataset_hash, n_rows, n_new_rows, created_at FROM snapshots
+                WHERE dataset = ? ORDER BY id DESC LIMIT 1
+                ''', (dataset,))
+                row = cursor.fetchone()
+                if row:
+                    return DatasetSnapshot(*row)
+
+            digest = hashlib.sha256()
+            cursor.execute('''
+            SELECT row_hash FROM labeled_rows WHERE dataset = ? ORDER BY row_hash
+            ''', (dataset,))
+            n_rows = 0
+            for (h,) in cursor.fetchall():
+                digest.update(h.encode())
+                n_rows += 1
+
+            snapshot = DatasetSnapshot(
+                dataset=dataset,
+                dataset_hash=digest.hexdigest(),
+                n_rows=n_rows,
+                n_new_rows=n_new_rows,
+                created_at=now
+            )
+
+            cursor.execute('''
+            INSERT INTO snapshots (dataset, dataset_hash, n_rows, n_new_rows, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (dataset, snapshot.dataset_hash, n_rows, n_new_rows, now))
+
+            conn.commit()
+            logger.info(f"Dataset '{dataset}': {n_new_rows} new rows, {n_rows} total, version {snapshot.dataset_hash[:12]}")
+            return snapshot
+
+        except Exception as e:
+            logger.error(f"Error appending to dataset {dataset}: {e}")
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def load(self, dataset: str) -> Tuple[List[str], List[Optional[str]]]:
+        conn = sqlite3.connect(str(self.db_path))
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+            SELECT text, label FROM labeled_rows WHERE dataset = ? ORDER BY added_at, row_hash
+            ''', (dataset,))
+            rows = cursor.fetchall()
+            return [r[0] for r in rows], [r[1] for r in rows]
+        finally:
+            conn.close()
+
+    def get_snapshots(self, dataset: str, limit: int = 20) -> List[DatasetSnapshot]:
+        conn = sqlite3.connect(str(self.db_path))
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+            SELECT dataset, dataset_hash, n_rows, n_new_rows, created_at FROM snapshots
+            WHERE dataset = ? ORDER BY id DESC LIMIT ?
+            ''', (dataset, limit))
+            return [DatasetSnapshot(*row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def prepare(self, dataset: str, model_name: str, texts: List[str], labels: Optional[List[str]],
+                config: Dict[str, Any], artifact_path: Path) -> TrainingRecord:
+        self.append(dataset, texts, labels)
+
+        data_hash = dataset_hash(texts, labels)
+        cfg_hash = config_hash(config)
+        code_ver = code_version()
+
+        return TrainingRecord(
+            fingerprint=training_fingerprint(data_hash, cfg_hash, code_ver),
+            model_type=dataset,
+            model_name=model_name,
+            artifact_path=str(artifact_path),
+            dataset_hash=data_hash,
+            config_hash=cfg_hash,
+            code_version=code_ver,
+            metrics={},
+            created_at=""
+        )
+
+    def find_training(self, pending: TrainingRecord) -> Optional[TrainingRecord]:
+        conn = sqlite3.connect(str(self.db_path))
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+            SELECT fingerprint, model_type, model_name, artifact_path, dataset_hash,
+                   config_hash, code_version, metrics, created_at
+            FROM trainings WHERE fingerprint = ? AND model_name = ?
+            ''', (pending.fingerprint, pending.model_name))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+
+        record = TrainingRecord(*row[:7], metrics=json.loads(row[7]), created_at=row[8])
+
+        marker = Path(record.artifact_path) / FINGERPRINT_FILE
+        if not marker.exists() or marker.read_text().strip() != record.fingerprint:
+            logger.info(f"Artifact for fingerprint {record.fingerprint[:12]} was replaced or removed")
+            return None
+        return record
+
+    def record_training(self, pending: TrainingRecord, metrics: Dict[str, Any]) -> TrainingRecord:
+        record = replace(pending, metrics=metrics, created_at=datetime.now().isoformat())
+
+        artifact_path = Path(record.artifact_path)
+        artifact_path.mkdir(parents=True, exist_ok=True)
+        (artifact_path / FINGERPRINT_FILE).write_text(record.fingerprint)
+
+        conn = sqlite3.connect(str(self.db_path))
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+            INSERT OR REPLACE INTO trainings (
+                fingerprint, model_name, model_type, artifact_path, dataset_hash,
+                config_hash, code_version, metrics, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                record.fingerprint,
+                record.model_name,
+                record.model_type,
+                record.artifact_path,
+                record.dataset_hash,
+                record.config_hash,
+                record.code_version,
+                json.dumps(record.metrics, default=str),
+                record.created_at
+            ))
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Error recording training {record.fingerprint[:12]}: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+        return record
+
+    def get_statistics(self) -> Dict[str, Any]:
+        conn = sqlite3.connect(str(self.db_path))
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('SELECT dataset, COUNT(*) FROM labeled_rows GROUP BY dataset')
+            datasets = dict(cursor.fetchall())
+            cursor.execute('SELECT COUNT(*) FROM trainings')
+            trainings = cursor.fetchone()[0]
+            return {"datasets": datasets, "total_trainings": trainings}
+        finally:
+            conn.close()
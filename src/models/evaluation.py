@@ -0,0 +1,111 @@
+import time
+import numpy as np
+from joblib import Parallel, delayed, Memory
+from sklearn.base import clone
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from config.model_config import CV_CONFIG, LOGISTIC_REGRESSION_CONFIG, TFIDF_CONFIG, TFIDF_CONFIG_SMALL
+from config.settings import PROCESSED_DIR
+from src.utils.metrics import calculate_classification_metrics
+from src.utils.logger import default_logger as logger
+
+CV_METRICS = ("accuracy", "f1_macro", "f1_weighted")
+
+def _vectorize_fold(texts, train_idx, test_idx, tfidf_config):
+    vectorizer = TfidfVectorizer(**tfidf_config)
+    X_train = vectorizer.fit_transform(texts[train_idx])
+    X_test = vectorizer.transform(texts[test_idx])
+    return vectorizer, X_train, X_test
+
+def _run_fold(fold, texts, labels, train_idx, test_idx, tfidf_config, candidates, cache_dir):
+    fold_start = time.perf_counter()
+
+    vectorize = Memory(cache_dir, verbose=0).cache(_vectorize_fold)
+    _, X_train, X_test = vectorize(texts, train_idx, test_idx, tfidf_config)
+    vectorize_seconds = time.perf_counter() - fold_start
+
+    y_train = labels[train_idx]
+    y_test = labels[test_idx]
+
+    results = {}
+    for name, estimator in candidates.items():
+        fit_start = time.perf_counter()
+        model = clone(estimator).fit(X_train, y_train)
+        predictions = model.predict(X_test)
+        metrics = calculate_classification_metrics(y_test, predictions)
+        results[name] = {metric: float(metrics[metric]) for metric in CV_METRICS}
+        results[name]["fit_seconds"] = round(time.perf_counter() - fit_start, 3)
+
+    return {
+        "fold": fold,
+        "n_train": int(len(train_idx)),
+        "n_test": int(len(test_idx)),
+        "n_features": int(X_train.shape[1]),
+        "vectorize_seconds": round(vectorize_seconds, 3),
+        "total_seconds": round(time.perf_counter() - fold_start, 3),
+        "candidates": results
+    }
+
+def cross_validate_text_classifier(texts, labels, candidates=None, n_splits=None, tfidf_config=None,
+                                   n_jobs=None, cache_dir=None):
+    n_splits = n_splits or CV_CONFIG["n_splits"]
+    n_jobs = n_jobs or CV_CONFIG["n_jobs"]
+    # Fold features are cached on disk so repeated runs over the same data skip re-vectorizing
+    cache_dir = str(cache_dir or CV_CONFIG["cache_dir"] or PROCESSED_DIR / "cv_cache")
+
+    texts = np.asarray(texts, dtype=object)
+    labels = np.asarray(labels, dtype=object)
+
+    if candidates is None:
+        candidates = {"logistic_regression": LogisticRegression(**LOGISTIC_REGRESSION_CONFIG)}
+    if tfidf_config is None:
+        tfidf_config = TFIDF_CONFIG_SMALL if len(texts) < 10 else TFIDF_CONFIG
+
+    _, class_counts = np.unique(labels, return_counts=True)
+    n_splits = min(n_splits, int(class_counts.min()))
+    if n_splits < 2:
+        logger.warning("Not enough samples per class for cross-validation, skipping")
+        return None
+
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=CV_CONFIG["random_state"])
+
+    logger.info(f"Running {n_splits}-fold cross-validation for {len(candidates)} candidate(s)")
+
+    start = time.perf_counter()
+    folds = Parallel(n_jobs=n_jobs)(
+        delayed(_run_fold)(fold, texts, labels, train_idx, test_idx, tfidf_config, candidates, cache_dir)
+        for fold, (train_idx, test_idx) in enumerate(splitter.split(texts, labels))
+    )
+
+    Memory(cache_dir, verbose=0).reduce_size(bytes_limit=CV_CONFIG["cache_bytes_limit"])
+
+    summary = {}
+    for name in candidates:
+        summary[name] = {}
+        for metric in CV_METRICS:
+            values = [fold["candidates"][name][metric] for fold in folds]
+            summary[name][metric] = float(np.mean(values))
+            summary[name][f"{metric}_std"] = float(np.std(values))
+
+    best_candidate = max(summary, key=lambda name: summary[name]["f1_weighted"])
+
+    logger.info(f"Cross-validation complete, best: {best_candidate} "
+                f"(f1_weighted={summary[best_candidate]['f1_weighted']:.3f})")
+
+    return {
+        "n_splits": n_splits,
+        "candidates": summary,
+        "best_candidate": best_candidate,
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "folds": folds
+    }
+
+def merge_cv_metrics(train_metrics, cv_results, candidate):
+    metrics = dict(train_metrics)
+    for metric in CV_METRICS:
+        metrics[f"train_{metric}"] = train_metrics[metric]
+        metrics[metric] = cv_results["candidates"][candidate][metric]
+        metrics[f"{metric}_std"] = cv_results["candidates"][candidate][f"{metric}_std"]
+    metrics["cv"] = cv_results
+    return metrics
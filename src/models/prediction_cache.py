@@ -0,0 +1,315 @@
+import re
+import json
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+from config.model_config import PREDICTION_CACHE_CONFIG
+from config.settings import PROCESSED_DIR
+from src.utils.logger import default_logger as logger
+
+SQLITE_MAX_PARAMS = 500
+
+_version_cache: Dict[str, Tuple[Tuple, str]] = {}
+_prediction_cache = None
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize('NFC', text or "")
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+def artifact_key(model_dir) -> str:
+    model_dir = Path(model_dir)
+    return f"{model_dir.parent.name}/{model_dir.name}"
+
+def artifact_version(model_dir) -> Optional[str]:
+    model_dir = Path(model_dir)
+    files = sorted(model_dir.glob("*.pkl"))
+    if not files:
+        return None
+
+    stat_key = tuple((f.name, f.stat().st_mtime_ns, f.stat().st_size) for f in files)
+    cached = _version_cache.get(str(model_dir))
+    if cached and cached[0] == stat_key:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    for f in files:
+        digest.update(f.name.encode())
+        digest.update(f.read_bytes())
+    version = digest.hexdigest()[:16]
+
+    _version_cache[str(model_dir)] = (stat_key, version)
+    return version
+
+class PredictionCache:
+    def __init__(self, db_path: Optional[str] = None,
+                 max_memory_entries: int = PREDICTION_CACHE_CONFIG["max_memory_entries"],
+                 max_disk_rows: int = PREDICTION_CACHE_CONFIG["max_disk_rows"],
+                 prune_every: int = PREDICTION_CACHE_CONFIG["prune_every"]):
+        self.db_path = Path(db_path) if db_path else PROCESSED_DIR / "prediction_cache.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_rows = max_disk_rows
+        self.prune_every = prune_every
+        self._writes_since_prune = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(str(self.db_path), timeout=30)
+
+    def _init_db(self):
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS predictions (
+            artifact TEXT NOT NULL,
+            version TEXT NOT NULL,
+            text_hash TEXT NOT NULL,
+            result TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (artifact, version, text_hash)
+        )
+        ''')
+
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_predictions_created ON predictions(created_at)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def get_many(self, artifact: str, version: str, keys: List[str]) -> Dict[str, Any]:
+        found = {}
+        missing = []
+
+        with self._lock:
+            for key in keys:
+                memory_key = (artifact, version, key)
+                if memory_key in self._memory:
+                    self._memory.move_to_end(memory_key)
+                    found[key] = self._memory[memory_key]
+                else:
+                    missing.append(key)
+            self.memory_hits += len(found)
+
+        if not missing:
+            return found
+
+        conn = self._connect()
+        cursor = conn.cursor()
+        from_disk = {}
+
+        try:
+            for i in range(0, len(missing), SQLITE_MAX_PARAMS):
+                batch = missing[i:i + SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                cursor.execute(f'''
+                SELECT text_hash, result FROM predictions
+                WHERE artifact = ? AND version = ? AND text_hash IN ({placeholders})
+                ''', (artifact, version, *batch))
+                for text_hash, result in cursor.fetchall():
+                    from_disk[text_hash] = json.loads(result)
+        except Exception as e:
+            logger.error(f"Error reading prediction cache: {e}")
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.disk_hits += len(from_disk)
+            self.misses += len(missing) - len(from_disk)
+            self._remember(artifact, version, from_disk)
+
+        found.update(from_disk)
+        return found
+
+    def put_many(self, artifact: str, version: str, results: Dict[str, Any]):
+        if not results:
+            return
+
+        with self._lock:
+            self._remember(artifact, version, results)
+
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.executemany('''
+            INSERT OR REPLACE INTO predictions (artifact, version, text_hash, result, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            ''', [(artifact, version, key, json.dumps(result, ensure_ascii=False), now)
+                  for key, result in results.items()])
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Error writing prediction cache: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._writes_since_prune += len(results)
+            should_prune = self._writes_since_prune >= self.prune_every
+            if should_prune:
+                self._writes_since_prune = 0
+        if should_prune:
+            self.prune()
+
+    def _remember(self, artifact, version, results):
+        for key, result in results.items():
+            self._memory[(artifact, version, key)] = result
+            self._memory.move_to_end((artifact, version, key))
+
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def invalidate(self, artifact: str, keep_version: Optional[str] = None) -> int:
+        with self._lock:
+            stale = [k for k in self._memory if k[0] == artifact and k[1] != keep_version]
+            for k in stale:
+                del self._memory[k]
+
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+            DELETE FROM predictions WHERE artifact = ? AND version != ?
+            ''', (artifact, keep_version or ""))
+            deleted = cursor.rowcount
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Error invalidating prediction cache for {artifact}: {e}")
+            conn.rollback()
+            deleted = 0
+        finally:
+            conn.close()
+
+        if deleted:
+            logger.info(f"Invalidated {deleted} cached predictions for {artifact}")
+        return deleted
+
+    def prune(self, max_rows: Optional[int] = None) -> int:
+        max_rows = self.max_disk_rows if max_rows is None else max_rows
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('SELECT COUNT(*) FROM predictions')
+            excess = cursor.fetchone()[0] - max_rows
+            if excess <= 0:
+                return 0
+
+            # Rewrites refresh created_at, so the oldest rows are the least recently computed
+            cursor.execute('''
+            DELETE FROM predictions WHERE rowid IN (
+                SELECT rowid FROM predictions ORDER BY created_at LIMIT ?
+            )
+            ''', (excess,))
+            deleted = cursor.rowcount
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Error pruning prediction cache: {e}")
+            conn.rollback()
+            deleted = 0
+        finally:
+            conn.close()
+
+        if deleted:
+            logger.info(f"Pruned {deleted} oldest cached predictions to stay within {max_rows} rows")
+        return deleted
+
+    def get_statistics(self) -> Dict[str, Any]:
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('SELECT artifact, version, COUNT(*) FROM predictions GROUP BY artifact, version')
+            disk_entries = {f"{artifact}@{version}": count for artifact, version, count in cursor.fetchall()}
+        finally:
+            conn.close()
+
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "disk_entries": disk_entries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups > 0 else 0.0
+        }
+
+def get_prediction_cache() -> Optional[PredictionCache]:
+    global _prediction_cache
+    if not PREDICTION_CACHE_CONFIG["enabled"]:
+        return None
+    if _prediction_cache is None:
+        _prediction_cache = PredictionCache(PREDICTION_CACHE_CONFIG["db_path"])
+    return _prediction_cache
+
+def promote_artifact(model, model_dir):
+    model.artifact_key = artifact_key(model_dir)
+    model.artifact_version = artifact_version(model_dir)
+
+    # Only saving an artifact supersedes its older versions, a process still serving one of them must not
+    # delete the rows of the version that replaced it
+    cache = get_prediction_cache()
+    if cache is not None:
+        cache.invalidate(model.artifact_key, keep_version=model.artifact_version)
+
+def _cached_predict(model, texts, predict_fn):
+    version = getattr(model, "artifact_version", None)
+    cache = get_prediction_cache()
+    if cache is None or version is None:
+        return predict_fn(texts)
+
+    keys = [text_key(text) for text in texts]
+    found = cache.get_many(model.artifact_key, version, list(set(keys)))
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+
+    if missing:
+        computed = dict(zip(missing.keys(), predict_fn(list(missing.values()))))
+        cache.put_many(model.artifact_key, version, computed)
+        found.update(computed)
+
+    return [found[key] for key in keys]
+
+def predict_topics(model, texts):
+    def predict_fn(batch):
+        labels, cluster_ids = model.predict(batch)
+        return [[str(label), int(cid)] for label, cid in zip(labels, cluster_ids)]
+
+    results = _cached_predict(model, texts, predict_fn)
+    topic_labels = [r[0] for r in results]
+    cluster_ids = np.array([r[1] for r in results], dtype=int)
+    return topic_labels, cluster_ids
+
+def predict_sentiment(model, texts):
+    def predict_fn(batch):
+        labels, scores, confidences = model.predict_with_scores(batch)
+        return [[str(label), int(score), float(conf)] for label, score, conf in zip(labels, scores, confidences)]
+
+    results = _cached_predict(model, texts, predict_fn)
+    sentiment_labels = np.array([r[0] for r in results], dtype=object)
+    sentiment_scores = [r[1] for r in results]
+    confidences = np.array([r[2] for r in results], dtype=float)
+    return sentiment_labels, sentiment_scores, confidences
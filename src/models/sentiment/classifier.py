@@ -5,6 +5,8 @@ import numpy as np
 from pathlib import Path
 from config.model_config import TFIDF_CONFIG, TFIDF_CONFIG_SMALL, LOGISTIC_REGRESSION_CONFIG
 from config.settings import SENTIMENT_LABELS
+from src.models.prediction_cache import promote_artifact, artifact_key, artifact_version
+from src.models.dataset_store import clear_fingerprint
 from src.utils.logger import default_logger as logger
 
 class SentimentClassifier:
@@ -12,6 +14,8 @@ class SentimentClassifier:
         self.vectorizer = None
         self.classifier = LogisticRegression(**LOGISTIC_REGRESSION_CONFIG)
         self.classes_ = None
+        self.artifact_key = None
+        self.artifact_version = None
 
     def fit(self, texts, labels):
         logger.info("Training sentiment classifier")
@@ -28,9 +32,38 @@ class SentimentClassifier:
         X = self.vectorizer.fit_transform(texts)
         self.classifier.fit(X, labels)
         self.classes_ = self.classifier.classes_
+        self.artifact_version = None
         logger.info(f"Sentiment classifier trained, classes: {list(self.classes_)}")
         return self
 
+    def warm_fit(self, texts, labels, previous):
+        logger.info("Warm-start training sentiment classifier from previous model")
+
+        self.vectorizer = previous.vectorizer
+        self.classifier = LogisticRegression(**LOGISTIC_REGRESSION_CONFIG, warm_start=True)
+        self.classifier.coef_ = previous.classifier.coef_.copy()
+        self.classifier.intercept_ = previous.classifier.intercept_.copy()
+
+        X = self.vectorizer.transform(texts)
+        self.classifier.fit(X, labels)
+        self.classes_ = self.classifier.classes_
+        self.artifact_version = None
+        logger.info(f"Sentiment classifier warm-started, iterations: {int(np.max(self.classifier.n_iter_))}")
+        return self
+
+    def oov_ratio(self, texts):
+        analyzer = self.vectorizer.build_analyzer()
+        vocabulary = self.vectorizer.vocabulary_
+
+        total = 0
+        missing = 0
+        for text in texts:
+            terms = analyzer(text)
+            total += len(terms)
+            missing += sum(1 for term in terms if term not in vocabulary)
+
+        return missing / total if total > 0 else 0.0
+
     def predict(self, texts):
         X = self.vectorizer.transform(texts)
         predictions = self.classifier.predict(X)
@@ -59,9 +92,11 @@ class SentimentClassifier:
         model_dir = Path(model_dir)
         model_dir.mkdir(parents=True, exist_ok=True)
 
+        clear_fingerprint(model_dir)
         joblib.dump(self.vectorizer, model_dir / "vectorizer.pkl")
         joblib.dump(self.classifier, model_dir / "classifier.pkl")
         joblib.dump({"classes": self.classes_}, model_dir / "metadata.pkl")
+        promote_artifact(self, model_dir)
         logger.info(f"Sentiment classifier saved to {model_dir}")
 
     @classmethod
@@ -72,5 +107,7 @@ class SentimentClassifier:
         model.classifier = joblib.load(model_dir / "classifier.pkl")
         metadata = joblib.load(model_dir / "metadata.pkl")
         model.classes_ = metadata["classes"]
+        model.artifact_key = artifact_key(model_dir)
+        model.artifact_version = artifact_version(model_dir)
         logger.info(f"Sentiment classifier loaded from {model_dir}")
         return model
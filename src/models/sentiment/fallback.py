@@ -1,4 +1,5 @@
 import re
+import numpy as np
 from src.utils.logger import default_logger as logger
 
 NEGATIVE_WORDS = {
@@ -24,20 +25,76 @@ VERY_POSITIVE_WORDS = {
 
 MIXED_INDICATORS = ["nhưng", "tuy nhiên", "mặc dù", "song"]
 
+CATEGORY_VERY_NEGATIVE = 0
+CATEGORY_NEGATIVE = 1
+CATEGORY_POSITIVE = 2
+CATEGORY_VERY_POSITIVE = 3
+CATEGORY_MIXED = 4
+
+LABEL_SCORES = {
+    "Very Negative": -2,
+    "Negative": -1,
+    "Neutral": 0,
+    "Positive": 1,
+    "Very Positive": 2,
+    "Mixed": 0
+}
+
+class LexiconMatcher:
+    def __init__(self, lexicons):
+        self.patterns = sorted(set().union(*lexicons.values()))
+        bit = {pattern: 1 << i for i, pattern in enumerate(self.patterns)}
+
+        # A match is the longest entry starting at a position, so it also implies every entry that is its prefix
+        self.match_masks = {
+            pattern: sum(bit[other] for other in self.patterns if pattern.startswith(other))
+            for pattern in self.patterns
+        }
+        self.category_masks = [0] * (max(lexicons) + 1)
+        for category, words in lexicons.items():
+            self.category_masks[category] = sum(bit[word] for word in words)
+
+        self.pattern = re.compile("(?=(" + self._trie_regex(self.patterns) + "))")
+
+    @staticmethod
+    def _trie_regex(words):
+        trie = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char != ""]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            return "(?:" + body + ")?" if "" in node else body
+
+        return build(trie)
+
+    def count(self, text):
+        mask = 0
+        for match in set(self.pattern.findall(text)):
+            mask |= self.match_masks[match]
+        return [bin(mask & category_mask).count("1") for category_mask in self.category_masks]
+
+LEXICON_MATCHER = LexiconMatcher({
+    CATEGORY_VERY_NEGATIVE: VERY_NEGATIVE_WORDS,
+    CATEGORY_NEGATIVE: NEGATIVE_WORDS,
+    CATEGORY_POSITIVE: POSITIVE_WORDS,
+    CATEGORY_VERY_POSITIVE: VERY_POSITIVE_WORDS,
+    CATEGORY_MIXED: MIXED_INDICATORS
+})
+
 def rule_based_sentiment(text):
     if not text:
         return "Neutral", 0
 
-    text_lower = text.lower()
-
-    very_neg_count = sum(1 for word in VERY_NEGATIVE_WORDS if word in text_lower)
-    neg_count = sum(1 for word in NEGATIVE_WORDS if word in text_lower)
-    pos_count = sum(1 for word in POSITIVE_WORDS if word in text_lower)
-    very_pos_count = sum(1 for word in VERY_POSITIVE_WORDS if word in text_lower)
+    very_neg_count, neg_count, pos_count, very_pos_count, mixed_count = LEXICON_MATCHER.count(text.lower())
 
-    has_mixed = any(indicator in text_lower for indicator in MIXED_INDICATORS)
-
-    if has_mixed and (neg_count > 0 or very_neg_count > 0) and (pos_count > 0 or very_pos_count > 0):
+    if mixed_count > 0 and (neg_count > 0 or very_neg_count > 0) and (pos_count > 0 or very_pos_count > 0):
         return "Mixed", 0
 
     total_neg = very_neg_count * 2 + neg_count
@@ -55,8 +112,16 @@ def rule_based_sentiment(text):
         return "Neutral", 0
 
 def fallback_predict(texts):
-    results = [rule_based_sentiment(text) for text in texts]
-    labels = [r[0] for r in results]
-    scores = [r[1] for r in results]
-    logger.info("Using fallback rule-based sentiment")
+    label_cache = {}
+    labels = np.empty(len(texts), dtype=object)
+
+    for i, text in enumerate(texts):
+        label = label_cache.get(text)
+        if label is None:
+            label = rule_based_sentiment(text)[0]
+            label_cache[text] = label
+        labels[i] = label
+
+    scores = np.array([LABEL_SCORES[label] for label in labels], dtype=int)
+    logger.info(f"Using fallback rule-based sentiment ({len(texts)} texts, {len(label_cache)} unique)")
     return labels, scores
@@ -0,0 +1,229 @@
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, List, Any, Optional
+import numpy as np
+from config.model_config import SERVING_CONFIG
+from config.settings import TOPIC_MODEL_DIR, SENTIMENT_MODEL_DIR
+from src.etl.preprocessor import clean_text
+from src.models.topic.auto_topic import AutoTopicModel
+from src.models.sentiment.classifier import SentimentClassifier
+from src.models.sentiment.fallback import fallback_predict
+from src.models.prediction_cache import predict_topics, predict_sentiment
+from src.utils.logger import default_logger as logger
+
+class ScoringService:
+    def __init__(self, topic_model: Optional[AutoTopicModel] = None,
+                 sentiment_model: Optional[SentimentClassifier] = None):
+        self.topic_model = topic_model
+        self.sentiment_model = sentiment_model
+
+    @classmethod
+    def load(cls, topic_model_path=None, sentiment_model_path=None):
+        topic_model_path = topic_model_path or TOPIC_MODEL_DIR / "topic_auto"
+        sentiment_model_path = sentiment_model_path or SENTIMENT_MODEL_DIR / "sentiment_model"
+
+        topic_model = None
+        if topic_model_path.exists():
+            topic_model = AutoTopicModel.load(topic_model_path)
+        else:
+            logger.warning("No topic model found, topics will be 'Unknown'")
+
+        sentiment_model = None
+        if sentiment_model_path.exists():
+            sentiment_model = SentimentClassifier.load(sentiment_model_path)
+        else:
+            logger.warning("No sentiment model found, using rule-based fallback")
+
+        return cls(topic_model, sentiment_model)
+
+    def score(self, texts: List[str]) -> List[Dict[str, Any]]:
+        texts = [clean_text(text).lower() for text in texts]
+
+        if self.topic_model is not None:
+            topic_labels, cluster_ids = predict_topics(self.topic_model, texts)
+        else:
+            topic_labels = ["Unknown"] * len(texts)
+            cluster_ids = [-1] * len(texts)
+
+        if self.sentiment_model is not None:
+            sentiment_labels, sentiment_scores, confidences = predict_sentiment(self.sentiment_model, texts)
+        else:
+            sentiment_labels, sentiment_scores = fallback_predict(texts)
+            confidences = [None] * len(texts)
+
+        return [
+            {
+                "topic_label": str(topic_labels[i]),
+                "topic_id": int(cluster_ids[i]),
+                "sentiment_label": str(sentiment_labels[i]),
+                "sentiment_score": float(sentiment_scores[i]),
+                "sentiment_confidence": None if confidences[i] is None else float(confidences[i])
+            }
+            for i in range(len(texts))
+        ]
+
+class LatencyTracker:
+    def __init__(self, window: int = SERVING_CONFIG["latency_window"]):
+        self._latencies = deque(maxlen=window)
+        self._batch_sizes = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.total_requests = 0
+        self.total_batches = 0
+
+    def record_batch(self, latencies_ms: List[float]):
+        with self._lock:
+            self._latencies.extend(latencies_ms)
+            self._batch_sizes.append(len(latencies_ms))
+            self.total_requests += len(latencies_ms)
+            self.total_batches += 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = np.array(self._latencies, dtype=float)
+            batch_sizes = np.array(self._batch_sizes, dtype=float)
+            total_requests = self.total_requests
+            total_batches = self.total_batches
+
+        stats = {
+            "total_requests": total_requests,
+            "total_batches": total_batches,
+            "window_size": int(len(latencies))
+        }
+
+        if len(latencies) > 0:
+            p50, p90, p95, p99 = np.percentile(latencies, [50, 90, 95, 99])
+            stats.update({
+                "latency_ms_p50": round(float(p50), 3),
+                "latency_ms_p90": round(float(p90), 3),
+                "latency_ms_p95": round(float(p95), 3),
+                "latency_ms_p99": round(float(p99), 3),
+                "latency_ms_max": round(float(latencies.max()), 3),
+                "avg_batch_size": round(float(batch_sizes.mean()), 2)
+            })
+
+        return stats
+
+class MicroBatcher:
+    def __init__(self, service: ScoringService,
+                 max_batch_size: int = SERVING_CONFIG["max_batch_size"],
+                 max_wait_ms: float = SERVING_CONFIG["max_wait_ms"]):
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.latency = LatencyTracker()
+
+        self._queue = queue.Queue()
+        self._running = False
+        self._thread = None
+        self._state_lock = threading.Lock()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Micro-batcher started (max_batch_size={self.max_batch_size}, "
+                    f"max_wait_ms={self.max_wait * 1000:.1f})")
+
+    def stop(self):
+        with self._state_lock:
+            if not self._running:
+                return
+            self._running = False
+            self._queue.put(None)
+        self._thread.join(timeout=5)
+        logger.info("Micro-batcher stopped")
+
+    def submit(self, text: str) -> Future:
+        future = Future()
+        # Checked under the lock so nothing can be queued behind the stop sentinel and never resolve
+        with self._state_lock:
+            if not self._running:
+                future.set_exception(RuntimeError("Micro-batcher is not running"))
+                return future
+            self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def score(self, text: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return self.submit(text).result(timeout=timeout)
+
+    def _drain_queued(self, batch):
+        while len(batch) < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return True
+            if item is None:
+                return False
+            batch.append(item)
+        return True
+
+    def _collect_batch(self, first):
+        batch = [first]
+        if not self._drain_queued(batch):
+            self._running = False
+            return batch
+
+        # An idle server dispatches at once, waiting for stragglers only pays off once requests are queueing up
+        if len(batch) == 1:
+            return batch
+
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._running = False
+                break
+            batch.append(item)
+
+        return batch
+
+    def _run(self):
+        while self._running:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = self._collect_batch(first)
+            texts = [item[0] for item in batch]
+
+            try:
+                results = self.service.score(texts)
+            except Exception as e:
+                logger.error(f"Error scoring batch of {len(batch)}: {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            now = time.perf_counter()
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+            self.latency.record_batch([(now - item[2]) * 1000 for item in batch])
+
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_exception(RuntimeError("Micro-batcher stopped"))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        stats = self.latency.get_statistics()
+        stats.update({
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize()
+        })
+        return stats
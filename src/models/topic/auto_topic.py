@@ -4,14 +4,26 @@ import joblib
 import numpy as np
 from pathlib import Path
 from config.model_config import TFIDF_CONFIG, TFIDF_CONFIG_SMALL, KMEANS_CONFIG, TOP_TERMS_PER_TOPIC
+from src.models.prediction_cache import promote_artifact, artifact_key, artifact_version
+from src.models.dataset_store import clear_fingerprint
 from src.utils.logger import default_logger as logger
 
+def build_vectorizer(n_samples):
+    if n_samples < 10:
+        logger.warning(f"Small dataset ({n_samples} samples), using TFIDF_CONFIG_SMALL")
+        return TfidfVectorizer(**TFIDF_CONFIG_SMALL)
+    return TfidfVectorizer(**TFIDF_CONFIG)
+
 class AutoTopicModel:
     def __init__(self, n_clusters=None):
         self.n_clusters = n_clusters or KMEANS_CONFIG["n_clusters"]
         self.vectorizer = None
         self.kmeans = None
         self.topic_labels = {}
+        self.k_selection = None
+        self.reused_artifact = False
+        self.artifact_key = None
+        self.artifact_version = None
 
     def fit(self, texts):
         n_samples = len(texts)
@@ -22,13 +34,7 @@ class AutoTopicModel:
 
         logger.info(f"Training auto topic model with {self.n_clusters} clusters")
 
-        if n_samples < 10:
-            logger.warning(f"Small dataset ({n_samples} samples), using TFIDF_CONFIG_SMALL")
-            tfidf_config = TFIDF_CONFIG_SMALL.copy()
-        else:
-            tfidf_config = TFIDF_CONFIG.copy()
-
-        self.vectorizer = TfidfVectorizer(**tfidf_config)
+        self.vectorizer = build_vectorizer(n_samples)
 
         kmeans_config = KMEANS_CONFIG.copy()
         kmeans_config["n_clusters"] = self.n_clusters
@@ -37,9 +43,19 @@ class AutoTopicModel:
         X = self.vectorizer.fit_transform(texts)
         self.kmeans.fit(X)
         self._generate_topic_labels()
+        self.artifact_version = None
         logger.info("Auto topic model training complete")
         return self
 
+    @classmethod
+    def from_fitted(cls, vectorizer, kmeans):
+        model = cls(n_clusters=kmeans.n_clusters)
+        model.vectorizer = vectorizer
+        model.kmeans = kmeans
+        model._generate_topic_labels()
+        logger.info(f"Auto topic model built from fitted search model with {model.n_clusters} clusters")
+        return model
+
     def _generate_topic_labels(self):
         feature_names = self.vectorizer.get_feature_names_out()
         for cluster_id in range(self.n_clusters):
@@ -82,9 +98,11 @@ class AutoTopicModel:
         model_dir = Path(model_dir)
         model_dir.mkdir(parents=True, exist_ok=True)
 
+        clear_fingerprint(model_dir)
         joblib.dump(self.vectorizer, model_dir / "vectorizer.pkl")
         joblib.dump(self.kmeans, model_dir / "kmeans.pkl")
         joblib.dump(self.topic_labels, model_dir / "topic_labels.pkl")
+        promote_artifact(self, model_dir)
         logger.info(f"Auto topic model saved to {model_dir}")
 
     @classmethod
@@ -95,5 +113,7 @@ class AutoTopicModel:
         model.kmeans = joblib.load(model_dir / "kmeans.pkl")
         model.topic_labels = joblib.load(model_dir / "topic_labels.pkl")
         model.n_clusters = model.kmeans.n_clusters
+        model.artifact_key = artifact_key(model_dir)
+        model.artifact_version = artifact_version(model_dir)
         logger.info(f"Auto topic model loaded from {model_dir}")
         return model
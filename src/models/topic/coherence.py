@@ -0,0 +1,80 @@
+import numpy as np
+from config.model_config import COHERENCE_CONFIG
+from src.models.topic.k_selection import sample_indices
+from src.utils.logger import default_logger as logger
+
+COHERENCE_MEASURES = ("npmi", "umass")
+
+def top_term_indices(model, top_n=None):
+    top_n = top_n or COHERENCE_CONFIG["top_n"]
+    centers = model.kmeans.cluster_centers_
+    top_n = min(top_n, centers.shape[1])
+
+    top = np.argpartition(-centers, top_n - 1, axis=1)[:, :top_n]
+    order = np.argsort(-np.take_along_axis(centers, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+def cooccurrence_counts(X, term_idx):
+    X_terms = (X[:, term_idx] > 0).astype(np.int32).tocsc()
+    return (X_terms.T @ X_terms).toarray()
+
+def _npmi(co, n_docs):
+    doc_freq = np.diag(co).astype(float)
+    p_i = doc_freq / n_docs
+    p_ij = co / n_docs
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pmi = np.log(p_ij / np.outer(p_i, p_i))
+        npmi = pmi / -np.log(p_ij)
+
+    npmi[co == 0] = -1.0
+    # Terms that appear in every sampled document carry no information
+    npmi[np.isnan(npmi) | np.isinf(npmi)] = 0.0
+    return npmi
+
+def _umass(co):
+    doc_freq = np.diag(co).astype(float)
+    with np.errstate(divide="ignore"):
+        return np.log((co + 1.0) / doc_freq[np.newaxis, :])
+
+def topic_coherence(model, texts, measure=None, top_n=None, sample_size=None):
+    measure = measure or COHERENCE_CONFIG["measure"]
+    sample_size = sample_size or COHERENCE_CONFIG["sample_size"]
+
+    if measure not in COHERENCE_MEASURES:
+        raise ValueError(f"Unknown coherence measure: {measure}, expected one of {COHERENCE_MEASURES}")
+
+    sample_idx = sample_indices(len(texts), sample_size, COHERENCE_CONFIG["random_state"])
+    X = model.vectorizer.transform([texts[i] for i in sample_idx])
+    n_docs = X.shape[0]
+
+    topics = top_term_indices(model, top_n)
+    vocabulary, positions = np.unique(topics, return_inverse=True)
+    positions = positions.reshape(topics.shape)
+
+    co = cooccurrence_counts(X, vocabulary)
+    pair_scores = _npmi(co, n_docs) if measure == "npmi" else _umass(co)
+
+    # UMass scores each term against the higher-ranked terms before it, NPMI is symmetric
+    n_terms = topics.shape[1]
+    rows, cols = np.tril_indices(n_terms, k=-1)
+
+    per_topic_scores = pair_scores[positions[:, rows], positions[:, cols]]
+    if measure == "umass":
+        per_topic_scores = np.where(np.isfinite(per_topic_scores), per_topic_scores, 0.0)
+    per_topic = per_topic_scores.mean(axis=1) if len(rows) > 0 else np.zeros(len(topics))
+
+    result = {
+        "measure": measure,
+        "mean": float(per_topic.mean()),
+        "per_topic": [
+            {"topic_id": cid, "label": model.topic_labels.get(cid, f"Topic_{cid}"), "score": float(score)}
+            for cid, score in enumerate(per_topic)
+        ],
+        "top_n": int(n_terms),
+        "n_docs": int(n_docs),
+        "n_samples": len(texts)
+    }
+
+    logger.info(f"Topic coherence ({measure}, top {n_terms} terms, {n_docs} docs): {result['mean']:.3f}")
+    return result
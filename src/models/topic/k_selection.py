@@ -0,0 +1,103 @@
+import time
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score, calinski_harabasz_score
+from config.model_config import KMEANS_CONFIG, AUTO_K_CONFIG
+from src.models.topic.auto_topic import build_vectorizer
+from src.utils.logger import default_logger as logger
+
+CLUSTER_METRICS = ("silhouette", "calinski_harabasz")
+
+def sample_indices(n_samples, sample_size=None, random_state=None):
+    sample_size = sample_size or AUTO_K_CONFIG["sample_size"]
+    if random_state is None:
+        random_state = AUTO_K_CONFIG["random_state"]
+
+    if n_samples <= sample_size:
+        return np.arange(n_samples)
+
+    rng = np.random.RandomState(random_state)
+    return np.sort(rng.choice(n_samples, size=sample_size, replace=False))
+
+def score_clustering(X, labels, sample_idx, metric="silhouette"):
+    if metric not in CLUSTER_METRICS:
+        raise ValueError(f"Unknown clustering metric: {metric}, expected one of {CLUSTER_METRICS}")
+
+    X_sample = X[sample_idx]
+    labels_sample = np.asarray(labels)[sample_idx]
+
+    n_labels = len(np.unique(labels_sample))
+    if n_labels < 2 or n_labels >= len(sample_idx):
+        return 0.0
+
+    if metric == "silhouette":
+        return float(silhouette_score(X_sample, labels_sample, metric="cosine"))
+
+    if hasattr(X_sample, "toarray"):
+        X_sample = X_sample.toarray()
+    return float(calinski_harabasz_score(X_sample, labels_sample))
+
+def _fit_and_score(X, k, sample_idx, metric):
+    start = time.perf_counter()
+
+    kmeans_config = KMEANS_CONFIG.copy()
+    kmeans_config["n_clusters"] = k
+    kmeans = KMeans(**kmeans_config)
+    labels = kmeans.fit_predict(X)
+
+    point = {
+        "k": k,
+        "score": score_clustering(X, labels, sample_idx, metric),
+        "inertia": float(kmeans.inertia_),
+        "fit_seconds": round(time.perf_counter() - start, 3)
+    }
+    return point, kmeans
+
+def search_n_clusters(texts, k_min=None, k_max=None, metric=None, sample_size=None, n_jobs=None):
+    k_min = k_min or AUTO_K_CONFIG["k_min"]
+    k_max = k_max or AUTO_K_CONFIG["k_max"]
+    metric = metric or AUTO_K_CONFIG["metric"]
+    n_jobs = n_jobs or AUTO_K_CONFIG["n_jobs"]
+
+    n_samples = len(texts)
+    k_max = min(k_max, n_samples - 1)
+    if k_max < k_min:
+        raise ValueError(f"Need more than {k_min} samples to search for n_clusters, got {n_samples}")
+
+    vectorizer = build_vectorizer(n_samples)
+    X = vectorizer.fit_transform(texts)
+    sample_idx = sample_indices(n_samples, sample_size)
+
+    logger.info(f"Searching n_clusters in [{k_min}, {k_max}] by {metric} on {len(sample_idx)} sampled rows")
+
+    start = time.perf_counter()
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_and_score)(X, k, sample_idx, metric) for k in range(k_min, k_max + 1)
+    )
+    curve = [point for point, _ in results]
+    best_index = max(range(len(curve)), key=lambda i: curve[i]["score"])
+    best = curve[best_index]
+
+    logger.info(f"Selected n_clusters={best['k']} ({metric}={best['score']:.3f})")
+
+    k_selection = {
+        "best_k": best["k"],
+        "best_score": best["score"],
+        "metric": metric,
+        "sample_size": int(len(sample_idx)),
+        "n_samples": n_samples,
+        "search_seconds": round(time.perf_counter() - start, 3),
+        "curve": curve
+    }
+    # The scored fit is returned as is, refitting best_k would double its cost and could land on other clusters
+    return k_selection, vectorizer, results[best_index][1]
+
+def select_n_clusters(texts, k_min=None, k_max=None, metric=None, sample_size=None, n_jobs=None):
+    return search_n_clusters(texts, k_min, k_max, metric, sample_size, n_jobs)[0]
+
+def evaluate_topic_model(model, texts, metric="silhouette", sample_size=None):
+    X = model.vectorizer.transform(texts)
+    labels = model.kmeans.predict(X)
+    sample_idx = sample_indices(len(texts), sample_size)
+    return score_clustering(X, labels, sample_idx, metric)
@@ -4,6 +4,7 @@ from sklearn.naive_bayes import MultinomialNB
 import joblib
 from pathlib import Path
 from config.model_config import TFIDF_CONFIG, TFIDF_CONFIG_SMALL, LOGISTIC_REGRESSION_CONFIG
+from src.models.dataset_store import clear_fingerprint
 from src.utils.logger import default_logger as logger
 
 class SupervisedTopicModel:
@@ -45,6 +46,7 @@ class SupervisedTopicModel:
         model_dir = Path(model_dir)
         model_dir.mkdir(parents=True, exist_ok=True)
 
+        clear_fingerprint(model_dir)
         joblib.dump(self.vectorizer, model_dir / "vectorizer.pkl")
         joblib.dump(self.classifier, model_dir / "classifier.pkl")
         joblib.dump({"model_type": self.model_type, "classes": self.classes_},
@@ -2,36 +2,87 @@ from pathlib import Path
 from src.models.sentiment.classifier import SentimentClassifier
 from src.models.topic.supervised_topic import SupervisedTopicModel
 from src.models.topic.auto_topic import AutoTopicModel
+from src.models.topic.k_selection import search_n_clusters
+from src.models.dataset_store import DatasetStore
+from src.models.evaluation import cross_validate_text_classifier, merge_cv_metrics
 from src.utils.metrics import calculate_classification_metrics
 from src.utils.logger import default_logger as logger
 import mlflow
 from config.settings import SENTIMENT_MODEL_DIR, TOPIC_MODEL_DIR, MLFLOW_TRACKING_URI
+from config.model_config import (TFIDF_CONFIG, TFIDF_CONFIG_SMALL, KMEANS_CONFIG, AUTO_K_CONFIG,
+                                 LOGISTIC_REGRESSION_CONFIG)
 
 mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
 
-def train_sentiment_model(texts, labels, model_name="sentiment_model", log_mlflow=True):
+def _tfidf_config_for(texts):
+    return TFIDF_CONFIG_SMALL if len(texts) < 10 else TFIDF_CONFIG
+
+def _find_reusable_training(dataset, model_name, texts, labels, config, artifact_path):
+    store = DatasetStore()
+    pending = store.prepare(dataset, model_name, texts, labels, config, artifact_path)
+    reused = store.find_training(pending)
+    if reused:
+        logger.info(f"Training data, config and code unchanged (fingerprint {reused.fingerprint[:12]}), "
+                    f"reusing artifact {reused.artifact_path}")
+    return store, pending, reused
+
+def _evaluate_with_cv(texts, labels, train_metrics, classifier, cv_folds):
+    # Cross-validation refits the whole pipeline per fold, so it is opt-in and routine retrains skip it
+    if cv_folds < 2:
+        return train_metrics
+
+    cv_results = cross_validate_text_classifier(texts, labels, candidates={"model": classifier},
+                                                n_splits=cv_folds, tfidf_config=_tfidf_config_for(texts))
+    if cv_results is None:
+        return train_metrics
+    return merge_cv_metrics(train_metrics, cv_results, "model")
+
+def train_sentiment_model(texts, labels, model_name="sentiment_model", log_mlflow=True, warm_start_from=None,
+                          skip_if_unchanged=False, cv_folds=0):
     if len(texts) < 3:
         raise ValueError(f"Need at least 3 samples to train, got {len(texts)}")
 
     if len(set(labels)) < 2:
         raise ValueError("Need at least 2 different labels to train classifier")
 
+    store = None
+    if skip_if_unchanged:
+        config = {
+            "tfidf": _tfidf_config_for(texts),
+            "classifier": LOGISTIC_REGRESSION_CONFIG,
+            "warm_start": warm_start_from is not None,
+            "cv_folds": cv_folds
+        }
+        store, pending, reused = _find_reusable_training("sentiment", model_name, texts, labels, config,
+                                                         SENTIMENT_MODEL_DIR / model_name)
+        if reused:
+            return SentimentClassifier.load(reused.artifact_path), {**reused.metrics, "reused_artifact": True}
+
     model = SentimentClassifier()
-    model.fit(texts, labels)
+    if warm_start_from is not None:
+        model.warm_fit(texts, labels, warm_start_from)
+    else:
+        model.fit(texts, labels)
 
     predictions, _ = model.predict(texts)
     metrics = calculate_classification_metrics(labels, predictions, list(model.classes_))
+    metrics = _evaluate_with_cv(texts, labels, metrics, model.classifier, cv_folds)
 
     if log_mlflow:
         try:
             mlflow.set_experiment("sentiment_training")
             with mlflow.start_run():
-                mlflow.log_params({"n_samples": len(texts), "n_classes": len(model.classes_)})
+                mlflow.log_params({"n_samples": len(texts), "n_classes": len(model.classes_),
+                                   "warm_start": warm_start_from is not None})
                 mlflow.log_metrics({
                     "accuracy": metrics["accuracy"],
                     "f1_macro": metrics["f1_macro"],
                     "f1_weighted": metrics["f1_weighted"]
                 })
+                if "cv" in metrics:
+                    mlflow.log_params({"cv_folds": metrics["cv"]["n_splits"]})
+                    mlflow.log_metrics({"train_accuracy": metrics["train_accuracy"],
+                                        "accuracy_std": metrics["accuracy_std"]})
 
                 model.save(SENTIMENT_MODEL_DIR / model_name)
                 mlflow.log_artifacts(str(SENTIMENT_MODEL_DIR / model_name))
@@ -43,20 +94,33 @@ def train_sentiment_model(texts, labels, model_name="sentiment_model", log_mlflo
         model.save(SENTIMENT_MODEL_DIR / model_name)
         logger.info(f"Sentiment model trained (no MLflow), accuracy: {metrics['accuracy']:.3f}")
 
+    if store:
+        store.record_training(pending, metrics)
+
     return model, metrics
 
-def train_topic_supervised_model(texts, labels, model_name="topic_supervised", log_mlflow=True):
+def train_topic_supervised_model(texts, labels, model_name="topic_supervised", log_mlflow=True,
+                                 skip_if_unchanged=False, cv_folds=0):
     if len(texts) < 3:
         raise ValueError(f"Need at least 3 samples to train, got {len(texts)}")
 
     if len(set(labels)) < 2:
         raise ValueError("Need at least 2 different labels to train classifier")
 
+    store = None
+    if skip_if_unchanged:
+        config = {"tfidf": _tfidf_config_for(texts), "classifier": LOGISTIC_REGRESSION_CONFIG, "cv_folds": cv_folds}
+        store, pending, reused = _find_reusable_training("topic", model_name, texts, labels, config,
+                                                         TOPIC_MODEL_DIR / model_name)
+        if reused:
+            return SupervisedTopicModel.load(reused.artifact_path), {**reused.metrics, "reused_artifact": True}
+
     model = SupervisedTopicModel()
     model.fit(texts, labels)
 
     predictions, _ = model.predict(texts)
     metrics = calculate_classification_metrics(labels, predictions, list(model.classes_))
+    metrics = _evaluate_with_cv(texts, labels, metrics, model.classifier, cv_folds)
 
     if log_mlflow:
         try:
@@ -67,6 +131,10 @@ def train_topic_supervised_model(texts, labels, model_name="topic_supervised", l
                     "accuracy": metrics["accuracy"],
                     "f1_macro": metrics["f1_macro"]
                 })
+                if "cv" in metrics:
+                    mlflow.log_params({"cv_folds": metrics["cv"]["n_splits"]})
+                    mlflow.log_metrics({"train_accuracy": metrics["train_accuracy"],
+                                        "accuracy_std": metrics["accuracy_std"]})
 
                 model.save(TOPIC_MODEL_DIR / model_name)
                 mlflow.log_artifacts(str(TOPIC_MODEL_DIR / model_name))
@@ -78,25 +146,60 @@ def train_topic_supervised_model(texts, labels, model_name="topic_supervised", l
         model.save(TOPIC_MODEL_DIR / model_name)
         logger.info(f"Topic model trained (no MLflow), accuracy: {metrics['accuracy']:.3f}")
 
+    if store:
+        store.record_training(pending, metrics)
+
     return model, metrics
 
-def train_topic_auto_model(texts, n_clusters=8, model_name="topic_auto", log_mlflow=True):
+def train_topic_auto_model(texts, n_clusters=8, model_name="topic_auto", log_mlflow=True, auto_k=False,
+                           skip_if_unchanged=False):
+    store = None
+    if skip_if_unchanged:
+        config = {
+            "tfidf": _tfidf_config_for(texts),
+            "kmeans": KMEANS_CONFIG,
+            "n_clusters": None if auto_k else n_clusters,
+            "auto_k": AUTO_K_CONFIG if auto_k else None
+        }
+        store, pending, reused = _find_reusable_training("topic_auto", model_name, texts, None, config,
+                                                         TOPIC_MODEL_DIR / model_name)
+        if reused:
+            model = AutoTopicModel.load(reused.artifact_path)
+            model.k_selection = reused.metrics.get("k_selection")
+            model.reused_artifact = True
+            return model
+
+    def fit_model():
+        if auto_k:
+            k_selection, vectorizer, kmeans = search_n_clusters(texts)
+            model = AutoTopicModel.from_fitted(vectorizer, kmeans)
+        else:
+            k_selection = None
+            model = AutoTopicModel(n_clusters=n_clusters).fit(texts)
+        model.k_selection = k_selection
+        return model, k_selection
+
     if log_mlflow:
         mlflow.set_experiment("topic_auto_training")
         with mlflow.start_run():
-            model = AutoTopicModel(n_clusters=n_clusters)
-            model.fit(texts)
+            model, k_selection = fit_model()
+            n_clusters = model.n_clusters
 
-            mlflow.log_params({"n_samples": len(texts), "n_clusters": n_clusters})
+            mlflow.log_params({"n_samples": len(texts), "n_clusters": n_clusters, "auto_k": auto_k})
+            if k_selection:
+                for point in k_selection["curve"]:
+                    mlflow.log_metric(f"k_selection_{k_selection['metric']}", point["score"], step=point["k"])
 
             model.save(TOPIC_MODEL_DIR / model_name)
             mlflow.log_artifacts(str(TOPIC_MODEL_DIR / model_name))
 
             logger.info(f"Auto topic model trained with {n_clusters} clusters")
-            return model
     else:
-        model = AutoTopicModel(n_clusters=n_clusters)
-        model.fit(texts)
+        model, k_selection = fit_model()
         model.save(TOPIC_MODEL_DIR / model_name)
         logger.info("Auto topic model trained (no MLflow)")
-        return model
+
+    if store:
+        store.record_training(pending, {"n_clusters": model.n_clusters, "k_selection": k_selection})
+
+    return model
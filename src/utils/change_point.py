@@ -0,0 +1,166 @@
+import math
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+import pandas as pd
+from config.settings import (SPIKE_EWMA_ALPHA, SPIKE_EWMA_LIMIT, SPIKE_MIN_DELTA, SPIKE_CUSUM_H,
+                             SPIKE_MIN_OBSERVATIONS, SPIKE_MAX_SEGMENTS)
+from src.utils.rolling_metrics import NEGATIVE_LABELS
+
+ALL = "*"
+UNKNOWN = "Unknown"
+
+# Keeps a near-zero reference rate from turning a single negative comment into an alarm
+MIN_REFERENCE = 0.05
+
+class SegmentState:
+    __slots__ = ("n", "reference", "ewma", "cusum", "cooldown", "alarms")
+
+    def __init__(self):
+        self.n = 0
+        self.reference = 0.0
+        self.ewma = 0.0
+        self.cusum = 0.0
+        self.cooldown = 0
+        self.alarms = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "n": self.n,
+            "reference": self.reference,
+            "ewma": self.ewma,
+            "cusum": self.cusum,
+            "alarms": self.alarms
+        }
+
+class ChangePointDetector:
+    def __init__(self, alpha: float = SPIKE_EWMA_ALPHA, limit: float = SPIKE_EWMA_LIMIT,
+                 delta: float = SPIKE_MIN_DELTA, h: float = SPIKE_CUSUM_H,
+                 min_observations: int = SPIKE_MIN_OBSERVATIONS, max_segments: int = SPIKE_MAX_SEGMENTS,
+                 include_marginals: bool = True):
+        if not 0 < alpha < 1:
+            raise ValueError(f"alpha must be in (0, 1), got {alpha}")
+
+        self.alpha = alpha
+        self.reference_alpha = alpha / 10
+        self.limit = limit
+        self.delta = delta
+        self.h = h
+        self.min_observations = min_observations
+        self.max_segments = max_segments
+        self.include_marginals = include_marginals
+        self.ewma_width = limit * math.sqrt(alpha / (2 - alpha))
+        self.segments: "OrderedDict[Tuple[str, str], SegmentState]" = OrderedDict()
+        self.total_observed = 0
+        self.total_alarms = 0
+
+    def _segment_keys(self, topic, source) -> List[Tuple[str, str]]:
+        topic = UNKNOWN if topic is None or topic != topic else str(topic)
+        source = UNKNOWN if source is None or source != source else str(source)
+        if not self.include_marginals:
+            return [(topic, source)]
+        return [(topic, source), (topic, ALL), (ALL, source)]
+
+    def _get_state(self, key: Tuple[str, str]) -> SegmentState:
+        state = self.segments.get(key)
+        if state is None:
+            state = SegmentState()
+            self.segments[key] = state
+            if len(self.segments) > self.max_segments:
+                self.segments.popitem(last=False)
+        else:
+            self.segments.move_to_end(key)
+        return state
+
+    def _step(self, state: SegmentState, x: float) -> bool:
+        state.n += 1
+
+        if state.n <= self.min_observations:
+            state.reference += (x - state.reference) / state.n
+            state.ewma = state.reference
+            return False
+
+        p = min(max(state.reference, MIN_REFERENCE), 1 - MIN_REFERENCE - self.delta)
+        shifted = p + self.delta
+        sigma = math.sqrt(p * (1 - p))
+
+        # Bernoulli log-likelihood ratio CUSUM tuned to a shift of at least `delta`
+        llr = math.log(shifted / p) if x else math.log((1 - shifted) / (1 - p))
+        state.ewma += self.alpha * (x - state.ewma)
+        state.cusum = max(0.0, state.cusum + llr)
+
+        # The reference only follows the segment while it is in control, so a spike is not absorbed
+        if state.cusum < self.h / 2:
+            state.reference += max(1 / state.n, self.reference_alpha) * (x - state.reference)
+
+        if state.cooldown > 0:
+            state.cooldown -= 1
+            return False
+
+        if state.cusum > self.h and state.ewma > p + self.ewma_width * sigma:
+            state.cusum = 0.0
+            state.cooldown = self.min_observations
+            state.alarms += 1
+            return True
+        return False
+
+    def _alert(self, key: Tuple[str, str], state: SegmentState, timestamp) -> Dict[str, Any]:
+        topic, source = key
+        delta = state.ewma - state.reference
+        return {
+            "type": "segment_negative_spike",
+            "topic": topic,
+            "source": source,
+            "negative_ratio": state.ewma,
+            "reference_ratio": state.reference,
+            "delta": delta,
+            "observations": state.n,
+            "timestamp": (timestamp or datetime.now()).isoformat(),
+            "message": f"Negative sentiment spike in topic={topic}, source={source}: "
+                       f"{state.ewma:.1%} vs {state.reference:.1%} (+{delta:.1%})"
+        }
+
+    def update(self, sentiment, topic=None, source=None, timestamp=None) -> List[Dict[str, Any]]:
+        x = 1.0 if sentiment in NEGATIVE_LABELS else 0.0
+        self.total_observed += 1
+
+        alerts = []
+        for key in self._segment_keys(topic, source):
+            state = self._get_state(key)
+            if self._step(state, x):
+                alerts.append(self._alert(key, state, timestamp))
+
+        self.total_alarms += len(alerts)
+        return alerts
+
+    def update_many(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        alerts = []
+        for record in records:
+            sentiment = record.get("sentiment_label")
+            if sentiment is not None:
+                alerts.extend(self.update(sentiment, record.get("topic_label"), record.get("source")))
+        return alerts
+
+    def update_dataframe(self, df_pandas: pd.DataFrame) -> List[Dict[str, Any]]:
+        if df_pandas.empty or 'sentiment_label' not in df_pandas.columns:
+            return []
+
+        n = len(df_pandas)
+        topics = df_pandas['topic_label'].tolist() if 'topic_label' in df_pandas.columns else [None] * n
+        sources = df_pandas['source'].tolist() if 'source' in df_pandas.columns else [None] * n
+
+        alerts = []
+        for sentiment, topic, source in zip(df_pandas['sentiment_label'].tolist(), topics, sources):
+            alerts.extend(self.update(sentiment, topic, source))
+        return alerts
+
+    def get_segment(self, topic, source=ALL) -> Optional[Dict[str, Any]]:
+        state = self.segments.get((str(topic), str(source)))
+        return state.to_dict() if state is not None else None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "segments": len(self.segments),
+            "total_observed": self.total_observed,
+            "total_alarms": self.total_alarms
+        }
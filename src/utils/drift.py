@@ -0,0 +1,139 @@
+from collections import deque, Counter
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterable
+import numpy as np
+from config.settings import KPI_DRIFT_THRESHOLD, DRIFT_METRIC, DRIFT_WINDOW_SIZE, DRIFT_MIN_OBSERVATIONS
+
+EPSILON = 1e-6
+
+DRIFT_THRESHOLDS = {
+    "total_variation": KPI_DRIFT_THRESHOLD,
+    "jensen_shannon": 0.1,
+    "psi": 0.2
+}
+
+def align_distributions(baseline: Dict[str, float], current: Dict[str, float]):
+    keys = sorted(set(baseline) | set(current), key=str)
+    baseline_arr = np.array([baseline.get(k, 0) for k in keys], dtype=float)
+    current_arr = np.array([current.get(k, 0) for k in keys], dtype=float)
+
+    baseline_arr = baseline_arr / baseline_arr.sum() if baseline_arr.sum() > 0 else baseline_arr
+    current_arr = current_arr / current_arr.sum() if current_arr.sum() > 0 else current_arr
+
+    return keys, baseline_arr, current_arr
+
+def total_variation(p: np.ndarray, q: np.ndarray) -> float:
+    return float(np.sum(np.abs(p - q)) / 2)
+
+def jensen_shannon(p: np.ndarray, q: np.ndarray) -> float:
+    m = (p + q) / 2
+
+    def kl(a, b):
+        mask = a > 0
+        return np.sum(a[mask] * np.log2(a[mask] / b[mask]))
+
+    divergence = max((kl(p, m) + kl(q, m)) / 2, 0.0)
+    return float(np.sqrt(divergence))
+
+def psi(p: np.ndarray, q: np.ndarray) -> float:
+    p = np.clip(p, EPSILON, None)
+    q = np.clip(q, EPSILON, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+DRIFT_METRICS = {
+    "total_variation": total_variation,
+    "jensen_shannon": jensen_shannon,
+    "psi": psi
+}
+
+def compute_drift(baseline: Dict[str, float], current: Dict[str, float],
+                  metric: str = DRIFT_METRIC, threshold: Optional[float] = None) -> Dict[str, Any]:
+    if metric not in DRIFT_METRICS:
+        raise ValueError(f"Unknown drift metric: {metric}. Use one of {list(DRIFT_METRICS)}")
+
+    keys, p, q = align_distributions(baseline, current)
+    threshold = DRIFT_THRESHOLDS[metric] if threshold is None else threshold
+    # An empty side has no distribution to compare against
+    score = DRIFT_METRICS[metric](p, q) if p.sum() > 0 and q.sum() > 0 else 0.0
+
+    return {
+        "metric": metric,
+        "score": score,
+        "threshold": threshold,
+        "is_drift": score > threshold,
+        "new_categories": [k for k in keys if baseline.get(k, 0) == 0 and current.get(k, 0) > 0],
+        "missing_categories": [k for k in keys if baseline.get(k, 0) > 0 and current.get(k, 0) == 0]
+    }
+
+class RollingHistogram:
+    def __init__(self, window_size: int = DRIFT_WINDOW_SIZE):
+        self.window_size = window_size
+        self.values = deque()
+        self.counts = Counter()
+
+    def add(self, value):
+        self.values.append(value)
+        self.counts[value] += 1
+
+        if len(self.values) > self.window_size:
+            evicted = self.values.popleft()
+            self.counts[evicted] -= 1
+            if self.counts[evicted] == 0:
+                del self.counts[evicted]
+
+    def distribution(self) -> Dict[str, int]:
+        return dict(self.counts)
+
+    def __len__(self):
+        return len(self.values)
+
+class DriftEngine:
+    def __init__(self, features: Iterable[str] = ("sentiment_label", "topic_label"),
+                 window_size: int = DRIFT_WINDOW_SIZE, metric: str = DRIFT_METRIC,
+                 threshold: Optional[float] = None, min_observations: int = DRIFT_MIN_OBSERVATIONS):
+        if metric not in DRIFT_METRICS:
+            raise ValueError(f"Unknown drift metric: {metric}. Use one of {list(DRIFT_METRICS)}")
+
+        self.metric = metric
+        self.threshold = threshold
+        self.min_observations = min_observations
+        self.histograms = {feature: RollingHistogram(window_size) for feature in features}
+        self.baselines: Dict[str, Dict[str, float]] = {}
+        self.total_observed = 0
+        self.last_update = None
+
+    def set_baseline(self, feature: str, distribution: Dict[str, float]):
+        self.baselines[feature] = dict(distribution)
+
+    def update(self, record: Dict[str, Any]):
+        for feature, histogram in self.histograms.items():
+            value = record.get(feature)
+            if value is not None:
+                histogram.add(value)
+        self.total_observed += 1
+        self.last_update = datetime.now()
+
+    def update_many(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            self.update(record)
+
+    def current_distribution(self, feature: str) -> Dict[str, int]:
+        return self.histograms[feature].distribution()
+
+    def window_count(self, feature: str) -> int:
+        return len(self.histograms[feature])
+
+    def check(self) -> List[Dict[str, Any]]:
+        results = []
+
+        for feature, histogram in self.histograms.items():
+            if feature not in self.baselines or len(histogram) < self.min_observations:
+                continue
+
+            result = compute_drift(self.baselines[feature], histogram.distribution(),
+                                   metric=self.metric, threshold=self.threshold)
+            result["feature"] = feature
+            result["window_count"] = len(histogram)
+            results.append(result)
+
+        return results
@@ -1,19 +1,158 @@
-from sklearn.metrics import accuracy_score, f1_score, classification_report, confusion_matrix
 import numpy as np
+from src.utils.drift import compute_drift
 
-def calculate_classification_metrics(y_true, y_pred, labels=None):
-    metrics = {
-        "accuracy": accuracy_score(y_true, y_pred),
-        "f1_macro": f1_score(y_true, y_pred, average='macro', zero_division=0),
-        "f1_weighted": f1_score(y_true, y_pred, average='weighted', zero_division=0)
-    }
+class ConfusionMatrixAccumulator:
+    def __init__(self, labels=None):
+        self.labels = []
+        self._index = {}
+        self.matrix = np.zeros((0, 0), dtype=np.int64)
+        if labels is not None:
+            self._add_labels(labels)
+
+    def _add_labels(self, labels):
+        new_labels = [label for label in labels if label not in self._index]
+        if not new_labels:
+            return
+
+        for label in new_labels:
+            self._index[label] = len(self.labels)
+            self.labels.append(label)
+
+        grow = len(new_labels)
+        self.matrix = np.pad(self.matrix, ((0, grow), (0, grow)))
+
+    def update(self, y_true, y_pred):
+        y_true = np.asarray(y_true)
+        y_pred = np.asarray(y_pred)
+        if len(y_true) != len(y_pred):
+            raise ValueError(f"y_true and y_pred lengths differ: {len(y_true)} vs {len(y_pred)}")
+        if len(y_true) == 0:
+            return self
+
+        chunk_labels, inverse = np.unique(np.concatenate([y_true, y_pred]), return_inverse=True)
+        self._add_labels(chunk_labels.tolist())
+
+        mapping = np.array([self._index[label] for label in chunk_labels.tolist()])
+        true_idx = mapping[inverse[:len(y_true)]]
+        pred_idx = mapping[inverse[len(y_true):]]
+
+        n = len(self.labels)
+        self.matrix += np.bincount(true_idx * n + pred_idx, minlength=n * n).reshape(n, n)
+        return self
+
+    def merge(self, other):
+        self._add_labels(other.labels)
+        idx = np.array([self._index[label] for label in other.labels], dtype=int)
+        if len(idx) > 0:
+            self.matrix[np.ix_(idx, idx)] += other.matrix
+        return self
+
+    def __add__(self, other):
+        return ConfusionMatrixAccumulator().merge(self).merge(other)
+
+    @property
+    def total(self):
+        return int(self.matrix.sum())
+
+    def _sub_matrix(self, labels):
+        n = len(labels)
+        sub = np.zeros((n, n), dtype=np.int64)
+        known = [(i, self._index[label]) for i, label in enumerate(labels) if label in self._index]
+        if known:
+            pos, idx = zip(*known)
+            sub[np.ix_(pos, pos)] = self.matrix[np.ix_(idx, idx)]
+
+        # Predictions of labels outside the requested set still count as errors for recall
+        support = np.zeros(n, dtype=np.int64)
+        predicted = np.zeros(n, dtype=np.int64)
+        for i, j in known:
+            support[i] = self.matrix[j].sum()
+            predicted[i] = self.matrix[:, j].sum()
+        return sub, support, predicted
+
+    def per_class(self, labels=None):
+        labels = list(labels) if labels is not None else sorted(self.labels)
+        sub, support, predicted = self._sub_matrix(labels)
+        tp = np.diag(sub).astype(float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(predicted > 0, tp / predicted, 0.0)
+            recall = np.where(support > 0, tp / support, 0.0)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+        return labels, precision, recall, f1, support
 
-    if labels:
-        report = classification_report(y_true, y_pred, labels=labels, target_names=labels,
-                                      output_dict=True, zero_division=0)
-        metrics["per_class"] = report
+    def accuracy(self):
+        return float(np.trace(self.matrix) / self.total) if self.total > 0 else 0.0
 
-    return metrics
+    def compute(self, labels=None):
+        _, _, _, f1, support = self.per_class()
+        weights = support.sum()
+
+        metrics = {
+            "accuracy": self.accuracy(),
+            "f1_macro": float(f1.mean()) if len(f1) > 0 else 0.0,
+            "f1_weighted": float((f1 * support).sum() / weights) if weights > 0 else 0.0
+        }
+
+        if labels:
+            metrics["per_class"] = self.report(labels)
+
+        return metrics
+
+    def report(self, labels):
+        labels, precision, recall, f1, support = self.per_class(labels)
+        total_support = int(support.sum())
+
+        report = {
+            str(label): {
+                "precision": float(precision[i]),
+                "recall": float(recall[i]),
+                "f1-score": float(f1[i]),
+                "support": float(support[i])
+            }
+            for i, label in enumerate(labels)
+        }
+
+        observed = self.matrix.sum(axis=0) + self.matrix.sum(axis=1) > 0
+        observed_labels = {label for label, seen in zip(self.labels, observed) if seen}
+
+        if set(labels) == observed_labels:
+            report["accuracy"] = self.accuracy()
+        else:
+            tp = float(np.diag(self._sub_matrix(labels)[0]).sum())
+            predicted = float(self._sub_matrix(labels)[2].sum())
+            micro_p = tp / predicted if predicted > 0 else 0.0
+            micro_r = tp / total_support if total_support > 0 else 0.0
+            report["micro avg"] = {
+                "precision": micro_p,
+                "recall": micro_r,
+                "f1-score": 2 * micro_p * micro_r / (micro_p + micro_r) if micro_p + micro_r > 0 else 0.0,
+                "support": float(total_support)
+            }
+
+        for name, weights in [("macro avg", np.ones(len(labels))), ("weighted avg", support.astype(float))]:
+            norm = weights.sum()
+            report[name] = {
+                "precision": float((precision * weights).sum() / norm) if norm > 0 else 0.0,
+                "recall": float((recall * weights).sum() / norm) if norm > 0 else 0.0,
+                "f1-score": float((f1 * weights).sum() / norm) if norm > 0 else 0.0,
+                "support": float(total_support)
+            }
+
+        return report
+
+    def to_dict(self):
+        return {"labels": list(self.labels), "matrix": self.matrix.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        accumulator = cls(data["labels"])
+        accumulator.matrix = np.array(data["matrix"], dtype=np.int64).reshape(len(data["labels"]), -1)
+        return accumulator
+
+def calculate_classification_metrics(y_true, y_pred, labels=None):
+    return ConfusionMatrixAccumulator().update(y_true, y_pred).compute(labels)
 
 def calculate_topic_coherence_score(texts, topic_labels):
     unique_topics = set(topic_labels)
@@ -39,15 +178,8 @@ def calculate_topic_coherence_score(texts, topic_labels):
     return np.mean(coherence_scores) if coherence_scores else 0.5
 
 def detect_drift(baseline_dist, current_dist, threshold=0.15):
-    baseline_arr = np.array(list(baseline_dist.values()))
-    current_arr = np.array(list(current_dist.values()))
-
-    baseline_arr = baseline_arr / baseline_arr.sum() if baseline_arr.sum() > 0 else baseline_arr
-    current_arr = current_arr / current_arr.sum() if current_arr.sum() > 0 else current_arr
-
-    drift_score = np.sum(np.abs(baseline_arr - current_arr)) / 2
-
-    return drift_score > threshold, drift_score
+    result = compute_drift(baseline_dist, current_dist, metric="total_variation", threshold=threshold)
+    return result["is_drift"], result["score"]
 
 def detect_negative_spike(current_negative_ratio, baseline_negative_ratio, threshold=0.2):
     delta = current_negative_ratio - baseline_negative_ratio
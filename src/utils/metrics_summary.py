@@ -0,0 +1,121 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, Iterable
+import pandas as pd
+from src.utils.rolling_metrics import NEGATIVE_LABELS
+from src.utils.sketches import TDigest, HyperLogLog
+
+DISTRIBUTION_COLUMNS = {
+    "sentiment_distribution": "sentiment_label",
+    "topic_distribution": "topic_label",
+    "source_distribution": "source"
+}
+
+DISTINCT_COLUMNS = ("id", "customer_id")
+
+SCORE_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+class MetricsSummary:
+    def __init__(self, compression: float = 200, hll_precision: int = 12):
+        self.compression = compression
+        self.hll_precision = hll_precision
+        self.total_count = 0
+        self.negative_count = 0
+        self.distributions = {key: Counter() for key in DISTRIBUTION_COLUMNS}
+        self.score_digest = TDigest(compression)
+        self.distinct = {column: HyperLogLog(hll_precision) for column in DISTINCT_COLUMNS}
+
+    @classmethod
+    def from_dataframe(cls, df_pandas: pd.DataFrame, **kwargs) -> "MetricsSummary":
+        return cls(**kwargs).update_dataframe(df_pandas)
+
+    def update_dataframe(self, df_pandas: pd.DataFrame):
+        self.total_count += len(df_pandas)
+
+        for key, column in DISTRIBUTION_COLUMNS.items():
+            if column in df_pandas.columns:
+                self.distributions[key].update(df_pandas[column].value_counts().to_dict())
+
+        if 'sentiment_label' in df_pandas.columns:
+            self.negative_count += int(df_pandas['sentiment_label'].isin(list(NEGATIVE_LABELS)).sum())
+
+        if 'sentiment_score' in df_pandas.columns:
+            self.score_digest.add_many(pd.to_numeric(df_pandas['sentiment_score'], errors='coerce').to_numpy())
+
+        for column, sketch in self.distinct.items():
+            if column in df_pandas.columns:
+                sketch.add_many(df_pandas[column].dropna().tolist())
+
+        return self
+
+    def merge(self, other: "MetricsSummary"):
+        self.total_count += other.total_count
+        self.negative_count += other.negative_count
+        for key in DISTRIBUTION_COLUMNS:
+            self.distributions[key].update(other.distributions[key])
+        self.score_digest.merge(other.score_digest)
+        for column in DISTINCT_COLUMNS:
+            self.distinct[column].merge(other.distinct[column])
+        return self
+
+    def __add__(self, other: "MetricsSummary"):
+        return MetricsSummary(self.compression, self.hll_precision).merge(self).merge(other)
+
+    @classmethod
+    def combine(cls, partials: Iterable[Any]) -> "MetricsSummary":
+        partials = [cls.from_dict(p) if isinstance(p, dict) else p for p in partials]
+        if not partials:
+            return cls()
+
+        summary = cls(partials[0].compression, partials[0].hll_precision)
+        for partial in partials:
+            summary.merge(partial)
+        return summary
+
+    def to_metrics(self, quantiles=SCORE_QUANTILES) -> Dict[str, Any]:
+        metrics = {}
+
+        if self.distributions["sentiment_distribution"]:
+            metrics["sentiment_distribution"] = dict(self.distributions["sentiment_distribution"])
+            metrics["negative_ratio"] = self.negative_count / self.total_count if self.total_count > 0 else 0
+
+        for key in ("topic_distribution", "source_distribution"):
+            if self.distributions[key]:
+                metrics[key] = dict(self.distributions[key])
+
+        if self.score_digest.count:
+            metrics["sentiment_score_mean"] = self.score_digest.mean()
+            metrics["sentiment_score_quantiles"] = self.score_digest.quantiles(quantiles)
+
+        for column, sketch in self.distinct.items():
+            if sketch.registers.any():
+                metrics[f"distinct_{column}"] = sketch.count()
+
+        metrics["total_count"] = self.total_count
+        metrics["timestamp"] = datetime.now().isoformat()
+
+        return metrics
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "compression": self.compression,
+            "hll_precision": self.hll_precision,
+            "total_count": self.total_count,
+            "negative_count": self.negative_count,
+            "distributions": {key: {str(k): int(v) for k, v in counts.items()}
+                              for key, counts in self.distributions.items()},
+            "score_digest": self.score_digest.to_dict(),
+            "distinct": {column: sketch.to_dict() for column, sketch in self.distinct.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MetricsSummary":
+        summary = cls(data["compression"], data["hll_precision"])
+        summary.total_count = data["total_count"]
+        summary.negative_count = data["negative_count"]
+        for key, counts in data["distributions"].items():
+            summary.distributions[key] = Counter(counts)
+        summary.score_digest = TDigest.from_dict(data["score_digest"])
+        for column, sketch in data["distinct"].items():
+            summary.distinct[column] = HyperLogLog.from_dict(sketch)
+        return summary
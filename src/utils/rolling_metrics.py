@@ -0,0 +1,173 @@
+import bisect
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterable
+import pandas as pd
+
+BUCKET_SIZES = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1)
+}
+
+BUCKET_FREQ = {
+    "minute": "min",
+    "hour": "h",
+    "day": "D"
+}
+
+NEGATIVE_LABELS = ('Negative', 'Very Negative')
+
+DIMENSIONS = {
+    "sentiment": "sentiment_label",
+    "topic": "topic_label",
+    "source": "source"
+}
+
+class MetricsBucket:
+    def __init__(self):
+        self.total = 0
+        self.negative = 0
+        self.counts = {dimension: Counter() for dimension in DIMENSIONS}
+
+    def add(self, sentiment=None, topic=None, source=None, count=1):
+        self.total += count
+        if sentiment is not None:
+            self.counts["sentiment"][sentiment] += count
+            if sentiment in NEGATIVE_LABELS:
+                self.negative += count
+        if topic is not None:
+            self.counts["topic"][topic] += count
+        if source is not None:
+            self.counts["source"][source] += count
+
+class TimeBucketedMetrics:
+    def __init__(self, bucket: str = "minute", retention: timedelta = timedelta(days=8)):
+        if bucket not in BUCKET_SIZES:
+            raise ValueError(f"Unknown bucket size: {bucket}. Use one of {list(BUCKET_SIZES)}")
+
+        self.bucket = bucket
+        self.bucket_size = BUCKET_SIZES[bucket]
+        self.retention = retention
+        self.buckets: Dict[datetime, MetricsBucket] = {}
+        self._keys: List[datetime] = []
+
+    def _floor(self, timestamp: datetime) -> datetime:
+        if self.bucket == "minute":
+            return timestamp.replace(second=0, microsecond=0)
+        if self.bucket == "hour":
+            return timestamp.replace(minute=0, second=0, microsecond=0)
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def _get_bucket(self, key: datetime) -> MetricsBucket:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = MetricsBucket()
+            self.buckets[key] = bucket
+            bisect.insort(self._keys, key)
+        return bucket
+
+    def add(self, timestamp: Optional[datetime] = None, sentiment=None, topic=None, source=None):
+        timestamp = timestamp or datetime.now()
+        if isinstance(timestamp, pd.Timestamp):
+            timestamp = timestamp.to_pydatetime()
+        self._get_bucket(self._floor(timestamp)).add(sentiment, topic, source)
+
+    def update(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            timestamp = record.get("timestamp")
+            if isinstance(timestamp, str):
+                timestamp = pd.to_datetime(timestamp, errors="coerce")
+                timestamp = None if pd.isna(timestamp) else timestamp
+            self.add(timestamp, record.get("sentiment_label"), record.get("topic_label"), record.get("source"))
+        self.prune()
+
+    def update_dataframe(self, df_pandas: pd.DataFrame):
+        if df_pandas.empty:
+            return
+
+        now = pd.Timestamp.now()
+        if 'timestamp' in df_pandas.columns:
+            timestamps = pd.to_datetime(df_pandas['timestamp'], errors='coerce').fillna(now)
+        else:
+            timestamps = pd.Series(now, index=df_pandas.index)
+
+        frame = pd.DataFrame({"bucket": timestamps.dt.floor(BUCKET_FREQ[self.bucket])})
+        for column in DIMENSIONS.values():
+            if column in df_pandas.columns:
+                frame[column] = df_pandas[column].values
+
+        for key, count in frame.groupby("bucket").size().items():
+            self._get_bucket(key.to_pydatetime()).total += int(count)
+
+        for dimension, column in DIMENSIONS.items():
+            if column not in frame.columns:
+                continue
+            grouped = frame.groupby(["bucket", column]).size()
+            for (key, value), count in grouped.items():
+                bucket = self._get_bucket(key.to_pydatetime())
+                bucket.counts[dimension][value] += int(count)
+                if dimension == "sentiment" and value in NEGATIVE_LABELS:
+                    bucket.negative += int(count)
+
+        self.prune()
+
+    def prune(self, now: Optional[datetime] = None):
+        if not self._keys:
+            return
+
+        # Retention is relative to the newest bucket so replayed historical data is kept
+        cutoff = self._floor((now or self._keys[-1]) - self.retention)
+        n_expired = bisect.bisect_left(self._keys, cutoff)
+        for key in self._keys[:n_expired]:
+            del self.buckets[key]
+        del self._keys[:n_expired]
+
+    def window(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        lo = bisect.bisect_left(self._keys, self._floor(start))
+        hi = bisect.bisect_left(self._keys, end)
+
+        total = 0
+        negative = 0
+        counts = {dimension: Counter() for dimension in DIMENSIONS}
+        for key in self._keys[lo:hi]:
+            bucket = self.buckets[key]
+            total += bucket.total
+            negative += bucket.negative
+            for dimension in DIMENSIONS:
+                counts[dimension].update(bucket.counts[dimension])
+
+        return {
+            "sentiment_distribution": dict(counts["sentiment"]),
+            "topic_distribution": dict(counts["topic"]),
+            "source_distribution": dict(counts["source"]),
+            "negative_ratio": negative / total if total > 0 else 0,
+            "total_count": total,
+            "window_start": start.isoformat(),
+            "window_end": end.isoformat()
+        }
+
+    def recent(self, window: timedelta, now: Optional[datetime] = None) -> Dict[str, Any]:
+        now = now or datetime.now()
+        return self.window(now - window, now + self.bucket_size)
+
+    def compare(self, window: timedelta, baseline_offset: timedelta,
+                now: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+        now = now or datetime.now()
+        end = now + self.bucket_size
+        return {
+            "current": self.window(now - window, end),
+            "baseline": self.window(now - baseline_offset - window, end - baseline_offset)
+        }
+
+    def series(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        lo = bisect.bisect_left(self._keys, self._floor(start))
+        hi = bisect.bisect_left(self._keys, end)
+        return [
+            {
+                "bucket": key.isoformat(),
+                "total_count": self.buckets[key].total,
+                "negative_ratio": self.buckets[key].negative / self.buckets[key].total if self.buckets[key].total else 0
+            }
+            for key in self._keys[lo:hi]
+        ]
@@ -0,0 +1,93 @@
+from typing import Dict, List, Any, Optional, Sequence
+import numpy as np
+import pandas as pd
+from src.utils.rolling_metrics import NEGATIVE_LABELS
+
+SEGMENT_DIMENSIONS = ("source", "topic_label", "product")
+
+OPERATORS = (">=", ">", "<=", "<")
+
+# Goals on these metrics are checked even for segments below the minimum volume
+VOLUME_METRICS = ("volume", "volume_share", "volume_change")
+
+def segment_dimensions(df_pandas: pd.DataFrame, dimensions: Optional[Sequence[str]] = None) -> List[str]:
+    return [d for d in (dimensions or SEGMENT_DIMENSIONS) if d in df_pandas.columns]
+
+def compute_segment_metrics(df_pandas: pd.DataFrame, dimensions: Optional[Sequence[str]] = None,
+                            baseline: Optional[Any] = None) -> pd.DataFrame:
+    dimensions = segment_dimensions(df_pandas, dimensions)
+    if not dimensions or df_pandas.empty or 'sentiment_label' not in df_pandas.columns:
+        return pd.DataFrame()
+
+    frame = df_pandas[dimensions].astype(object).fillna("Unknown")
+    frame["_negative"] = df_pandas['sentiment_label'].isin(list(NEGATIVE_LABELS)).to_numpy()
+    aggregations = {"volume": ("_negative", "size"), "negative_count": ("_negative", "sum")}
+    if 'sentiment_score' in df_pandas.columns:
+        frame["_score"] = pd.to_numeric(df_pandas['sentiment_score'], errors='coerce').to_numpy()
+        aggregations["sentiment_score_mean"] = ("_score", "mean")
+
+    segments = frame.groupby(dimensions, sort=True).agg(**aggregations)
+    segments["negative_ratio"] = segments["negative_count"] / segments["volume"]
+    segments["volume_share"] = segments["volume"] / len(df_pandas)
+
+    # A scalar baseline is the reference negative ratio for every segment, a frame is aligned per segment
+    overall_ratio = segments["negative_count"].sum() / len(df_pandas)
+    if isinstance(baseline, dict):
+        baseline = baseline.get("negative_ratio")
+    if isinstance(baseline, pd.DataFrame) and not baseline.empty:
+        aligned = baseline.reindex(segments.index)
+        segments["negative_ratio_delta"] = segments["negative_ratio"] - aligned["negative_ratio"].fillna(overall_ratio)
+        segments["volume_change"] = segments["volume"] / aligned["volume"] - 1
+    else:
+        reference = overall_ratio if baseline is None else float(baseline)
+        segments["negative_ratio_delta"] = segments["negative_ratio"] - reference
+
+    return segments
+
+def evaluate_thresholds(values: np.ndarray, thresholds: np.ndarray, operators: Sequence[str]) -> np.ndarray:
+    operators = np.asarray(operators)
+    unknown = set(operators.ravel().tolist()) - set(OPERATORS)
+    if unknown:
+        raise ValueError(f"Unknown goal operators: {sorted(unknown)}. Use one of {list(OPERATORS)}")
+
+    below = values < thresholds
+    above = values > thresholds
+    violated = (np.where(operators == ">=", below, False) | np.where(operators == ">", above, False)
+                | np.where(operators == "<=", above, False) | np.where(operators == "<", below, False))
+    return violated & ~np.isnan(values)
+
+def segment_violations(segments: pd.DataFrame, goals: Dict[str, Dict[str, Any]],
+                       min_volume: int = 0) -> List[Dict[str, Any]]:
+    applicable = [(name, goal) for name, goal in goals.items() if goal["metric"] in segments.columns]
+    if segments.empty or not applicable:
+        return []
+
+    metric_names = [goal["metric"] for _, goal in applicable]
+    values = segments[metric_names].to_numpy(dtype=float)
+    thresholds = np.array([goal["threshold"] for _, goal in applicable], dtype=float)
+    operators = [goal["operator"] for _, goal in applicable]
+
+    violated = evaluate_thresholds(values, thresholds[np.newaxis, :], np.array(operators)[np.newaxis, :])
+    large_enough = (segments["volume"].to_numpy() >= min_volume)[:, np.newaxis]
+    volume_goals = np.isin(metric_names, VOLUME_METRICS)[np.newaxis, :]
+    violated &= large_enough | volume_goals
+
+    dimensions = list(segments.index.names)
+    index = segments.index.to_list()
+    volumes = segments["volume"].to_numpy()
+
+    violations = []
+    for row, col in zip(*np.nonzero(violated)):
+        key = index[row] if isinstance(index[row], tuple) else (index[row],)
+        goal_name, goal = applicable[col]
+        violations.append({
+            "goal": goal_name,
+            "metric": goal["metric"],
+            "value": float(values[row, col]),
+            "threshold": goal["threshold"],
+            "priority": goal["priority"],
+            "action": goal["action"],
+            "segment": dict(zip(dimensions, key)),
+            "volume": int(volumes[row])
+        })
+    return violations
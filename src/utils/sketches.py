@@ -0,0 +1,316 @@
+import base64
+import hashlib
+import heapq
+import math
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+import numpy as np
+
+def stable_hash(item: str) -> int:
+    # Python's hash() is salted per process, sketches must hash identically everywhere
+    return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class CountMinSketch:
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self._rows = np.arange(depth, dtype=np.uint64)[:, np.newaxis]
+
+    def _indices(self, items: List[str]) -> np.ndarray:
+        hashes = np.array([stable_hash(item) for item in items], dtype=np.uint64)
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        # Kirsch-Mitzenmacher double hashing gives `depth` independent-enough columns from one digest
+        return ((h1[np.newaxis, :] + self._rows * h2[np.newaxis, :]) % np.uint64(self.width)).astype(np.intp)
+
+    def add_many(self, items: List[str], counts=1):
+        if not items:
+            return
+        counts = np.broadcast_to(np.asarray(counts, dtype=np.int64), (len(items),))
+        columns = self._indices(items)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts)
+        self.total += int(counts.sum())
+
+    def add(self, item: str, count: int = 1):
+        self.add_many([item], count)
+
+    def estimate_many(self, items: List[str]) -> np.ndarray:
+        if not items:
+            return np.zeros(0, dtype=np.int64)
+        columns = self._indices(items)
+        return self.table[np.arange(self.depth)[:, np.newaxis], columns].min(axis=0)
+
+    def estimate(self, item: str) -> int:
+        return int(self.estimate_many([item])[0])
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+    def merge(self, other: "CountMinSketch"):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError(f"Cannot merge sketches of shape {(self.depth, self.width)} and {(other.depth, other.width)}")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def __add__(self, other: "CountMinSketch"):
+        return CountMinSketch(self.width, self.depth).merge(self).merge(other)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "total": self.total,
+            "table": base64.b64encode(self.table.astype('<i8').tobytes()).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CountMinSketch":
+        sketch = cls(data["width"], data["depth"])
+        table = np.frombuffer(base64.b64decode(data["table"]), dtype='<i8')
+        sketch.table = table.astype(np.int64).reshape(sketch.depth, sketch.width)
+        sketch.total = data["total"]
+        return sketch
+
+class SpaceSaving:
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self.counters: Dict[str, List[int]] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def _pop_min(self) -> Tuple[str, int]:
+        # Heap entries go stale as counts grow, skip any that no longer match the live counter
+        while True:
+            count, item = heapq.heappop(self._heap)
+            counter = self.counters.get(item)
+            if counter is not None and counter[0] == count:
+                return item, count
+
+    def add(self, item: str, count: int = 1):
+        counter = self.counters.get(item)
+        if counter is not None:
+            counter[0] += count
+        elif len(self.counters) < self.capacity:
+            counter = self.counters[item] = [count, 0]
+        else:
+            evicted, min_count = self._pop_min()
+            del self.counters[evicted]
+            counter = self.counters[item] = [min_count + count, min_count]
+
+        heapq.heappush(self._heap, (counter[0], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c[0], i) for i, c in self.counters.items()]
+            heapq.heapify(self._heap)
+
+    def add_many(self, items: Iterable[str]):
+        for item in items:
+            self.add(item)
+
+    def top(self, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        ranked = sorted(self.counters.items(), key=lambda kv: (-kv[1][0], kv[0]))
+        return [{"item": item, "count": count, "error": error} for item, (count, error) in ranked[:k]]
+
+    def __len__(self):
+        return len(self.counters)
+
+    def _floor_count(self) -> int:
+        # Any item not tracked by a full summary may have occurred up to its minimum count
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(counter[0] for counter in self.counters.values())
+
+    def merge(self, other: "SpaceSaving"):
+        floor, other_floor = self._floor_count(), other._floor_count()
+        merged = {}
+        for item in set(self.counters) | set(other.counters):
+            count, error = self.counters.get(item, [floor, floor])
+            other_count, other_error = other.counters.get(item, [other_floor, other_floor])
+            merged[item] = [count + other_count, error + other_error]
+
+        kept = sorted(merged.items(), key=lambda kv: (-kv[1][0], kv[0]))[:self.capacity]
+        self.counters = dict(kept)
+        self._heap = [(c[0], i) for i, c in self.counters.items()]
+        heapq.heapify(self._heap)
+        return self
+
+    def __add__(self, other: "SpaceSaving"):
+        return SpaceSaving(self.capacity).merge(self).merge(other)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"capacity": self.capacity, "counters": self.counters}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        summary = cls(data["capacity"])
+        summary.counters = {item: list(counter) for item, counter in data["counters"].items()}
+        summary._heap = [(c[0], i) for i, c in summary.counters.items()]
+        heapq.heapify(summary._heap)
+        return summary
+
+class TDigest:
+    def __init__(self, compression: float = 200):
+        self.compression = compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[np.ndarray] = []
+        self._buffered = 0
+
+    def _k_scale(self, q: np.ndarray) -> np.ndarray:
+        return self.compression / (2 * math.pi) * np.arcsin(2 * q - 1)
+
+    def _merge_centroids(self, means: np.ndarray, weights: np.ndarray):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        # Centroids falling in the same unit interval of the k1 scale are merged, bounding each centroid's size
+        q_center = (np.cumsum(weights) - weights / 2) / total
+        _, group = np.unique(np.floor(self._k_scale(q_center)), return_inverse=True)
+
+        merged_weights = np.bincount(group, weights=weights)
+        self.means = np.bincount(group, weights=means * weights) / merged_weights
+        self.weights = merged_weights
+
+    def _compress(self):
+        if not self._buffered:
+            return
+
+        values = np.concatenate(self._buffer)
+        self._buffer, self._buffered = [], 0
+        self._merge_centroids(np.concatenate([self.means, values]),
+                              np.concatenate([self.weights, np.ones(len(values))]))
+
+    def add_many(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self._buffer.append(values)
+        self._buffered += len(values)
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        if self._buffered >= 20 * self.compression:
+            self._compress()
+
+    def add(self, value: float):
+        self.add_many([value])
+
+    def quantile(self, q: float) -> Optional[float]:
+        self._compress()
+        if self.count == 0:
+            return None
+
+        total = self.weights.sum()
+        positions = np.concatenate([[0], np.cumsum(self.weights) - self.weights / 2, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * total, positions, values))
+
+    def quantiles(self, qs: Iterable[float]) -> Dict[str, Optional[float]]:
+        return {f"p{round(q * 100):g}": self.quantile(q) for q in qs}
+
+    def mean(self) -> Optional[float]:
+        self._compress()
+        if self.count == 0:
+            return None
+        return float(np.average(self.means, weights=self.weights))
+
+    def merge(self, other: "TDigest"):
+        self._compress()
+        other._compress()
+        if other.count == 0:
+            return self
+
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._merge_centroids(np.concatenate([self.means, other.means]),
+                              np.concatenate([self.weights, other.weights]))
+        return self
+
+    def __add__(self, other: "TDigest"):
+        return TDigest(self.compression).merge(self).merge(other)
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._compress()
+        return {
+            "compression": self.compression,
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TDigest":
+        digest = cls(data["compression"])
+        digest.means = np.array(data["means"], dtype=float)
+        digest.weights = np.array(data["weights"], dtype=float)
+        digest.count = data["count"]
+        if digest.count:
+            digest.min, digest.max = data["min"], data["max"]
+        return digest
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    # Exact for 64-bit values: each 32-bit half converts to float64 without rounding
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+class HyperLogLog:
+    def __init__(self, p: int = 12):
+        if not 4 <= p <= 18:
+            raise ValueError(f"HyperLogLog precision must be between 4 and 18, got {p}")
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def add_many(self, items: Iterable):
+        hashes = np.array([stable_hash(str(item)) for item in items], dtype=np.uint64)
+        if len(hashes) == 0:
+            return
+
+        suffix_bits = 64 - self.p
+        index = (hashes >> np.uint64(suffix_bits)).astype(np.intp)
+        suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+        rank = (suffix_bits - _bit_length(suffix) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def add(self, item):
+        self.add_many([item])
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / np.sum(np.exp2(-self.registers.astype(float)))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * self.m and zeros > 0:
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog"):
+        if self.p != other.p:
+            raise ValueError(f"Cannot merge HyperLogLog with precision {self.p} and {other.p}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def __add__(self, other: "HyperLogLog"):
+        return HyperLogLog(self.p).merge(self).merge(other)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"p": self.p, "registers": base64.b64encode(self.registers.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(data["p"])
+        sketch.registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8).copy()
+        return sketch
@@ -0,0 +1,173 @@
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+from config.model_config import ATTRIBUTION_CONFIG
+
+ALL_SEGMENT = "all"
+TEXT_COLUMNS = ("comment_lower", "comment", "text")
+
+def segment_key(dimension: str, category) -> str:
+    return f"{dimension}={category}"
+
+def text_column(df_pandas: pd.DataFrame) -> Optional[str]:
+    return next((c for c in TEXT_COLUMNS if c in df_pandas.columns), None)
+
+class TermProfile:
+    def __init__(self, terms: np.ndarray, keys: List[str], doc_counts: np.ndarray, counts: sparse.csr_matrix):
+        self.terms = terms
+        self.keys = keys
+        self.doc_counts = doc_counts
+        self.counts = counts
+        self._rows = {key: i for i, key in enumerate(keys)}
+
+    @classmethod
+    def from_frame(cls, df_pandas: pd.DataFrame, dimensions: Sequence[str] = ("sentiment_label", "topic_label"),
+                   config: Optional[Dict[str, Any]] = None) -> Optional["TermProfile"]:
+        column = text_column(df_pandas)
+        if column is None or df_pandas.empty:
+            return None
+        config = config or ATTRIBUTION_CONFIG
+
+        vectorizer = CountVectorizer(ngram_range=tuple(config["ngram_range"]),
+                                     max_features=config["max_features"], binary=True)
+        try:
+            X = vectorizer.fit_transform(df_pandas[column].fillna("").astype(str))
+        except ValueError:
+            # Empty vocabulary, e.g. every text is blank
+            return None
+
+        # One indicator row per segment turns all segment document frequencies into a single sparse product
+        keys = [ALL_SEGMENT]
+        indicator_rows = [np.zeros(len(df_pandas), dtype=np.int64)]
+        indicator_cols = [np.arange(len(df_pandas))]
+        for dimension in dimensions:
+            if dimension not in df_pandas.columns:
+                continue
+            codes, categories = pd.factorize(df_pandas[dimension])
+            valid = codes >= 0
+            indicator_rows.append(codes[valid] + len(keys))
+            indicator_cols.append(np.flatnonzero(valid))
+            keys.extend(segment_key(dimension, category) for category in categories)
+
+        rows = np.concatenate(indicator_rows)
+        cols = np.concatenate(indicator_cols)
+        G = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(len(keys), len(df_pandas)))
+
+        return cls(
+            terms=vectorizer.get_feature_names_out(),
+            keys=keys,
+            doc_counts=np.asarray(G.sum(axis=1)).ravel(),
+            counts=(G @ X).tocsr()
+        )
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def segment(self, key: str):
+        row = self._rows[key]
+        return int(self.doc_counts[row]), self.counts[row]
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump({"terms": self.terms, "keys": self.keys,
+                     "doc_counts": self.doc_counts, "counts": self.counts}, path)
+
+    @classmethod
+    def load(cls, path) -> Optional["TermProfile"]:
+        path = Path(path)
+        if not path.exists():
+            return None
+        data = joblib.load(path)
+        return cls(data["terms"], data["keys"], data["doc_counts"], data["counts"])
+
+def _aligned_counts(current: TermProfile, current_row: sparse.csr_matrix,
+                    baseline: TermProfile, baseline_row: sparse.csr_matrix):
+    current_terms = pd.Index(current.terms[current_row.indices])
+    baseline_terms = pd.Index(baseline.terms[baseline_row.indices])
+    terms = current_terms.union(baseline_terms)
+
+    y = np.zeros(len(terms))
+    y[terms.get_indexer(current_terms)] = current_row.data
+    x = np.zeros(len(terms))
+    x[terms.get_indexer(baseline_terms)] = baseline_row.data
+    return terms, y, x
+
+def log_odds_z(y: np.ndarray, x: np.ndarray, prior_strength: float) -> np.ndarray:
+    # Log-odds ratio with an informative Dirichlet prior, standardized by its approximate variance
+    pooled = y + x
+    a = prior_strength * pooled / pooled.sum()
+    a0 = a.sum()
+    n_y, n_x = y.sum(), x.sum()
+
+    delta = (np.log((y + a) / (n_y + a0 - y - a))
+             - np.log((x + a) / (n_x + a0 - x - a)))
+    return delta / np.sqrt(1 / (y + a) + 1 / (x + a))
+
+def attribute_terms(current: TermProfile, baseline: TermProfile, key: str = ALL_SEGMENT,
+                    top_n: Optional[int] = None, min_count: Optional[int] = None,
+                    prior_strength: Optional[float] = None) -> List[Dict[str, Any]]:
+    top_n = top_n or ATTRIBUTION_CONFIG["top_n"]
+    min_count = ATTRIBUTION_CONFIG["min_count"] if min_count is None else min_count
+    prior_strength = prior_strength or ATTRIBUTION_CONFIG["prior_strength"]
+
+    if key not in current or key not in baseline:
+        return []
+
+    current_docs, current_row = current.segment(key)
+    baseline_docs, baseline_row = baseline.segment(key)
+    if current_row.nnz == 0 or baseline_row.nnz == 0:
+        return []
+
+    terms, y, x = _aligned_counts(current, current_row, baseline, baseline_row)
+    z = log_odds_z(y, x, prior_strength)
+    z[(y + x < min_count) | (y == 0)] = -np.inf
+
+    top_n = min(top_n, len(z))
+    top = np.argpartition(-z, top_n - 1)[:top_n]
+    top = top[np.argsort(-z[top], kind="stable")]
+
+    return [
+        {
+            "term": terms[i],
+            "z_score": float(z[i]),
+            "current_doc_freq": float(y[i] / current_docs),
+            "baseline_doc_freq": float(x[i] / baseline_docs)
+        }
+        for i in top if np.isfinite(z[i]) and z[i] > 0
+    ]
+
+def drifted_categories(baseline_dist: Dict[str, float], current_dist: Dict[str, float],
+                       max_segments: Optional[int] = None) -> List[Dict[str, Any]]:
+    max_segments = max_segments or ATTRIBUTION_CONFIG["max_segments"]
+
+    baseline = pd.Series(baseline_dist, dtype=float)
+    current = pd.Series(current_dist, dtype=float)
+    baseline, current = baseline.align(current, fill_value=0)
+    change = current / max(current.sum(), 1) - baseline / max(baseline.sum(), 1)
+
+    top = change.abs().sort_values(ascending=False, kind="stable").index[:max_segments]
+    return [{"category": category, "share_change": float(change[category])} for category in top]
+
+def attribute_drift(current: TermProfile, baseline: TermProfile, dimension: str,
+                    baseline_dist: Dict[str, float], current_dist: Dict[str, float],
+                    config: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    config = config or ATTRIBUTION_CONFIG
+    options = {"top_n": config["top_n"], "min_count": config["min_count"], "prior_strength": config["prior_strength"]}
+
+    attribution = [{"segment": ALL_SEGMENT, "share_change": None,
+                    "terms": attribute_terms(current, baseline, ALL_SEGMENT, **options)}]
+
+    for drifted in drifted_categories(baseline_dist, current_dist, config["max_segments"]):
+        key = segment_key(dimension, drifted["category"])
+        attribution.append({
+            "segment": key,
+            "share_change": drifted["share_change"],
+            "terms": attribute_terms(current, baseline, key, **options)
+        })
+
+    return attribution
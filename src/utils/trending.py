@@ -0,0 +1,138 @@
+import re
+from collections import Counter, OrderedDict
+from typing import Dict, List, Any, Optional, Iterable, Set
+import numpy as np
+import pandas as pd
+from config.model_config import TRENDING_CONFIG
+from src.utils.rolling_metrics import BUCKET_SIZES, BUCKET_FREQ
+from src.utils.sketches import CountMinSketch, SpaceSaving
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def extract_ngrams(text: str, ngram_range=(2, 3)) -> Set[str]:
+    tokens = TOKEN_PATTERN.findall(text or "")
+    low, high = ngram_range
+    return {
+        " ".join(tokens[i:i + n])
+        for n in range(low, high + 1)
+        for i in range(len(tokens) - n + 1)
+    }
+
+class PhraseBucket:
+    def __init__(self, cms_width: int, cms_depth: int, capacity: int):
+        self.sketch = CountMinSketch(cms_width, cms_depth)
+        self.heavy_hitters = SpaceSaving(capacity)
+        self.docs = 0
+
+    def add_counts(self, counts: Counter, docs: int):
+        if counts:
+            phrases = list(counts)
+            self.sketch.add_many(phrases, np.fromiter(counts.values(), dtype=np.int64, count=len(counts)))
+            for phrase, count in counts.items():
+                self.heavy_hitters.add(phrase, count)
+        self.docs += docs
+
+class TrendingPhrases:
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = {**TRENDING_CONFIG, **(config or {})}
+        if self.config["bucket"] not in BUCKET_SIZES:
+            raise ValueError(f"Unknown bucket size: {self.config['bucket']}. Use one of {list(BUCKET_SIZES)}")
+
+        self.ngram_range = tuple(self.config["ngram_range"])
+        self.freq = BUCKET_FREQ[self.config["bucket"]]
+        self.buckets: "OrderedDict[pd.Timestamp, PhraseBucket]" = OrderedDict()
+
+    def _get_bucket(self, key: pd.Timestamp) -> PhraseBucket:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            newest = next(reversed(self.buckets), None)
+            bucket = PhraseBucket(self.config["cms_width"], self.config["cms_depth"], self.config["capacity"])
+            self.buckets[key] = bucket
+            if newest is not None and key < newest:
+                self.buckets = OrderedDict(sorted(self.buckets.items()))
+            while len(self.buckets) > self.config["retention_buckets"]:
+                self.buckets.popitem(last=False)
+        return bucket
+
+    def update(self, texts: Iterable[str], timestamps: Optional[Iterable] = None):
+        texts = list(texts)
+        if not texts:
+            return
+
+        now = pd.Timestamp.now()
+        if timestamps is None:
+            keys = pd.Series(now, index=range(len(texts)))
+        else:
+            keys = pd.to_datetime(pd.Series(list(timestamps)), errors='coerce').fillna(now)
+        keys = keys.dt.floor(self.freq)
+
+        for key, positions in keys.groupby(keys).groups.items():
+            counts = Counter()
+            for position in positions:
+                counts.update(extract_ngrams(texts[position], self.ngram_range))
+            self._get_bucket(key).add_counts(counts, len(positions))
+
+    def update_dataframe(self, df_pandas: pd.DataFrame):
+        if df_pandas.empty:
+            return
+        if 'comment_lower' in df_pandas.columns:
+            texts = df_pandas['comment_lower'].fillna("").astype(str)
+        elif 'comment' in df_pandas.columns:
+            texts = df_pandas['comment'].fillna("").astype(str).str.lower()
+        else:
+            return
+        timestamps = df_pandas['timestamp'].tolist() if 'timestamp' in df_pandas.columns else None
+        self.update(texts.tolist(), timestamps)
+
+    def trending(self, growth_threshold: Optional[float] = None, min_count: Optional[int] = None,
+                 top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        growth_threshold = growth_threshold or self.config["growth_threshold"]
+        min_count = self.config["min_count"] if min_count is None else min_count
+        top_n = top_n or self.config["top_n"]
+
+        if len(self.buckets) < 2:
+            return []
+
+        keys = list(self.buckets)
+        current_key = keys[-1]
+        current = self.buckets[current_key]
+        baseline = [self.buckets[k] for k in keys[-1 - self.config["baseline_buckets"]:-1]]
+        baseline_docs = sum(b.docs for b in baseline)
+        if current.docs == 0 or baseline_docs == 0:
+            return []
+
+        candidates = [c for c in current.heavy_hitters.top() if c["count"] >= min_count]
+        if not candidates:
+            return []
+
+        phrases = [c["item"] for c in candidates]
+        # Both structures overestimate, the smaller of the two is the tighter bound
+        current_counts = np.minimum(current.sketch.estimate_many(phrases),
+                                    [c["count"] for c in candidates])
+        baseline_counts = np.sum([b.sketch.estimate_many(phrases) for b in baseline], axis=0)
+
+        current_rate = current_counts / current.docs
+        # One pseudo-document keeps phrases that are new this bucket from dividing by zero
+        baseline_rate = (baseline_counts + 1) / (baseline_docs + 1)
+        growth = current_rate / baseline_rate
+
+        order = np.argsort(-growth, kind="stable")
+        return [
+            {
+                "phrase": phrases[i],
+                "count": int(current_counts[i]),
+                "current_rate": float(current_rate[i]),
+                "baseline_rate": float(baseline_counts[i] / baseline_docs),
+                "growth": float(growth[i]),
+                "bucket": current_key.isoformat()
+            }
+            for i in order[:top_n] if growth[i] >= growth_threshold and current_counts[i] >= min_count
+        ]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "buckets": len(self.buckets),
+            "docs": sum(b.docs for b in self.buckets.values()),
+            "sketch_bytes": sum(b.sketch.nbytes for b in self.buckets.values()),
+            "tracked_phrases": sum(len(b.heavy_hitters) for b in self.buckets.values())
+        }
@@ -0,0 +1,30 @@
+import os
+import sys
+import tempfile
+import importlib.util
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Settings create their directories at import time, keep them out of the working tree
+_data_dir = tempfile.mkdtemp(prefix="tests_data_")
+os.environ.setdefault("DATA_DIR", _data_dir)
+os.environ.setdefault("MODEL_DIR", os.path.join(_data_dir, "model_artifacts"))
+sys.path.insert(0, str(ROOT))
+
+def load_script(name):
+    spec = importlib.util.spec_from_file_location(f"scripts_{name}", ROOT / "scripts" / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def bus():
+    from src.agents.message_bus import MessageBus
+
+    MessageBus._instance = None
+    message_bus = MessageBus()
+    yield message_bus
+    message_bus.stop()
+    MessageBus._instance = None
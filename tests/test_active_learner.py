@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from src.models.active_learner import (ActiveLearner, StreamingUncertaintySampler, UNCERTAINTY_STRATEGIES,
+                                       top_k_indices)
+
+STRATEGIES = list(UNCERTAINTY_STRATEGIES)
+
+def random_batch(n, seed=0, n_classes=3):
+    rng = np.random.RandomState(seed)
+    # Coarse probabilities produce many exact score ties
+    raw = rng.randint(1, 5, size=(n, n_classes)).astype(float)
+    probabilities = raw / raw.sum(axis=1, keepdims=True)
+    texts = [f"text {i}" for i in range(n)]
+    predictions = [f"label_{p}" for p in probabilities.argmax(axis=1)]
+    return texts, predictions, probabilities
+
+def reference_indices(scores, top_k, threshold=None):
+    # Full stable sort: highest score first, earliest row first among ties
+    order = sorted(range(len(scores)), key=lambda i: (-scores[i], i))
+    if threshold is not None:
+        order = [i for i in order if scores[i] >= threshold]
+    return order[:top_k]
+
+def chunks(texts, predictions, probabilities, sizes):
+    start = 0
+    for size in sizes:
+        yield texts[start:start + size], predictions[start:start + size], probabilities[start:start + size]
+        start += size
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_in_memory_selection_matches_full_sort(strategy):
+    texts, predictions, probabilities = random_batch(500)
+    learner = ActiveLearner(uncertainty_threshold=0.4)
+    select = {"least_confidence": lambda: learner.identify_uncertain_samples(texts, predictions, probabilities, 25),
+              "margin": lambda: learner.margin_sampling(probabilities, texts, predictions, 25),
+              "entropy": lambda: learner.entropy_sampling(probabilities, texts, predictions, 25)}[strategy]
+
+    scores = UNCERTAINTY_STRATEGIES[strategy](probabilities)
+    threshold = 0.4 if strategy == "least_confidence" else None
+
+    assert [s.index for s in select()] == reference_indices(scores, 25, threshold)
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+@pytest.mark.parametrize("sizes", [[500], [1] * 500, [7, 93, 200, 1, 199], [250, 250]])
+def test_streaming_matches_in_memory(strategy, sizes):
+    texts, predictions, probabilities = random_batch(500, seed=1)
+    learner = ActiveLearner(uncertainty_threshold=0.4)
+
+    streamed = learner.stream_uncertain_samples(chunks(texts, predictions, probabilities, sizes),
+                                                strategy=strategy, top_k=25)
+
+    threshold = 0.4 if strategy == "least_confidence" else None
+    in_memory = learner._select(probabilities, texts, predictions, strategy, 25, threshold)
+    assert [(s.index, s.text, s.uncertainty_score) for s in streamed] == \
+           [(s.index, s.text, s.uncertainty_score) for s in in_memory]
+    assert streamed[0].confidence_scores == in_memory[0].confidence_scores
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_ties_resolve_to_earliest_rows(strategy):
+    probabilities = np.array([[0.9, 0.1], [0.5, 0.5], [0.8, 0.2], [0.5, 0.5], [0.5, 0.5]])
+    texts = [f"text {i}" for i in range(5)]
+    predictions = ["a"] * 5
+
+    sampler = StreamingUncertaintySampler(strategy=strategy, top_k=2)
+    sampler.update(texts[:2], predictions[:2], probabilities[:2])
+    sampler.update(texts[2:], predictions[2:], probabilities[2:])
+
+    scores = UNCERTAINTY_STRATEGIES[strategy](probabilities)
+    assert list(top_k_indices(scores, 2)) == [1, 3]
+    assert [s.index for s in sampler.result()] == [1, 3]
+
+def test_top_k_indices_edge_cases():
+    scores = np.array([0.1, 0.3, 0.3, 0.2])
+
+    assert list(top_k_indices(scores, 0)) == []
+    assert list(top_k_indices(scores, 10)) == [1, 2, 3, 0]
+    assert list(top_k_indices(scores, 2, candidates=np.array([0, 2, 3]))) == [2, 3]
+    with pytest.raises(ValueError):
+        StreamingUncertaintySampler(strategy="random")
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.models.sentiment.classifier import SentimentClassifier
+
+CORPUS = {
+    "Positive": ["app chay nhanh", "nhan vien nhiet tinh", "giao dien dep", "rat hai long"],
+    "Negative": ["phi qua cao", "loi dang nhap", "chuyen tien bi loi", "app cham"],
+    "Neutral": ["hoi ve phi", "cach dang ky the", "gio lam viec", "dia chi chi nhanh"]
+}
+
+def labeled_frame(corpus=CORPUS, repeats=5):
+    rows = [(f"{text} {i % 3}", label) for i in range(repeats) for label, texts in corpus.items() for text in texts]
+    return pd.DataFrame(rows, columns=["comment_lower", "sentiment_label"])
+
+@pytest.fixture
+def trainer(tmp_path, monkeypatch, bus):
+    import src.models.trainer as trainer_module
+    import src.models.auto_trainer as auto_trainer_module
+
+    monkeypatch.setattr(trainer_module, "SENTIMENT_MODEL_DIR", tmp_path)
+    monkeypatch.setattr(auto_trainer_module, "SENTIMENT_MODEL_DIR", tmp_path)
+    return auto_trainer_module.AutoTrainer()
+
+def test_warm_fit_keeps_vocabulary_and_starts_from_previous_coefficients():
+    df = labeled_frame()
+    texts, labels = df["comment_lower"].tolist(), df["sentiment_label"].tolist()
+    previous = SentimentClassifier().fit(texts, labels)
+
+    warm = SentimentClassifier().warm_fit(texts, labels, previous)
+
+    assert warm.vectorizer is previous.vectorizer
+    assert np.max(warm.classifier.n_iter_) < np.max(previous.classifier.n_iter_)
+    assert np.allclose(warm.classifier.coef_, previous.classifier.coef_, atol=1e-2)
+
+def test_retrain_warm_starts_from_saved_model(trainer, tmp_path):
+    trainer.train_sentiment_auto(labeled_frame(), model_name="sentiment_auto")
+    vocabulary = SentimentClassifier.load(tmp_path / "sentiment_auto").vectorizer.vocabulary_
+
+    metrics = trainer.train_sentiment_auto(labeled_frame(repeats=6), model_name="sentiment_auto", warm_start=True)
+
+    assert (metrics["fit_mode"], metrics["fit_reason"]) == ("warm_start", "low_drift")
+    assert SentimentClassifier.load(tmp_path / "sentiment_auto").vectorizer.vocabulary_ == vocabulary
+
+def test_label_set_change_forces_full_refit(trainer):
+    trainer.train_sentiment_auto(labeled_frame(), model_name="sentiment_auto")
+    corpus = {**CORPUS, "Mixed": ["app dep nhung phi cao", "nhanh nhung hay loi"]}
+
+    metrics = trainer.train_sentiment_auto(labeled_frame(corpus), model_name="sentiment_auto", warm_start=True)
+
+    assert (metrics["fit_mode"], metrics["fit_reason"]) == ("full_refit", "label_set_changed")
+
+def test_vocabulary_drift_forces_full_refit(trainer):
+    trainer.train_sentiment_auto(labeled_frame(), model_name="sentiment_auto")
+    corpus = {label: [f"{text} tu moi xuat hien" for text in texts] for label, texts in CORPUS.items()}
+
+    metrics = trainer.train_sentiment_auto(labeled_frame(corpus), model_name="sentiment_auto", warm_start=True)
+
+    assert trainer.warm_start_max_oov_ratio < 0.5
+    assert (metrics["fit_mode"], metrics["fit_reason"]) == ("full_refit", "vocabulary_drift")
+
+def test_missing_previous_model_falls_back_to_full_refit(trainer):
+    metrics = trainer.train_sentiment_auto(labeled_frame(), model_name="sentiment_auto", warm_start=True)
+
+    assert (metrics["fit_mode"], metrics["fit_reason"]) == ("full_refit", "no_previous_model")
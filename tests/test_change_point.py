@@ -0,0 +1,79 @@
+import random
+import pandas as pd
+import pytest
+from src.utils.change_point import ChangePointDetector, ALL, UNKNOWN
+
+def feed(detector, negative_ratio, n, topic="Fees", source="app", seed=0):
+    rng = random.Random(seed)
+    alerts = []
+    for _ in range(n):
+        label = "Negative" if rng.random() < negative_ratio else "Positive"
+        alerts.extend(detector.update(label, topic, source))
+    return alerts
+
+def test_rejects_alpha_outside_unit_interval():
+    with pytest.raises(ValueError):
+        ChangePointDetector(alpha=1.0)
+
+def test_stable_stream_raises_no_alarm():
+    detector = ChangePointDetector()
+
+    assert feed(detector, 0.1, 2000) == []
+    assert detector.get_statistics()["total_alarms"] == 0
+
+def test_spike_alarms_on_segment_and_marginals():
+    detector = ChangePointDetector()
+    feed(detector, 0.1, 500)
+
+    alerts = feed(detector, 0.6, 200, seed=1)
+
+    segments = {(a["topic"], a["source"]) for a in alerts}
+    assert ("Fees", "app") in segments
+    assert ("Fees", ALL) in segments and (ALL, "app") in segments
+    assert all(a["type"] == "segment_negative_spike" and a["delta"] > 0 for a in alerts)
+
+def test_reference_does_not_absorb_spike():
+    detector = ChangePointDetector()
+    feed(detector, 0.1, 500)
+    alerts = feed(detector, 0.6, 200, seed=1)
+
+    first = next(a for a in alerts if (a["topic"], a["source"]) == ("Fees", "app"))
+    assert first["reference_ratio"] < 0.2 < first["negative_ratio"]
+
+def test_spike_in_one_segment_leaves_others_quiet():
+    detector = ChangePointDetector(include_marginals=False)
+    feed(detector, 0.1, 500, topic="Fees")
+    feed(detector, 0.1, 500, topic="Login")
+
+    alerts = feed(detector, 0.6, 200, topic="Fees", seed=1) + feed(detector, 0.1, 200, topic="Login", seed=2)
+
+    assert {a["topic"] for a in alerts} == {"Fees"}
+
+def test_missing_keys_map_to_unknown():
+    detector = ChangePointDetector(include_marginals=False)
+    detector.update("Negative", None, float("nan"))
+
+    assert detector.get_segment(UNKNOWN, UNKNOWN)["n"] == 1
+
+def test_segment_table_is_bounded_lru():
+    detector = ChangePointDetector(include_marginals=False, max_segments=3)
+    for topic in ["a", "b", "c"]:
+        detector.update("Positive", topic, "app")
+    detector.update("Positive", "a", "app")
+    detector.update("Positive", "d", "app")
+
+    assert detector.get_segment("b", "app") is None
+    assert detector.get_segment("a", "app") is not None
+    assert detector.get_statistics()["segments"] == 3
+
+def test_dataframe_and_records_match_single_updates():
+    rng = random.Random(3)
+    rows = [{"sentiment_label": "Negative" if rng.random() < (0.1 if i < 400 else 0.7) else "Positive",
+             "topic_label": "Fees", "source": "app"} for i in range(600)]
+
+    from_records = ChangePointDetector().update_many(rows)
+    from_frame = ChangePointDetector().update_dataframe(pd.DataFrame(rows))
+
+    assert from_records
+    assert [(a["topic"], a["source"], a["observations"]) for a in from_records] == \
+           [(a["topic"], a["source"], a["observations"]) for a in from_frame]
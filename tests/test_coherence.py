@@ -0,0 +1,80 @@
+import math
+from itertools import combinations
+import numpy as np
+import pytest
+from src.models.topic.auto_topic import AutoTopicModel
+from src.models.topic.coherence import top_term_indices, topic_coherence
+
+VOCABULARIES = [
+    ["phi", "chuyen", "tien", "cao", "thuong", "nien"],
+    ["dang", "nhap", "app", "loi", "that", "bai"],
+    ["nhan", "vien", "ho", "tro", "nhiet", "tinh"]
+]
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = np.random.RandomState(0)
+    texts = [" ".join(rng.choice(vocabulary, size=3, replace=False))
+             for _ in range(15) for vocabulary in VOCABULARIES]
+    # A few documents mixing topics so co-occurrence counts are not all-or-nothing
+    texts += ["phi app cao", "nhan vien loi", "tien ho tro"]
+    return texts
+
+@pytest.fixture(scope="module")
+def model(corpus):
+    return AutoTopicModel(n_clusters=3).fit(corpus)
+
+def brute_force(model, texts, measure, top_n):
+    vocabulary = model.vectorizer.vocabulary_
+    analyzer = model.vectorizer.build_analyzer()
+    docs = [set(analyzer(text)) & set(vocabulary) for text in texts]
+    feature_names = model.vectorizer.get_feature_names_out()
+    n_docs = len(docs)
+
+    def df(*terms):
+        return sum(1 for doc in docs if all(term in doc for term in terms))
+
+    scores = []
+    for topic in top_term_indices(model, top_n):
+        terms = [feature_names[i] for i in topic]
+        pairs = []
+        for j, i in combinations(range(len(terms)), 2):
+            # i is ranked below j, UMass conditions on the higher-ranked term
+            w_i, w_j = terms[i], terms[j]
+            joint = df(w_i, w_j)
+            if measure == "umass":
+                pairs.append(math.log((joint + 1) / df(w_j)) if df(w_j) else 0.0)
+            elif joint == 0:
+                pairs.append(-1.0)
+            else:
+                p_ij = joint / n_docs
+                if p_ij == 1:
+                    pairs.append(0.0)
+                else:
+                    pmi = math.log(p_ij / (df(w_i) / n_docs * df(w_j) / n_docs))
+                    pairs.append(pmi / -math.log(p_ij))
+        scores.append(sum(pairs) / len(pairs))
+    return scores
+
+def test_top_terms_are_ordered_by_center_weight(model):
+    centers = model.kmeans.cluster_centers_
+    for cid, topic in enumerate(top_term_indices(model, 5)):
+        weights = centers[cid, topic]
+        assert np.all(np.diff(weights) <= 0)
+        assert weights[-1] >= np.sort(centers[cid])[-5]
+
+@pytest.mark.parametrize("measure", ["npmi", "umass"])
+def test_matches_brute_force(model, corpus, measure):
+    result = topic_coherence(model, corpus, measure=measure, top_n=5, sample_size=len(corpus))
+
+    expected = brute_force(model, corpus, measure, top_n=5)
+    assert [topic["score"] for topic in result["per_topic"]] == pytest.approx(expected)
+    assert result["mean"] == pytest.approx(np.mean(expected))
+    assert result["n_docs"] == len(corpus)
+
+def test_npmi_is_bounded_and_unknown_measure_fails(model, corpus):
+    result = topic_coherence(model, corpus, measure="npmi", top_n=5, sample_size=len(corpus))
+
+    assert all(-1.0 <= topic["score"] <= 1.0 for topic in result["per_topic"])
+    with pytest.raises(ValueError):
+        topic_coherence(model, corpus, measure="cv")
@@ -0,0 +1,54 @@
+import pytest
+from src.models.dataset_store import DatasetStore, FINGERPRINT_FILE, dataset_hash
+from src.models.topic.auto_topic import AutoTopicModel
+
+TEXTS = [f"card declined at store {i}" for i in range(15)] + [f"loan rate too high {i}" for i in range(15)]
+OTHER_TEXTS = [f"app crashes on login {i}" for i in range(15)] + [f"hidden fees again {i}" for i in range(15)]
+
+@pytest.fixture
+def store(tmp_path):
+    return DatasetStore(tmp_path / "store.db")
+
+def prepare(store, tmp_path, texts, config=None):
+    return store.prepare("topic_auto", "topic_auto", texts, None, config or {"k": 2}, tmp_path / "topic_auto")
+
+def test_dataset_hash_ignores_row_order():
+    assert dataset_hash(["a", "b"], ["x", "y"]) == dataset_hash(["b", "a"], ["y", "x"])
+    assert dataset_hash(["a", "b"], ["x", "y"]) != dataset_hash(["a", "b"], ["y", "x"])
+
+def test_append_counts_only_new_rows(store):
+    first = store.append("sentiment", ["a", "b"], ["pos", "neg"])
+    second = store.append("sentiment", ["b", "c"], ["neg", "pos"])
+    again = store.append("sentiment", ["c"], ["pos"])
+
+    assert (first.n_new_rows, second.n_new_rows, second.n_rows) == (2, 1, 3)
+    assert again.dataset_hash == second.dataset_hash
+
+def test_recorded_training_is_found(store, tmp_path):
+    pending = prepare(store, tmp_path, TEXTS)
+    AutoTopicModel(n_clusters=2).fit(TEXTS).save(pending.artifact_path)
+    store.record_training(pending, {"n_clusters": 2})
+
+    reused = store.find_training(prepare(store, tmp_path, list(reversed(TEXTS))))
+
+    assert reused is not None and reused.metrics == {"n_clusters": 2}
+
+@pytest.mark.parametrize("change", ["data", "config"])
+def test_changed_inputs_are_not_reused(store, tmp_path, change):
+    pending = prepare(store, tmp_path, TEXTS)
+    store.record_training(pending, {})
+
+    texts, config = (OTHER_TEXTS, None) if change == "data" else (TEXTS, {"k": 3})
+
+    assert store.find_training(prepare(store, tmp_path, texts, config)) is None
+
+def test_unfingerprinted_save_invalidates_marker(store, tmp_path):
+    pending = prepare(store, tmp_path, TEXTS)
+    AutoTopicModel(n_clusters=2).fit(TEXTS).save(pending.artifact_path)
+    store.record_training(pending, {})
+
+    # A save outside skip_if_unchanged overwrites the artifact with a model trained on other data
+    AutoTopicModel(n_clusters=2).fit(OTHER_TEXTS).save(pending.artifact_path)
+
+    assert not (tmp_path / "topic_auto" / FINGERPRINT_FILE).exists()
+    assert store.find_training(prepare(store, tmp_path, TEXTS)) is None
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from src.utils.drift import (align_distributions, total_variation, jensen_shannon, psi, compute_drift,
+                             RollingHistogram, DriftEngine)
+
+BASELINE = {"Positive": 60, "Neutral": 30, "Negative": 10}
+
+def test_align_normalizes_over_union_of_keys():
+    keys, p, q = align_distributions({"a": 2, "b": 2}, {"b": 1, "c": 3})
+
+    assert keys == ["a", "b", "c"]
+    assert p.tolist() == [0.5, 0.5, 0.0]
+    assert q.tolist() == [0.0, 0.25, 0.75]
+
+@pytest.mark.parametrize("metric", [total_variation, jensen_shannon, psi])
+def test_identical_distributions_have_zero_drift(metric):
+    p = np.array([0.6, 0.3, 0.1])
+
+    assert metric(p, p) == pytest.approx(0.0, abs=1e-9)
+
+def test_disjoint_distributions_reach_upper_bounds():
+    p, q = np.array([1.0, 0.0]), np.array([0.0, 1.0])
+
+    assert total_variation(p, q) == pytest.approx(1.0)
+    assert jensen_shannon(p, q) == pytest.approx(1.0)
+
+def test_compute_drift_reports_category_changes():
+    result = compute_drift(BASELINE, {"Positive": 20, "Negative": 70, "Mixed": 10}, metric="total_variation")
+
+    assert result["is_drift"]
+    assert result["new_categories"] == ["Mixed"]
+    assert result["missing_categories"] == ["Neutral"]
+
+def test_compute_drift_empty_side_and_unknown_metric():
+    assert compute_drift(BASELINE, {})["score"] == 0.0
+    with pytest.raises(ValueError):
+        compute_drift(BASELINE, BASELINE, metric="kl")
+
+def test_rolling_histogram_evicts_oldest():
+    histogram = RollingHistogram(window_size=3)
+    for value in ["a", "a", "b", "c"]:
+        histogram.add(value)
+
+    assert len(histogram) == 3
+    assert histogram.distribution() == {"a": 1, "b": 1, "c": 1}
+
+def test_engine_waits_for_min_observations_then_detects_shift():
+    engine = DriftEngine(features=("sentiment_label",), window_size=100, metric="total_variation",
+                         threshold=0.2, min_observations=50)
+    engine.set_baseline("sentiment_label", BASELINE)
+
+    engine.update_many({"sentiment_label": "Negative"} for _ in range(40))
+    assert engine.check() == []
+
+    engine.update_many({"sentiment_label": "Negative"} for _ in range(20))
+    [result] = engine.check()
+    assert result["feature"] == "sentiment_label" and result["is_drift"]
+    assert result["window_count"] == 60
+
+def test_engine_window_recovers_after_shift_passes():
+    engine = DriftEngine(features=("sentiment_label",), window_size=100, metric="total_variation",
+                         threshold=0.2, min_observations=50)
+    engine.set_baseline("sentiment_label", BASELINE)
+    engine.update_many({"sentiment_label": "Negative"} for _ in range(100))
+
+    for label, count in BASELINE.items():
+        engine.update_many({"sentiment_label": label} for _ in range(count))
+
+    assert engine.current_distribution("sentiment_label") == BASELINE
+    assert not engine.check()[0]["is_drift"]
+
+def test_engine_skips_features_without_baseline_or_value():
+    engine = DriftEngine(min_observations=1)
+    engine.set_baseline("sentiment_label", BASELINE)
+    engine.update({"sentiment_label": "Positive"})
+
+    assert [r["feature"] for r in engine.check()] == ["sentiment_label"]
+    assert engine.window_count("topic_label") == 0
+    with pytest.raises(ValueError):
+        DriftEngine(metric="kl")
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from src.models.evaluation import cross_validate_text_classifier, merge_cv_metrics, CV_METRICS
+from src.utils.metrics import calculate_classification_metrics
+
+POSITIVE = ["app chay nhanh", "nhan vien nhiet tinh", "giao dien dep", "chuyen tien nhanh", "rat hai long"]
+NEGATIVE = ["phi qua cao", "loi dang nhap", "chuyen tien bi loi", "app cham", "khong hai long"]
+
+@pytest.fixture
+def corpus():
+    texts = [f"{text} {i}" for i in range(4) for text in POSITIVE + NEGATIVE]
+    labels = (["Positive"] * 5 + ["Negative"] * 5) * 4
+    return texts, labels
+
+def run_cv(texts, labels, tmp_path, **kwargs):
+    return cross_validate_text_classifier(texts, labels, n_jobs=1, cache_dir=tmp_path / "cv_cache", **kwargs)
+
+def test_reports_per_fold_timings_and_sizes(corpus, tmp_path):
+    texts, labels = corpus
+
+    results = run_cv(texts, labels, tmp_path, n_splits=4)
+
+    assert results["n_splits"] == 4 and len(results["folds"]) == 4
+    assert sum(fold["n_test"] for fold in results["folds"]) == len(texts)
+    for fold in results["folds"]:
+        assert fold["n_train"] + fold["n_test"] == len(texts)
+        assert 0 <= fold["vectorize_seconds"] <= fold["total_seconds"]
+        assert fold["candidates"]["logistic_regression"]["fit_seconds"] >= 0
+    assert results["wall_seconds"] >= 0
+
+def test_folds_shrink_to_smallest_class(corpus, tmp_path):
+    texts, labels = corpus
+    texts, labels = texts + ["phi an", "phi an them"], labels + ["Neutral", "Neutral"]
+
+    results = run_cv(texts, labels, tmp_path, n_splits=5)
+
+    assert results["n_splits"] == 2
+    assert all(fold["n_test"] in (len(texts) // 2, len(texts) - len(texts) // 2) for fold in results["folds"])
+
+def test_skips_when_a_class_has_one_sample(corpus, tmp_path):
+    texts, labels = corpus
+
+    assert run_cv(texts + ["phi an"], labels + ["Neutral"], tmp_path, n_splits=5) is None
+
+def test_compares_candidates_and_picks_best(corpus, tmp_path):
+    texts, labels = corpus
+    candidates = {"strong": LogisticRegression(C=10.0, max_iter=200),
+                  "weak": LogisticRegression(C=1e-6, max_iter=200)}
+
+    results = run_cv(texts, labels, tmp_path, n_splits=2, candidates=candidates)
+
+    assert set(results["candidates"]) == {"strong", "weak"}
+    assert results["best_candidate"] == "strong"
+
+def test_fold_features_are_cached_across_calls(corpus, tmp_path):
+    texts, labels = corpus
+    first = run_cv(texts, labels, tmp_path, n_splits=2)
+
+    assert any((tmp_path / "cv_cache").rglob("output.pkl"))
+    second = run_cv(texts, labels, tmp_path, n_splits=2)
+    assert second["candidates"] == first["candidates"]
+
+def test_merge_cv_metrics_keeps_train_metrics_alongside_cv(corpus, tmp_path):
+    texts, labels = corpus
+    results = run_cv(texts, labels, tmp_path, n_splits=2)
+    train_metrics = calculate_classification_metrics(labels, labels)
+
+    metrics = merge_cv_metrics(train_metrics, results, "logistic_regression")
+
+    for metric in CV_METRICS:
+        assert metrics[f"train_{metric}"] == train_metrics[metric]
+        assert metrics[metric] == results["candidates"]["logistic_regression"][metric]
+        assert f"{metric}_std" in metrics
+    assert metrics["cv"] is results
+    assert train_metrics["accuracy"] == 1.0
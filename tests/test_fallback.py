@@ -0,0 +1,65 @@
+import random
+import pytest
+from src.models.sentiment.fallback import (
+    NEGATIVE_WORDS, VERY_NEGATIVE_WORDS, POSITIVE_WORDS, VERY_POSITIVE_WORDS, MIXED_INDICATORS,
+    LABEL_SCORES, rule_based_sentiment, fallback_predict
+)
+
+def reference_sentiment(text):
+    # Substring-scan scorer the bitmask matcher replaced
+    if not text:
+        return "Neutral", 0
+
+    text_lower = text.lower()
+    very_neg_count = sum(1 for word in VERY_NEGATIVE_WORDS if word in text_lower)
+    neg_count = sum(1 for word in NEGATIVE_WORDS if word in text_lower)
+    pos_count = sum(1 for word in POSITIVE_WORDS if word in text_lower)
+    very_pos_count = sum(1 for word in VERY_POSITIVE_WORDS if word in text_lower)
+    has_mixed = any(indicator in text_lower for indicator in MIXED_INDICATORS)
+
+    if has_mixed and (neg_count > 0 or very_neg_count > 0) and (pos_count > 0 or very_pos_count > 0):
+        return "Mixed", 0
+
+    total_neg = very_neg_count * 2 + neg_count
+    total_pos = very_pos_count * 2 + pos_count
+
+    if very_neg_count > 0 or total_neg >= 3:
+        return "Very Negative", -2
+    elif total_neg > total_pos:
+        return "Negative", -1
+    elif very_pos_count > 0 or total_pos >= 3:
+        return "Very Positive", 2
+    elif total_pos > total_neg:
+        return "Positive", 1
+    else:
+        return "Neutral", 0
+
+VOCABULARY = sorted(NEGATIVE_WORDS | VERY_NEGATIVE_WORDS | POSITIVE_WORDS | VERY_POSITIVE_WORDS) + \
+    MIXED_INDICATORS + ["app", "ngân hàng", "chuyển", "tiền", "rất", "quá", "nhất", "1", "số"]
+
+def random_text(rng):
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(0, 8))]
+    # Gluing some words without a space exercises matches that span or share prefixes
+    separators = [rng.choice([" ", " ", "", ", "]) for _ in words]
+    text = "".join(w + s for w, s in zip(words, separators))
+    return text.upper() if rng.random() < 0.1 else text
+
+def test_matches_reference_scorer_on_random_texts():
+    rng = random.Random(0)
+    texts = [random_text(rng) for _ in range(20000)]
+
+    mismatches = [t for t in texts if rule_based_sentiment(t) != reference_sentiment(t)]
+
+    assert mismatches == []
+
+@pytest.mark.parametrize("text", ["", "rất tốt", "tốt nhưng lỗi", "tệ hại quá tệ", "không thể", "số 1", "OK"])
+def test_matches_reference_scorer_on_overlapping_entries(text):
+    assert rule_based_sentiment(text) == reference_sentiment(text)
+
+def test_fallback_predict_labels_and_scores():
+    texts = ["rất tốt", "lỗi", "rất tốt", ""]
+
+    labels, scores = fallback_predict(texts)
+
+    assert list(labels) == [reference_sentiment(t)[0] for t in texts]
+    assert list(scores) == [LABEL_SCORES[label] for label in labels]
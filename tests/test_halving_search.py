@@ -0,0 +1,70 @@
+import json
+import tempfile
+from argparse import Namespace
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import load_script
+
+CORPUS = {
+    "Positive": ["app chay nhanh", "nhan vien nhiet tinh", "giao dien dep", "rat hai long"],
+    "Negative": ["phi qua cao", "loi dang nhap", "chuyen tien bi loi", "app cham"],
+    "Neutral": ["hoi ve phi", "cach dang ky the", "gio lam viec", "dia chi chi nhanh"]
+}
+
+@pytest.fixture(scope="module")
+def script():
+    return load_script("train_sentiment_model")
+
+@pytest.fixture
+def dataset():
+    rng = np.random.RandomState(0)
+    rows = [(f"{text} {rng.randint(100)}", label) for _ in range(5) for label, texts in CORPUS.items() for text in texts]
+    frame = pd.DataFrame(rows, columns=["text", "label"])
+    return frame["text"], frame["label"]
+
+def search_args(cache_dir=None):
+    return Namespace(cache_dir=cache_dir, max_features=500, use_smote=False, n_jobs=1)
+
+def test_param_grid_only_filters_terms_on_larger_datasets(script):
+    small = script.halving_search_param_grid(50)
+    large = script.halving_search_param_grid(1000)
+
+    assert all(grid["tfidf__min_df"] == [1] for grid in small)
+    assert all(grid["tfidf__min_df"] == [1, 2] and grid["tfidf__max_df"] == [0.8, 1.0] for grid in large)
+
+def test_search_without_cache_dir_removes_its_temp_cache(script, dataset, tmp_path, monkeypatch):
+    created = []
+
+    class RecordingTemporaryDirectory(tempfile.TemporaryDirectory):
+        def __enter__(self):
+            created.append(self.name)
+            return super().__enter__()
+
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.setattr(tempfile, "TemporaryDirectory", RecordingTemporaryDirectory)
+    X, y = dataset
+
+    best_pipeline, best_model_name, report = script.halving_search(X, y, search_args())
+
+    assert len(created) == 1 and created[0].startswith(str(tmp_path))
+    assert list(tmp_path.glob("sentiment_search_*")) == []
+    assert best_pipeline.memory is None and report["cache_dir"] is None
+    assert best_model_name in script.MODEL_NAMES.values()
+    assert len(best_pipeline.predict(list(X[:3]))) == 3
+
+    script.save_search_report(report, tmp_path / "out")
+    with open(tmp_path / "out" / "search_report.json", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["search"] == "halving" and saved["iterations"]
+    assert saved["best_score"] == pytest.approx(report["best_score"])
+    assert (tmp_path / "out" / "search_report.csv").exists()
+
+def test_search_with_cache_dir_keeps_cache(script, dataset, tmp_path):
+    X, y = dataset
+    cache_dir = tmp_path / "search_cache"
+
+    best_pipeline, _, report = script.halving_search(X, y, search_args(str(cache_dir)))
+
+    assert report["cache_dir"] == str(cache_dir)
+    assert any(cache_dir.rglob("*.pkl"))
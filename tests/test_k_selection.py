@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from src.models.topic.auto_topic import AutoTopicModel
+from src.models.topic.k_selection import (sample_indices, score_clustering, search_n_clusters,
+                                          select_n_clusters, evaluate_topic_model)
+
+VOCABULARIES = [
+    ["phi", "chuyen", "tien", "cao", "thuong", "nien"],
+    ["dang", "nhap", "app", "loi", "that", "bai"],
+    ["nhan", "vien", "ho", "tro", "nhiet", "tinh"]
+]
+
+@pytest.fixture
+def texts():
+    rng = np.random.RandomState(0)
+    return [" ".join(rng.choice(vocabulary, size=4, replace=False))
+            for _ in range(20) for vocabulary in VOCABULARIES]
+
+def test_sample_indices_is_sorted_deterministic_subset():
+    first = sample_indices(1000, sample_size=100, random_state=1)
+
+    assert len(first) == 100 and np.all(np.diff(first) > 0)
+    assert np.array_equal(first, sample_indices(1000, sample_size=100, random_state=1))
+    assert np.array_equal(sample_indices(50, sample_size=100), np.arange(50))
+
+def test_score_clustering_degenerate_labels_and_unknown_metric():
+    X = np.random.RandomState(0).rand(10, 3)
+
+    assert score_clustering(X, [0] * 10, np.arange(10)) == 0.0
+    with pytest.raises(ValueError):
+        score_clustering(X, [0, 1] * 5, np.arange(10), metric="dunn")
+
+def test_search_finds_planted_clusters(texts):
+    k_selection, vectorizer, kmeans = search_n_clusters(texts, k_min=2, k_max=6, n_jobs=1)
+
+    assert k_selection["best_k"] == 3
+    assert [point["k"] for point in k_selection["curve"]] == [2, 3, 4, 5, 6]
+    assert kmeans.n_clusters == 3
+    selected = select_n_clusters(texts, k_min=2, k_max=6, n_jobs=1)
+    assert (selected["best_k"], selected["best_score"]) == (k_selection["best_k"], k_selection["best_score"])
+
+def test_search_caps_k_by_sample_count():
+    with pytest.raises(ValueError):
+        search_n_clusters(["a b", "c d"], k_min=2, k_max=5, n_jobs=1)
+
+def test_model_from_search_fit_scores_like_search(texts):
+    k_selection, vectorizer, kmeans = search_n_clusters(texts, k_min=2, k_max=6, n_jobs=1)
+
+    model = AutoTopicModel.from_fitted(vectorizer, kmeans)
+    labels, cluster_ids = model.predict(texts)
+
+    assert model.n_clusters == 3 and len(set(labels)) == 3
+    assert np.array_equal(cluster_ids, kmeans.labels_)
+    assert evaluate_topic_model(model, texts) == pytest.approx(k_selection["best_score"])
@@ -0,0 +1,123 @@
+import threading
+import time
+from src.agents.message_bus import Message, MessagePriority
+
+def publish(bus, topic, **payload):
+    bus.publish(Message(sender="test", topic=topic, payload=payload))
+
+def test_synchronous_delivery_when_not_started(bus):
+    received = []
+    bus.subscribe("a.b", lambda m: received.append(m.payload["i"]))
+
+    publish(bus, "a.b", i=1)
+
+    assert received == [1]
+
+def test_per_topic_fifo_with_worker_pool(bus):
+    received = {"x": [], "y": []}
+
+    def handler(message):
+        # Jitter gives later messages the chance to overtake if ordering were not enforced
+        time.sleep(0.001 * (message.payload["i"] % 3))
+        received[message.topic].append(message.payload["i"])
+
+    bus.subscribe("x", handler)
+    bus.subscribe("y", handler)
+    bus.start(workers=4)
+
+    for i in range(100):
+        publish(bus, "x", i=i)
+        publish(bus, "y", i=i)
+
+    assert bus.wait_idle(timeout=10)
+    assert received["x"] == list(range(100))
+    assert received["y"] == list(range(100))
+
+def test_topics_are_delivered_in_parallel(bus):
+    release = threading.Event()
+    reached = threading.Event()
+
+    bus.subscribe("slow", lambda m: release.wait(5))
+    bus.subscribe("fast", lambda m: reached.set())
+    bus.start(workers=2)
+
+    publish(bus, "slow")
+    publish(bus, "fast")
+
+    assert reached.wait(2)
+    release.set()
+    assert bus.wait_idle(timeout=5)
+
+def test_priority_ties_keep_publish_order(bus):
+    received = []
+    bus.subscribe("t", lambda m: received.append(m.payload["i"]))
+
+    for i in range(10):
+        bus.publish(Message(sender="test", topic="t", payload={"i": i}, priority=MessagePriority.HIGH))
+
+    assert received == list(range(10))
+
+def test_stop_delivers_pending_messages(bus):
+    received = []
+    bus.subscribe("t", lambda m: received.append(m.payload["i"]))
+    bus.start(workers=2)
+
+    for i in range(50):
+        publish(bus, "t", i=i)
+    bus.stop()
+
+    assert received == list(range(50))
+
+def echo_service(bus, topic, delay=0.0):
+    def handler(message):
+        if message.payload.get("drop"):
+            return
+        time.sleep(delay)
+        bus.respond(message, {"echo": message.payload["i"]})
+    bus.subscribe(topic, handler)
+
+def test_request_routes_response_by_correlation_id(bus):
+    echo_service(bus, "svc.status")
+
+    response = bus.request("ui", "svc", "svc.status", {"i": 7}, timeout=2)
+
+    assert response.payload == {"echo": 7}
+    assert bus._pending_requests == {}
+
+def test_request_times_out(bus):
+    echo_service(bus, "svc.status")
+
+    start = time.monotonic()
+    response = bus.request("ui", "svc", "svc.status", {"i": 1, "drop": True}, timeout=0.2)
+
+    assert response is None
+    assert time.monotonic() - start < 2
+    assert bus._pending_requests == {}
+
+def test_request_many_gathers_in_order_and_concurrently(bus):
+    for name in ("a", "b", "c", "d"):
+        echo_service(bus, f"{name}.status", delay=0.3)
+    bus.start(workers=4)
+
+    requests = [{"recipient": name, "topic": f"{name}.status", "payload": {"i": i}}
+                for i, name in enumerate("abcd")]
+
+    start = time.monotonic()
+    responses = bus.request_many("ui", requests, timeout=5)
+    elapsed = time.monotonic() - start
+
+    assert [r.payload["echo"] for r in responses] == [0, 1, 2, 3]
+    # Four 0.3s handlers on different topics overlap rather than running back to back
+    assert elapsed < 1.0
+
+def test_request_many_returns_none_for_timeouts(bus):
+    echo_service(bus, "svc.status")
+
+    responses = bus.request_many("ui", [
+        {"recipient": "svc", "topic": "svc.status", "payload": {"i": 1}},
+        {"recipient": "svc", "topic": "svc.status", "payload": {"i": 2, "drop": True}}
+    ], timeout=0.2)
+
+    assert responses[0].payload == {"echo": 1}
+    assert responses[1] is None
+    assert bus._pending_requests == {}
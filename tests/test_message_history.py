@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from src.agents.message_bus import Message
+from src.agents.message_history import MessageHistory, estimate_size
+
+def message(topic, **payload):
+    return Message(sender="test", topic=topic, payload=payload)
+
+def test_capacity_evicts_oldest_across_topics():
+    history = MessageHistory(capacity=5)
+    for i in range(8):
+        history.append(message("even" if i % 2 == 0 else "odd", i=i))
+
+    assert [m.payload["i"] for m in history.get()] == [3, 4, 5, 6, 7]
+    assert [m.payload["i"] for m in history.get("even")] == [4, 6]
+    assert history.get_statistics()["evicted"] == 3
+
+def test_get_returns_most_recent_in_order():
+    history = MessageHistory(capacity=100)
+    for i in range(20):
+        history.append(message("t", i=i))
+
+    assert [m.payload["i"] for m in history.get("t", limit=3)] == [17, 18, 19]
+    assert history.get("missing") == []
+
+def test_byte_budget_evicts_oldest():
+    history = MessageHistory(capacity=100, max_bytes=5000, payload_threshold=10**6)
+    for i in range(10):
+        history.append(message("t", blob="x" * 1000, i=i))
+
+    stats = history.get_statistics()
+    assert stats["total_bytes"] <= 5000
+    assert history.get()[-1].payload["i"] == 9
+
+def test_string_frames_are_sized_by_content():
+    df = pd.DataFrame({f"c{i}": ["customer complaint text " * 5] * 2000 for i in range(3)})
+
+    assert estimate_size(df) >= 0.9 * df.memory_usage(deep=True).sum()
+
+def test_large_payload_is_summarized_in_history_only(bus):
+    bus.message_history = MessageHistory(capacity=10, payload_threshold=10000)
+    df = pd.DataFrame({"comment": ["some comment text"] * 5000})
+    received = []
+    bus.subscribe("data.analyzed", lambda m: received.append(m.payload["dataframe"]))
+
+    bus.publish(message("data.analyzed", dataframe=df, predictions=np.zeros(5000), n=1))
+
+    assert received[0] is df
+    stored = bus.get_history("data.analyzed")[0].payload
+    assert stored["dataframe"] == {"type": "DataFrame", "shape": [5000, 1], "columns": ["comment"]}
+    assert stored["predictions"]["shape"] == [5000]
+    assert stored["n"] == 1
+
+def test_spilled_payload_is_reloaded_and_cleaned_up(tmp_path):
+    history = MessageHistory(capacity=1, payload_threshold=1000, spill_dir=tmp_path)
+    history.append(message("t", values=np.arange(1000)))
+
+    stored = history.get()[0]
+    assert np.array_equal(history.load_payload(stored)["values"], np.arange(1000))
+
+    history.append(message("t", i=2))
+    assert list(tmp_path.iterdir()) == []
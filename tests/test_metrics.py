@@ -0,0 +1,86 @@
+import json
+import random
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, classification_report
+from src.utils.metrics import ConfusionMatrixAccumulator, calculate_classification_metrics
+
+LABELS = ["Very Negative", "Negative", "Neutral", "Positive", "Very Positive", "Mixed"]
+
+def reference_metrics(y_true, y_pred, labels=None):
+    # sklearn implementation the accumulator replaced
+    metrics = {
+        "accuracy": accuracy_score(y_true, y_pred),
+        "f1_macro": f1_score(y_true, y_pred, average='macro', zero_division=0),
+        "f1_weighted": f1_score(y_true, y_pred, average='weighted', zero_division=0)
+    }
+    if labels:
+        metrics["per_class"] = classification_report(y_true, y_pred, labels=labels, target_names=labels,
+                                                     output_dict=True, zero_division=0)
+    return metrics
+
+def random_case(rng):
+    classes = rng.sample(LABELS, rng.randint(1, len(LABELS)))
+    n = rng.randint(1, 60)
+    y_true = [rng.choice(classes) for _ in range(n)]
+    # Mostly correct predictions, with some drawn from labels absent in y_true
+    y_pred = [t if rng.random() < 0.6 else rng.choice(LABELS) for t in y_true]
+
+    labels = None
+    if rng.random() < 0.6:
+        observed = sorted(set(y_true) | set(y_pred))
+        labels = rng.choice([observed, rng.sample(observed, rng.randint(1, len(observed))),
+                             observed + [label for label in LABELS if label not in observed]])
+    return y_true, y_pred, labels
+
+def assert_metrics_equal(actual, expected):
+    assert set(actual) == set(expected)
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert_metrics_equal(actual[key], value)
+        else:
+            assert actual[key] == pytest.approx(value, abs=1e-12), key
+
+def test_matches_sklearn_on_random_inputs():
+    rng = random.Random(0)
+    for _ in range(500):
+        y_true, y_pred, labels = random_case(rng)
+        assert_metrics_equal(calculate_classification_metrics(y_true, y_pred, labels),
+                             reference_metrics(y_true, y_pred, labels))
+
+def test_chunked_updates_equal_single_update():
+    rng = random.Random(1)
+    y_true = [rng.choice(LABELS) for _ in range(1000)]
+    y_pred = [rng.choice(LABELS) for _ in range(1000)]
+
+    chunked = ConfusionMatrixAccumulator()
+    for start in range(0, 1000, 137):
+        chunked.update(y_true[start:start + 137], y_pred[start:start + 137])
+
+    assert chunked.compute(LABELS) == calculate_classification_metrics(y_true, y_pred, LABELS)
+
+def test_merge_combines_shards_with_different_labels():
+    left = ConfusionMatrixAccumulator().update(["Positive", "Negative"], ["Positive", "Positive"])
+    right = ConfusionMatrixAccumulator().update(["Mixed", "Negative"], ["Mixed", "Neutral"])
+    whole = ConfusionMatrixAccumulator().update(["Positive", "Negative", "Mixed", "Negative"],
+                                                ["Positive", "Positive", "Mixed", "Neutral"])
+
+    merged = left + right
+
+    assert merged.total == 4
+    assert merged.compute(LABELS) == whole.compute(LABELS)
+    assert left.total == 2 and right.total == 2
+
+def test_dict_round_trip_through_json():
+    accumulator = ConfusionMatrixAccumulator(LABELS).update(["Positive", "Negative"], ["Positive", "Mixed"])
+
+    restored = ConfusionMatrixAccumulator.from_dict(json.loads(json.dumps(accumulator.to_dict())))
+
+    assert restored.labels == accumulator.labels
+    assert np.array_equal(restored.matrix, accumulator.matrix)
+    assert restored.compute(LABELS) == accumulator.compute(LABELS)
+
+def test_empty_and_mismatched_inputs():
+    assert ConfusionMatrixAccumulator().compute() == {"accuracy": 0.0, "f1_macro": 0.0, "f1_weighted": 0.0}
+    with pytest.raises(ValueError):
+        ConfusionMatrixAccumulator().update(["Positive"], [])
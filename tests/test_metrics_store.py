@@ -0,0 +1,95 @@
+import json
+from datetime import datetime, timedelta
+import pandas as pd
+import pytest
+from config.settings import DATA_DIR
+from src.agents.metrics_store import MetricsStore, BASELINE_KIND
+
+NOW = datetime(2024, 6, 10, 12, 30)
+
+def metrics(total, negative_ratio):
+    negative = round(total * negative_ratio)
+    return {"total_count": total, "negative_ratio": negative_ratio,
+            "sentiment_distribution": {"Negative": negative, "Positive": total - negative}}
+
+@pytest.fixture
+def store(tmp_path):
+    return MetricsStore(db_path=str(tmp_path / "metrics.db"))
+
+def test_default_db_lives_under_data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    assert MetricsStore().db_path == DATA_DIR / "metrics_store.db"
+    assert not (tmp_path / "data").exists()
+
+def test_aggregate_window_weights_ratio_by_volume(store):
+    store.record_run(metrics(100, 0.1), timestamp=NOW - timedelta(minutes=30))
+    store.record_run(metrics(300, 0.5), timestamp=NOW - timedelta(minutes=10))
+    store.record_run(metrics(50, 0.9), timestamp=NOW - timedelta(hours=2))
+
+    window = store.aggregate_window(NOW - timedelta(hours=1), NOW)
+
+    assert window["n_runs"] == 2 and window["total_count"] == 400
+    assert window["negative_ratio"] == pytest.approx((10 + 150) / 400)
+    assert window["sentiment_distribution"] == {"Negative": 160, "Positive": 240}
+
+def test_rolling_baseline_reads_same_hour_last_week(store):
+    store.record_run(metrics(100, 0.2), timestamp=NOW - timedelta(days=7, minutes=20))
+    store.record_run(metrics(100, 0.8), timestamp=NOW - timedelta(minutes=20))
+
+    baseline = store.rolling_baseline(now=NOW)
+
+    assert baseline["n_runs"] == 1
+    assert baseline["negative_ratio"] == pytest.approx(0.2)
+
+def test_segments_and_kinds_are_separate(store):
+    store.record_run(metrics(100, 0.2), timestamp=NOW)
+    store.record_run(metrics(10, 0.5), segment="source:app", timestamp=NOW)
+    store.record_run(metrics(100, 0.3), kind=BASELINE_KIND, timestamp=NOW)
+
+    assert store.get_segments() == ["all", "source:app"]
+    assert store.aggregate_window(NOW, NOW + timedelta(seconds=1))["total_count"] == 100
+    assert store.latest()["metrics"]["negative_ratio"] == 0.3
+    assert store.latest(segment="source:app") is None
+
+def test_downsample_buckets_runs(store):
+    start = datetime(2024, 6, 10, 10, 0)
+    for minutes in (5, 20, 65):
+        store.record_run(metrics(100, 0.1), timestamp=start + timedelta(minutes=minutes))
+
+    buckets = store.downsample(start, start + timedelta(hours=2), interval="hour")
+
+    assert [b["n_runs"] for b in buckets] == [2, 1]
+    with pytest.raises(ValueError):
+        store.downsample(start, start, interval="fortnight")
+
+def test_retention_keeps_newest_baseline(store):
+    old = NOW - timedelta(days=120)
+    store.record_run(metrics(100, 0.1), timestamp=old)
+    store.record_run(metrics(100, 0.2), kind=BASELINE_KIND, timestamp=old)
+    store.record_run(metrics(100, 0.3), kind=BASELINE_KIND, timestamp=old + timedelta(days=1))
+    store.record_run(metrics(100, 0.4), timestamp=NOW)
+
+    removed = store.apply_retention(max_age=timedelta(days=90), now=NOW)
+
+    assert removed == 2
+    assert store.latest()["metrics"]["negative_ratio"] == 0.3
+    assert store.aggregate_window(old - timedelta(days=1), NOW + timedelta(seconds=1))["n_runs"] == 1
+
+def test_monitor_records_runs_and_keeps_baseline_json(tmp_path, bus):
+    from src.agents.monitor import Monitor
+
+    store = MetricsStore(db_path=str(tmp_path / "metrics.db"))
+    store.record_run(metrics(100, 0.1), timestamp=datetime.now() - timedelta(days=365))
+    monitor = Monitor(baseline_path=tmp_path / "baseline_metrics.json", metrics_store=store)
+    df = pd.DataFrame({"comment": ["a", "b", "c"], "comment_lower": ["a", "b", "c"],
+                       "sentiment_label": ["Negative", "Positive", "Positive"],
+                       "topic_label": ["Fees", "Fees", "Login"], "source": ["app", "app", "web"]})
+
+    current = monitor.record_run(df)
+    monitor.save_baseline(current, df)
+
+    assert store.get_segments() == ["all", "source:app", "source:web"]
+    assert store.aggregate_window(datetime.now() - timedelta(days=400), datetime.now())["n_runs"] == 1
+    with open(tmp_path / "baseline_metrics.json", encoding="utf-8") as f:
+        assert json.load(f)["metrics"]["total_count"] == 3
@@ -0,0 +1,62 @@
+import multiprocessing as mp
+import pytest
+from src.models.prediction_cache import PredictionCache, text_key, normalize_text
+
+@pytest.fixture
+def cache(tmp_path):
+    return PredictionCache(tmp_path / "cache.db", max_memory_entries=10, max_disk_rows=50, prune_every=20)
+
+def disk_rows(cache):
+    return sum(cache.get_statistics()["disk_entries"].values())
+
+def test_text_key_normalizes_whitespace_and_case():
+    assert normalize_text("  Chuyển   TIỀN\n lỗi ") == "chuyển tiền lỗi"
+    assert text_key("Phí  cao") == text_key("phí cao")
+
+def test_disk_tier_serves_entries_evicted_from_memory(cache):
+    results = {f"k{i}": [i] for i in range(30)}
+    cache.put_many("topic/a", "v1", results)
+
+    found = cache.get_many("topic/a", "v1", list(results))
+
+    assert found == results
+    assert cache.disk_hits == 20 and cache.memory_hits == 10
+
+def test_disk_tier_is_capped(cache):
+    for batch in range(5):
+        cache.put_many("topic/a", "v1", {f"k{batch}_{i}": [i] for i in range(20)})
+
+    assert disk_rows(cache) <= 50
+    # The most recently written rows survive pruning
+    assert len(cache.get_many("topic/a", "v1", [f"k4_{i}" for i in range(20)])) == 20
+
+def test_invalidate_drops_superseded_rows(cache, tmp_path):
+    cache.put_many("topic/a", "v1", {"k": [1]})
+    cache.put_many("sentiment/b", "v1", {"k": [2]})
+
+    other_process = PredictionCache(tmp_path / "cache.db")
+    other_process.invalidate("topic/a", keep_version="v2")
+
+    assert cache.get_statistics()["disk_entries"] == {"sentiment/b@v1": 1}
+
+def _serve_old_version(db_path, queue):
+    cache = PredictionCache(db_path)
+    found = cache.get_many("topic/a", "v1", ["k", "new"])
+    cache.put_many("topic/a", "v1", {"new": [3]})
+    queue.put(found)
+
+@pytest.mark.skipif("fork" not in mp.get_all_start_methods(), reason="needs the fork start method")
+def test_process_on_old_version_keeps_newer_rows(cache, tmp_path):
+    cache.put_many("topic/a", "v1", {"k": [1]})
+    cache.put_many("topic/a", "v2", {"k": [2]})
+
+    ctx = mp.get_context("fork")
+    queue = ctx.Queue()
+    worker = ctx.Process(target=_serve_old_version, args=(tmp_path / "cache.db", queue))
+    worker.start()
+    found = queue.get(timeout=30)
+    worker.join(timeout=30)
+
+    assert found == {"k": [1]}
+    assert cache.get_many("topic/a", "v2", ["k"]) == {"k": [2]}
+    assert cache.get_statistics()["disk_entries"] == {"topic/a@v1": 2, "topic/a@v2": 1}
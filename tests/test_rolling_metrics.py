@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+import pandas as pd
+import pytest
+from src.agents.metrics_store import MetricsStore
+from src.utils.rolling_metrics import TimeBucketedMetrics
+
+NOW = datetime(2024, 6, 10, 12, 30, 15)
+
+def frame(timestamps, sentiments, topics=None):
+    data = {"timestamp": [t.isoformat() for t in timestamps], "sentiment_label": sentiments,
+            "comment_lower": ["phi cao"] * len(timestamps)}
+    if topics is not None:
+        data["topic_label"] = topics
+    return pd.DataFrame(data)
+
+def test_rejects_unknown_bucket_size():
+    with pytest.raises(ValueError):
+        TimeBucketedMetrics(bucket="week")
+
+def test_window_includes_floored_start_and_excludes_end():
+    metrics = TimeBucketedMetrics(bucket="minute")
+    for timestamp in [datetime(2024, 6, 10, 10, 0, 30), datetime(2024, 6, 10, 10, 59, 59),
+                      datetime(2024, 6, 10, 11, 0, 0)]:
+        metrics.add(timestamp, sentiment="Negative")
+
+    window = metrics.window(datetime(2024, 6, 10, 10, 0, 45), datetime(2024, 6, 10, 11, 0))
+
+    assert window["total_count"] == 2
+    assert window["negative_ratio"] == 1.0
+
+def test_recent_includes_current_bucket():
+    metrics = TimeBucketedMetrics(bucket="minute")
+    metrics.add(NOW - timedelta(minutes=61), sentiment="Positive")
+    metrics.add(NOW - timedelta(minutes=59), sentiment="Positive")
+    metrics.add(NOW, sentiment="Negative")
+
+    recent = metrics.recent(timedelta(hours=1), now=NOW)
+
+    assert recent["total_count"] == 2
+    assert recent["sentiment_distribution"] == {"Positive": 1, "Negative": 1}
+
+def test_compare_shifts_baseline_window_by_offset():
+    metrics = TimeBucketedMetrics(bucket="minute")
+    metrics.add(NOW - timedelta(days=7, minutes=10), sentiment="Positive", topic="Fees")
+    metrics.add(NOW - timedelta(days=7, minutes=70), sentiment="Negative", topic="Fees")
+    metrics.add(NOW - timedelta(minutes=10), sentiment="Negative", topic="Login")
+
+    windows = metrics.compare(timedelta(hours=1), timedelta(days=7), now=NOW)
+
+    assert windows["baseline"]["sentiment_distribution"] == {"Positive": 1}
+    assert windows["current"]["topic_distribution"] == {"Login": 1}
+
+def test_dataframe_update_matches_record_updates():
+    timestamps = [NOW - timedelta(seconds=45 * i) for i in range(40)]
+    sentiments = ["Negative" if i % 3 == 0 else "Positive" for i in range(40)]
+    topics = ["Fees" if i % 2 else "Login" for i in range(40)]
+
+    by_frame = TimeBucketedMetrics(bucket="minute")
+    by_frame.update_dataframe(frame(timestamps, sentiments, topics))
+    by_record = TimeBucketedMetrics(bucket="minute")
+    by_record.update(frame(timestamps, sentiments, topics).to_dict("records"))
+
+    start, end = NOW - timedelta(hours=1), NOW + timedelta(minutes=1)
+    assert by_frame.series(start, end) == by_record.series(start, end)
+    assert by_frame.window(start, end) == by_record.window(start, end)
+
+def test_retention_is_relative_to_newest_bucket():
+    metrics = TimeBucketedMetrics(bucket="hour", retention=timedelta(days=2))
+    old = datetime(2020, 1, 1, 8)
+    metrics.add(old, sentiment="Positive")
+    metrics.add(old + timedelta(days=1), sentiment="Positive")
+    metrics.add(old + timedelta(days=3), sentiment="Negative")
+
+    metrics.prune()
+
+    assert list(metrics.buckets) == [old + timedelta(days=1), old + timedelta(days=3)]
+    metrics.prune(now=old + timedelta(days=4, hours=1))
+    assert list(metrics.buckets) == [old + timedelta(days=3)]
+
+def test_updates_prune_expired_buckets():
+    metrics = TimeBucketedMetrics(bucket="minute", retention=timedelta(days=8))
+    metrics.update([{"timestamp": (NOW - timedelta(days=9)).isoformat(), "sentiment_label": "Positive"}])
+    metrics.update([{"timestamp": NOW.isoformat(), "sentiment_label": "Negative"}])
+
+    assert len(metrics.buckets) == 1
+    assert metrics.window(NOW - timedelta(days=10), NOW + timedelta(minutes=1))["total_count"] == 1
+
+@pytest.fixture
+def monitor(tmp_path, bus):
+    from src.agents.monitor import Monitor
+
+    return Monitor(baseline_path=tmp_path / "baseline_metrics.json",
+                   metrics_store=MetricsStore(db_path=str(tmp_path / "metrics.db")))
+
+def test_window_anomalies_compare_against_same_window_last_week(monitor):
+    last_week = [NOW - timedelta(days=7, minutes=m) for m in range(1, 41)]
+    this_hour = [NOW - timedelta(minutes=m) for m in range(1, 41)]
+    monitor.observe_dataframe(frame(last_week, ["Positive"] * 36 + ["Negative"] * 4), publish=False)
+    monitor.observe_dataframe(frame(this_hour, ["Positive"] * 12 + ["Negative"] * 28), publish=False)
+
+    anomalies = monitor.detect_window_anomalies(now=NOW)
+
+    assert {"sentiment_drift", "negative_spike"} <= {a["type"] for a in anomalies}
+
+def test_window_anomalies_skip_empty_baseline(monitor):
+    monitor.observe_dataframe(frame([NOW - timedelta(minutes=5)] * 10, ["Negative"] * 10), publish=False)
+
+    assert monitor.detect_window_anomalies(now=NOW) == []
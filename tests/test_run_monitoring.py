@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+from conftest import load_script
+
+run_monitoring = load_script("run_monitoring")
+
+def write_rows(path, rows, mode="w"):
+    pd.DataFrame({"comment": rows}).to_csv(path, mode=mode, header=mode == "w", index=False)
+
+def poll_stable(tracker):
+    # A file is read once it looks the same on two consecutive polls
+    tracker.poll()
+    return tracker.poll()
+
+def comments(frames):
+    return [c for frame in frames for c in frame["comment"]]
+
+@pytest.fixture
+def watch_dir(tmp_path):
+    path = tmp_path / "raw"
+    path.mkdir()
+    return path
+
+def test_waits_for_file_to_settle(tmp_path, watch_dir):
+    write_rows(watch_dir / "a.csv", ["one", "two"])
+    tracker = run_monitoring.RawFileTracker(watch_dir, tmp_path / "state.json")
+
+    assert tracker.poll() == []
+    assert comments(tracker.poll()) == ["one", "two"]
+
+def test_reads_only_appended_rows(tmp_path, watch_dir):
+    write_rows(watch_dir / "a.csv", ["one", "two"])
+    tracker = run_monitoring.RawFileTracker(watch_dir, tmp_path / "state.json")
+    poll_stable(tracker)
+
+    write_rows(watch_dir / "a.csv", ["three"], mode="a")
+
+    assert comments(poll_stable(tracker)) == ["three"]
+    assert poll_stable(tracker) == []
+
+def test_resumes_from_saved_offsets(tmp_path, watch_dir):
+    state_file = tmp_path / "state.json"
+    write_rows(watch_dir / "a.csv", ["one", "two"])
+    tracker = run_monitoring.RawFileTracker(watch_dir, state_file)
+    poll_stable(tracker)
+    tracker.save_state()
+
+    write_rows(watch_dir / "a.csv", ["three"], mode="a")
+    restarted = run_monitoring.RawFileTracker(watch_dir, state_file)
+
+    assert comments(poll_stable(restarted)) == ["three"]
+
+def test_unsaved_offsets_are_replayed_after_restart(tmp_path, watch_dir):
+    state_file = tmp_path / "state.json"
+    write_rows(watch_dir / "a.csv", ["one"])
+    tracker = run_monitoring.RawFileTracker(watch_dir, state_file)
+    poll_stable(tracker)
+    tracker.save_state()
+
+    write_rows(watch_dir / "a.csv", ["two"], mode="a")
+    poll_stable(tracker)
+    restarted = run_monitoring.RawFileTracker(watch_dir, state_file)
+
+    assert comments(poll_stable(restarted)) == ["two"]
+
+def test_truncated_file_is_read_from_start(tmp_path, watch_dir):
+    write_rows(watch_dir / "a.csv", ["one", "two", "three"])
+    tracker = run_monitoring.RawFileTracker(watch_dir, tmp_path / "state.json")
+    poll_stable(tracker)
+
+    write_rows(watch_dir / "a.csv", ["new"])
+
+    assert comments(poll_stable(tracker)) == ["new"]
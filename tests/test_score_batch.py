@@ -0,0 +1,74 @@
+import os
+import pandas as pd
+import pytest
+from conftest import load_script
+
+score_batch = load_script("score_batch")
+
+@pytest.fixture
+def input_file(tmp_path):
+    path = tmp_path / "comments.csv"
+    pd.DataFrame({"comment": [f"comment {i}" for i in range(10)]}).to_csv(path, index=False)
+    return path
+
+def completed_run(output_dir, input_file, chunk_size=4, output_format="csv"):
+    checkpoint = score_batch.resume_checkpoint(output_dir, [input_file], chunk_size, output_format)
+    checkpoint["completed"][f"{input_file.name}:0"] = {"output": None, "rows": chunk_size}
+    score_batch.save_checkpoint(output_dir, checkpoint)
+    return checkpoint
+
+def test_new_checkpoint_records_run_settings(tmp_path, input_file):
+    checkpoint = score_batch.resume_checkpoint(tmp_path, [input_file], 4, "csv")
+
+    assert checkpoint["chunk_size"] == 4
+    assert checkpoint["format"] == "csv"
+    assert checkpoint["inputs"][input_file.name]["size"] == input_file.stat().st_size
+    assert checkpoint["completed"] == {}
+
+def test_resume_skips_completed_partitions(tmp_path, input_file):
+    completed_run(tmp_path, input_file)
+
+    checkpoint = score_batch.resume_checkpoint(tmp_path, [input_file], 4, "csv")
+    tasks = list(score_batch.iter_tasks([input_file], tmp_path, 4, "csv", checkpoint["completed"]))
+
+    assert [key for key, *_ in tasks] == [f"{input_file.name}:1", f"{input_file.name}:2"]
+    assert list(tasks[0][1]["comment"]) == [f"comment {i}" for i in range(4, 8)]
+
+@pytest.mark.parametrize("chunk_size, output_format", [(5, "csv"), (4, "parquet")])
+def test_resume_refuses_different_chunking_or_format(tmp_path, input_file, chunk_size, output_format):
+    completed_run(tmp_path, input_file)
+
+    with pytest.raises(ValueError, match="--restart"):
+        score_batch.resume_checkpoint(tmp_path, [input_file], chunk_size, output_format)
+
+def test_resume_refuses_changed_input(tmp_path, input_file):
+    completed_run(tmp_path, input_file)
+    with open(input_file, "a", encoding="utf-8") as f:
+        f.write("late comment\n")
+
+    with pytest.raises(ValueError, match="changed"):
+        score_batch.resume_checkpoint(tmp_path, [input_file], 4, "csv")
+
+def test_resume_accepts_new_input_files(tmp_path, input_file):
+    completed_run(tmp_path, input_file)
+    other = tmp_path / "more.csv"
+    pd.DataFrame({"comment": ["x"]}).to_csv(other, index=False)
+
+    checkpoint = score_batch.resume_checkpoint(tmp_path, [input_file, other], 4, "csv")
+
+    assert set(checkpoint["inputs"]) == {input_file.name, other.name}
+    assert f"{input_file.name}:0" in checkpoint["completed"]
+
+def test_restart_ignores_mismatched_checkpoint(tmp_path, input_file):
+    completed_run(tmp_path, input_file)
+
+    checkpoint = score_batch.resume_checkpoint(tmp_path, [input_file], 5, "csv", restart=True)
+
+    assert checkpoint["completed"] == {}
+    assert checkpoint["chunk_size"] == 5
+
+def test_checkpoint_written_atomically(tmp_path, input_file):
+    completed_run(tmp_path, input_file)
+
+    assert score_batch.load_checkpoint(tmp_path)["chunk_size"] == 4
+    assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
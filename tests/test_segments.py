@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.segments import compute_segment_metrics, evaluate_thresholds, segment_violations
+
+GOALS = {
+    "negative_ratio_max": {"metric": "negative_ratio", "operator": "<=", "threshold": 0.3,
+                           "priority": "high", "action": "investigate"},
+    "volume_min": {"metric": "volume", "operator": ">=", "threshold": 5,
+                   "priority": "low", "action": "check_ingestion"}
+}
+
+@pytest.fixture
+def frame():
+    rows = ([("app", "Fees", "Negative")] * 6 + [("app", "Fees", "Positive")] * 4
+            + [("web", "Fees", "Positive")] * 9 + [("web", "Fees", "Negative")]
+            + [("web", "Login", "Negative")] * 2)
+    return pd.DataFrame(rows, columns=["source", "topic_label", "sentiment_label"])
+
+def test_segment_metrics_match_groupby(frame):
+    segments = compute_segment_metrics(frame)
+
+    assert list(segments.index.names) == ["source", "topic_label"]
+    assert segments.loc[("app", "Fees"), "volume"] == 10
+    assert segments.loc[("app", "Fees"), "negative_ratio"] == pytest.approx(0.6)
+    assert segments["volume_share"].sum() == pytest.approx(1.0)
+    overall = 9 / len(frame)
+    assert segments.loc[("web", "Fees"), "negative_ratio_delta"] == pytest.approx(0.1 - overall)
+
+def test_missing_dimension_values_become_unknown(frame):
+    frame.loc[0, "source"] = None
+
+    segments = compute_segment_metrics(frame)
+
+    assert segments.loc[("Unknown", "Fees"), "volume"] == 1
+
+def test_frame_baseline_aligns_per_segment(frame):
+    baseline = compute_segment_metrics(frame.iloc[:20])
+
+    segments = compute_segment_metrics(frame, baseline=baseline)
+
+    assert segments.loc[("app", "Fees"), "negative_ratio_delta"] == pytest.approx(0.0)
+    assert segments.loc[("app", "Fees"), "volume_change"] == pytest.approx(0.0)
+    assert np.isnan(segments.loc[("web", "Login"), "volume_change"])
+
+def test_evaluate_thresholds_operators_and_nan():
+    values = np.array([[0.1, 0.5, np.nan]])
+    thresholds = np.array([[0.2, 0.2, 0.2]])
+
+    assert evaluate_thresholds(values, thresholds, np.array([["<=", "<=", "<="]])).tolist() == [[False, True, False]]
+    assert evaluate_thresholds(values, thresholds, np.array([[">", ">", ">"]])).tolist() == [[False, True, False]]
+    with pytest.raises(ValueError):
+        evaluate_thresholds(values, thresholds, np.array([["==", "<=", "<="]]))
+
+def test_violations_respect_min_volume_except_volume_goals(frame):
+    segments = compute_segment_metrics(frame)
+
+    violations = segment_violations(segments, GOALS, min_volume=5)
+
+    found = {(v["goal"], v["segment"]["source"], v["segment"]["topic_label"]) for v in violations}
+    assert found == {("negative_ratio_max", "app", "Fees"), ("volume_min", "web", "Login")}
+
+def test_goals_on_missing_metrics_are_skipped(frame):
+    segments = compute_segment_metrics(frame)
+    goals = {"score": {"metric": "sentiment_score_mean", "operator": ">=", "threshold": 0.5,
+                       "priority": "low", "action": "review"}}
+
+    assert segment_violations(segments, goals) == []
+    assert segment_violations(pd.DataFrame(), GOALS) == []
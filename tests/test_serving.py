@@ -0,0 +1,111 @@
+import threading
+import time
+import pytest
+from src.models.serving import LatencyTracker, MicroBatcher
+
+# Records each batch and holds the first one until released, so later requests queue up behind it
+class StubService:
+    def __init__(self):
+        self.batches = []
+        self.called_at = []
+        self.release = threading.Event()
+        self.first_started = threading.Event()
+
+    def score(self, texts):
+        self.batches.append(list(texts))
+        self.called_at.append(time.perf_counter())
+        if len(self.batches) == 1:
+            self.first_started.set()
+            self.release.wait(timeout=5)
+        return [{"text": text} for text in texts]
+
+@pytest.fixture
+def service():
+    return StubService()
+
+def make_batcher(service, **kwargs):
+    batcher = MicroBatcher(service, **kwargs)
+    batcher.start()
+    return batcher
+
+def queue_behind_first(batcher, service, texts):
+    first = batcher.submit("first")
+    assert service.first_started.wait(timeout=5)
+    futures = [batcher.submit(text) for text in texts]
+    return first, futures
+
+def test_idle_request_dispatches_without_waiting(service):
+    service.release.set()
+    batcher = make_batcher(service, max_batch_size=8, max_wait_ms=5000)
+
+    start = time.perf_counter()
+    assert batcher.score("hello", timeout=5) == {"text": "hello"}
+    assert time.perf_counter() - start < 1.0
+    batcher.stop()
+
+def test_batch_closes_at_max_batch_size(service):
+    batcher = make_batcher(service, max_batch_size=4, max_wait_ms=5000)
+    first, futures = queue_behind_first(batcher, service, [f"t{i}" for i in range(8)])
+
+    service.release.set()
+    results = [future.result(timeout=2) for future in futures]
+    batcher.stop()
+
+    assert first.result() == {"text": "first"}
+    assert results == [{"text": f"t{i}"} for i in range(8)]
+    assert [len(batch) for batch in service.batches] == [1, 4, 4]
+
+def test_batch_closes_after_max_wait(service):
+    batcher = make_batcher(service, max_batch_size=100, max_wait_ms=50)
+    _, futures = queue_behind_first(batcher, service, ["a", "b", "c"])
+
+    released_at = time.perf_counter()
+    service.release.set()
+    for future in futures:
+        future.result(timeout=2)
+    batcher.stop()
+
+    assert [len(batch) for batch in service.batches] == [1, 3]
+    assert service.called_at[1] - released_at >= 0.045
+
+def test_submit_after_stop_fails(service):
+    service.release.set()
+    batcher = make_batcher(service)
+    batcher.stop()
+
+    with pytest.raises(RuntimeError):
+        batcher.submit("late").result(timeout=1)
+
+def test_failed_batch_fails_its_requests():
+    class FailingService:
+        def score(self, texts):
+            raise ValueError("model unavailable")
+
+    batcher = make_batcher(FailingService())
+
+    with pytest.raises(ValueError):
+        batcher.score("hello", timeout=2)
+    batcher.stop()
+
+def test_latency_percentiles_come_from_recorded_batches():
+    tracker = LatencyTracker(window=1000)
+    tracker.record_batch([float(ms) for ms in range(1, 51)])
+    tracker.record_batch([float(ms) for ms in range(51, 101)])
+
+    stats = tracker.get_statistics()
+
+    assert (stats["total_requests"], stats["total_batches"], stats["window_size"]) == (100, 2, 100)
+    assert stats["latency_ms_p50"] == pytest.approx(50.5)
+    assert stats["latency_ms_p99"] == pytest.approx(99.01)
+    assert stats["latency_ms_max"] == 100.0
+    assert stats["avg_batch_size"] == 50.0
+
+def test_latency_window_keeps_most_recent():
+    tracker = LatencyTracker(window=10)
+    tracker.record_batch([1000.0] * 10)
+    tracker.record_batch([1.0] * 10)
+
+    stats = tracker.get_statistics()
+
+    assert stats["latency_ms_max"] == 1.0 and stats["total_requests"] == 20
+    assert "latency_ms_p50" not in LatencyTracker().get_statistics()
@@ -0,0 +1,117 @@
+import json
+from collections import Counter
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.sketches import CountMinSketch, SpaceSaving, TDigest, HyperLogLog
+from src.utils.metrics_summary import MetricsSummary
+
+def zipf_items(n, seed=0):
+    rng = np.random.RandomState(seed)
+    return [f"item{i}" for i in rng.zipf(1.3, size=n) % 5000]
+
+def test_count_min_never_underestimates():
+    items = zipf_items(20000)
+    sketch = CountMinSketch(width=1024, depth=4)
+    sketch.add_many(items)
+
+    exact = Counter(items)
+    estimates = sketch.estimate_many(list(exact))
+
+    assert all(est >= exact[item] for item, est in zip(exact, estimates))
+    assert sketch.total == len(items)
+
+def test_space_saving_keeps_heavy_hitters():
+    items = zipf_items(20000)
+    summary = SpaceSaving(capacity=100)
+    summary.add_many(items)
+
+    top = [entry["item"] for entry in summary.top(5)]
+
+    assert top == [item for item, _ in Counter(items).most_common(5)]
+
+def json_round_trip(sketch):
+    return type(sketch).from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+def test_count_min_merge_equals_single_sketch():
+    items = zipf_items(10000)
+    whole = CountMinSketch(512, 4)
+    whole.add_many(items)
+    left, right = CountMinSketch(512, 4), CountMinSketch(512, 4)
+    left.add_many(items[:4000])
+    right.add_many(items[4000:])
+
+    merged = json_round_trip(left + right)
+
+    assert np.array_equal(merged.table, whole.table)
+    assert merged.total == whole.total
+
+def test_count_min_merge_rejects_other_shapes():
+    with pytest.raises(ValueError):
+        CountMinSketch(512, 4).merge(CountMinSketch(256, 4))
+
+def test_space_saving_merge_and_round_trip():
+    items = zipf_items(20000)
+    left, right = SpaceSaving(200), SpaceSaving(200)
+    left.add_many(items[::2])
+    right.add_many(items[1::2])
+
+    merged = json_round_trip(left + right)
+    exact = Counter(items)
+
+    assert [e["item"] for e in merged.top(5)] == [item for item, _ in exact.most_common(5)]
+    for entry in merged.top(20):
+        # Space-Saving overestimates by at most the recorded error
+        assert entry["count"] - entry["error"] <= exact[entry["item"]] <= entry["count"]
+
+def test_tdigest_merge_tracks_exact_quantiles():
+    rng = np.random.RandomState(1)
+    values = rng.lognormal(size=50000)
+    parts = [TDigest() for _ in range(4)]
+    for part, chunk in zip(parts, np.array_split(values, 4)):
+        part.add_many(chunk)
+
+    merged = json_round_trip(parts[0] + parts[1] + parts[2] + parts[3])
+
+    assert merged.count == len(values)
+    for q in (0.01, 0.5, 0.95, 0.99):
+        assert merged.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.02)
+    assert merged.mean() == pytest.approx(values.mean(), rel=1e-6)
+
+def test_empty_tdigest_round_trip():
+    digest = json_round_trip(TDigest())
+
+    assert digest.count == 0
+    assert digest.quantile(0.5) is None
+
+def test_hyperloglog_merge_is_union():
+    left, right = HyperLogLog(12), HyperLogLog(12)
+    left.add_many(range(0, 60000))
+    right.add_many(range(40000, 100000))
+
+    merged = json_round_trip(left + right)
+
+    assert merged.count() == pytest.approx(100000, rel=0.05)
+    assert np.array_equal(merged.registers, np.maximum(left.registers, right.registers))
+
+def test_hyperloglog_rejects_other_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(10))
+
+def test_metrics_summary_combine_matches_whole_frame():
+    rng = np.random.RandomState(2)
+    df = pd.DataFrame({
+        "sentiment_label": rng.choice(["Positive", "Negative", "Neutral"], size=3000),
+        "topic_label": rng.choice(["fees", "app", "card"], size=3000),
+        "source": rng.choice(["app", "web"], size=3000),
+        "sentiment_score": rng.randint(-2, 3, size=3000),
+        "customer_id": rng.randint(0, 800, size=3000)
+    })
+
+    partials = [MetricsSummary.from_dataframe(chunk).to_dict() for chunk in np.array_split(df, 3)]
+    combined = MetricsSummary.combine(json.loads(json.dumps(partials))).to_metrics()
+    whole = MetricsSummary.from_dataframe(df).to_metrics()
+
+    for key in ("total_count", "negative_ratio", "sentiment_distribution", "topic_distribution", "source_distribution"):
+        assert combined[key] == whole[key]
+    assert combined["distinct_customer_id"] == pytest.approx(df["customer_id"].nunique(), rel=0.05)
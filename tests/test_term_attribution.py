@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import pytest
+from src.agents.metrics_store import MetricsStore
+from src.utils.term_attribution import (TermProfile, attribute_terms, attribute_drift, drifted_categories,
+                                        segment_key, ALL_SEGMENT)
+
+def make_frame(n_positive, n_negative, negative_text="phi chuyen tien cao"):
+    texts = ["nhan vien ho tro tot"] * n_positive + [negative_text] * n_negative
+    labels = ["Positive"] * n_positive + ["Negative"] * n_negative
+    topics = ["Service"] * n_positive + ["Fees"] * n_negative
+    return pd.DataFrame({"comment_lower": texts, "sentiment_label": labels, "topic_label": topics})
+
+@pytest.fixture
+def baseline_frame():
+    return make_frame(80, 20, negative_text="phi thuong nien")
+
+@pytest.fixture
+def current_frame():
+    return make_frame(40, 60)
+
+def test_profile_counts_documents_per_segment(baseline_frame):
+    profile = TermProfile.from_frame(baseline_frame)
+
+    assert profile.segment(ALL_SEGMENT)[0] == 100
+    assert profile.segment(segment_key("sentiment_label", "Negative"))[0] == 20
+    assert segment_key("topic_label", "Fees") in profile
+    assert TermProfile.from_frame(pd.DataFrame({"comment_lower": ["", ""]})) is None
+    assert TermProfile.from_frame(pd.DataFrame({"other": ["x"]})) is None
+
+def test_profile_save_load_round_trip(tmp_path, baseline_frame):
+    profile = TermProfile.from_frame(baseline_frame)
+    profile.save(tmp_path / "terms.joblib")
+
+    loaded = TermProfile.load(tmp_path / "terms.joblib")
+
+    assert loaded.keys == profile.keys
+    assert np.array_equal(loaded.doc_counts, profile.doc_counts)
+    assert (loaded.counts != profile.counts).nnz == 0
+    assert TermProfile.load(tmp_path / "missing.joblib") is None
+
+def test_attribute_terms_ranks_new_terms_first(baseline_frame, current_frame):
+    terms = attribute_terms(TermProfile.from_frame(current_frame), TermProfile.from_frame(baseline_frame))
+
+    top = [t["term"] for t in terms[:3]]
+    assert "chuyen" in top or "chuyen tien" in top
+    assert all(t["z_score"] > 0 for t in terms)
+    assert "nhan vien" not in [t["term"] for t in terms]
+
+def test_drifted_categories_orders_by_share_change():
+    drifted = drifted_categories({"Positive": 80, "Negative": 20}, {"Positive": 40, "Negative": 55, "Mixed": 5},
+                                 max_segments=2)
+
+    assert [d["category"] for d in drifted] == ["Positive", "Negative"]
+    assert drifted[1]["share_change"] == pytest.approx(0.35)
+
+def test_attribute_drift_covers_overall_and_drifted_segments(baseline_frame, current_frame):
+    attribution = attribute_drift(TermProfile.from_frame(current_frame), TermProfile.from_frame(baseline_frame),
+                                  "sentiment_label", {"Positive": 80, "Negative": 20}, {"Positive": 40, "Negative": 60})
+
+    assert [a["segment"] for a in attribution] == [ALL_SEGMENT, "sentiment_label=Positive", "sentiment_label=Negative"]
+    assert attribution[0]["share_change"] is None
+    assert attribution[2]["terms"]
+
+def make_monitor(tmp_path, store=None):
+    from src.agents.monitor import Monitor
+
+    store = store or MetricsStore(db_path=str(tmp_path / "metrics.db"))
+    return Monitor(baseline_path=tmp_path / "baseline_metrics.json", metrics_store=store)
+
+def sentiment_drift(anomalies):
+    return next(a for a in anomalies if a["type"] == "sentiment_drift")
+
+def test_monitor_attributes_drift_against_saved_baseline(tmp_path, bus, baseline_frame, current_frame):
+    monitor = make_monitor(tmp_path)
+    monitor.save_baseline(monitor.calculate_current_metrics(baseline_frame), baseline_frame)
+
+    anomaly = sentiment_drift(monitor.detect_anomalies(monitor.calculate_current_metrics(current_frame),
+                                                       current_frame=current_frame))
+
+    assert anomaly["attribution"][0]["terms"]
+    assert "attribution_unavailable" not in anomaly
+
+def test_monitor_reports_missing_term_profile(tmp_path, bus, baseline_frame, current_frame):
+    monitor = make_monitor(tmp_path)
+    monitor.save_baseline(monitor.calculate_current_metrics(baseline_frame), baseline_frame)
+    monitor.save_baseline(monitor.calculate_current_metrics(baseline_frame))
+
+    anomaly = sentiment_drift(monitor.detect_anomalies(monitor.calculate_current_metrics(current_frame),
+                                                       current_frame=current_frame))
+
+    assert not monitor.baseline_terms_path.exists()
+    assert anomaly["attribution"] == []
+    assert "no baseline term profile" in anomaly["attribution_unavailable"]
+
+def test_monitor_reports_unavailable_for_last_week_baseline(tmp_path, bus, baseline_frame, current_frame):
+    store = MetricsStore(db_path=str(tmp_path / "metrics.db"))
+    monitor = make_monitor(tmp_path, store)
+    store.record_run(monitor.calculate_current_metrics(baseline_frame),
+                     timestamp=datetime.now() - timedelta(days=7, minutes=30))
+
+    anomalies = monitor.detect_anomalies_vs_history(monitor.calculate_current_metrics(current_frame),
+                                                    current_frame=current_frame)
+
+    anomaly = sentiment_drift(anomalies)
+    assert anomaly["attribution"] == []
+    assert "saved baseline" in anomaly["attribution_unavailable"]
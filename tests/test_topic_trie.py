@@ -0,0 +1,78 @@
+import pytest
+from src.agents.message_bus import Message
+from src.agents.topic_trie import TopicTrie, is_pattern
+
+@pytest.mark.parametrize("pattern, topic, matches", [
+    ("model.*", "model.trained", True),
+    ("model.*", "model", False),
+    ("model.*", "model.card.updated", False),
+    ("monitor.#", "monitor", True),
+    ("monitor.#", "monitor.anomalies_detected", True),
+    ("monitor.#", "monitor.a.b.c", True),
+    ("monitor.#", "monitoring.x", False),
+    ("#.completed", "learning.cycle.completed", True),
+    ("#.completed", "completed", True),
+    ("#.completed", "learning.cycle_completed", False),
+    ("*.*.updated", "model.card.updated", True),
+    ("a.#.z", "a.z", True),
+    ("a.#.z", "a.b.c.z", True),
+    ("a.#.z", "a.b.c", False),
+    ("#", "anything.at.all", True),
+])
+def test_wildcard_matching(pattern, topic, matches):
+    trie = TopicTrie()
+    trie.add(pattern, "callback")
+
+    assert (trie.match(topic) == ["callback"]) is matches
+
+def test_callback_matched_by_several_patterns_is_returned_once():
+    trie = TopicTrie()
+    trie.add("model.*", "audit")
+    trie.add("#", "audit")
+    trie.add("model.#", "metrics")
+
+    assert sorted(trie.match("model.trained")) == ["audit", "metrics"]
+
+def test_remove_prunes_empty_branches():
+    trie = TopicTrie()
+    trie.add("a.*.c", "cb")
+    trie.add("a.b", "other")
+
+    assert trie.remove("a.*.c", "cb")
+    assert not trie.remove("a.*.c", "cb")
+    assert trie.match("a.x.c") == []
+    assert list(trie.root.children["a"].children) == ["b"]
+    assert len(trie) == 1
+
+def test_is_pattern():
+    assert is_pattern("model.*")
+    assert is_pattern("#")
+    assert not is_pattern("model.trained")
+    assert not is_pattern("model.v*2")
+
+def test_bus_delivers_to_exact_and_wildcard_subscribers(bus):
+    seen = []
+    audit = lambda m: seen.append(("audit", m.topic))
+    bus.subscribe("model.trained", lambda m: seen.append(("exact", m.topic)))
+    bus.subscribe("model.*", audit)
+    bus.subscribe("monitor.#", lambda m: seen.append(("monitor", m.topic)))
+
+    for topic in ("model.trained", "model.deployed", "monitor.anomalies_detected", "learning.cycle_completed"):
+        bus.publish(Message(sender="test", topic=topic))
+
+    assert seen == [("exact", "model.trained"), ("audit", "model.trained"), ("audit", "model.deployed"),
+                    ("monitor", "monitor.anomalies_detected")]
+
+    bus.unsubscribe("model.*", audit)
+    seen.clear()
+    bus.publish(Message(sender="test", topic="model.deployed"))
+    assert seen == []
+
+def test_subscribing_after_lookup_invalidates_cache(bus):
+    seen = []
+    bus.publish(Message(sender="test", topic="model.trained"))
+    bus.subscribe("model.*", lambda m: seen.append(m.topic))
+
+    bus.publish(Message(sender="test", topic="model.trained"))
+
+    assert seen == ["model.trained"]